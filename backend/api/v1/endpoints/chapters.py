@@ -2,23 +2,35 @@ import logging
 from datetime import timedelta
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 from starlette import status
 from starlette.requests import Request
 
 from core.database import get_db_session
 from core.minio import get_minio_client, MinIOClient
 from core.session import get_session_token, sessions
-from models import User, Chapter
-from models.file import File as FileModel, FileVisibility
-from schemas.chapter import ChapterAudioResponse
+from models import User, Chapter, ChapterAudioSegment
+from models.chapter import ChapterTTSStatus
+from models.file import File as FileModel, FileStatus, FileVisibility
+from schemas.chapter import (
+    ChapterAudioPendingResponse,
+    ChapterAudioResponse,
+    ChapterAudioSegmentOut,
+    ChapterSegmentsResponse,
+    ChapterTextResponse,
+)
+from services.audio import get_audio_format
 from services.auth import AuthService
+from worker.scheduling import promote_listening_position
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 PRESIGNED_URL_TTL = timedelta(hours=1)
+AUDIO_PENDING_RETRY_AFTER_SECONDS = 5
 
 
 async def get_current_user_dependency(
@@ -38,9 +50,43 @@ async def get_current_user_dependency(
     return user
 
 
+async def _get_accessible_chapter(
+    db: AsyncSession,
+    chapter_id: int,
+    current_user: User,
+    *options,
+) -> tuple[Chapter, FileModel]:
+    """Load a chapter (with loader ``options``) and its file, enforcing owner/public visibility."""
+    result = await db.execute(select(Chapter).options(*options).where(Chapter.id == chapter_id))
+    chapter = result.scalar_one_or_none()
+
+    if not chapter:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chapter not found")
+
+    # Fetch the parent file to enforce visibility
+    file_result = await db.execute(select(FileModel).where(FileModel.id == chapter.file_id))
+    file_record = file_result.scalar_one_or_none()
+
+    if not file_record:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chapter not found")
+
+    # Allow access if: owner, or file is public
+    is_owner = file_record.user_id == current_user.id
+    is_public = file_record.visibility == FileVisibility.PUBLIC
+
+    if not is_owner and not is_public:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+
+    return chapter, file_record
+
+
 @router.get(
     "/{chapter_id}/audio",
     response_model=ChapterAudioResponse,
+    responses={
+        status.HTTP_202_ACCEPTED: {"model": ChapterAudioPendingResponse},
+        status.HTTP_204_NO_CONTENT: {"description": "The chapter has no audio"},
+    },
     summary="Get presigned audio URL for a chapter",
     description="""
     Returns a time-limited presigned URL that can be used to stream or download
@@ -50,12 +96,18 @@ async def get_current_user_dependency(
     - Owner can always access their own chapters
     - Non-owners can access chapters whose parent file is set to **public**
 
+    Requesting a chapter moves its synthesis, and the next chapter's, to the
+    front of the TTS queue. Chapters that were never synthesized (lazy
+    processing mode) or whose synthesis failed are queued on demand.
+
     **Returns:**
     - 200: Presigned URL valid for 1 hour
+    - 202: Audio is queued or being synthesized; retry after `Retry-After` seconds
+    - 204: The chapter has no text to synthesize, so it has no audio
     - 401: Not authenticated
     - 403: Chapter belongs to a private file owned by another user
     - 404: Chapter not found
-    - 409: Audio not yet available (TTS not completed)
+    - 503: Too many on-demand chapters are already being synthesized; retry later
     """,
     tags=["Chapters"],
 )
@@ -67,34 +119,27 @@ async def get_chapter_audio(
 ) -> ChapterAudioResponse:
     logger.info("Chapter audio request", extra={"chapter_id": chapter_id, "user_id": current_user.id})
 
-    # Fetch chapter
-    result = await db.execute(select(Chapter).where(Chapter.id == chapter_id))
-    chapter = result.scalar_one_or_none()
-
-    if not chapter:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chapter not found")
-
-    # Fetch the parent file to enforce visibility
-    file_result = await db.execute(select(FileModel).where(FileModel.id == chapter.file_id))
-    file_record = file_result.scalar_one_or_none()
+    chapter, _ = await _get_accessible_chapter(db, chapter_id, current_user)
+    tts_status = await promote_listening_position(db, chapter)
 
-    if not file_record:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chapter not found")
-
-    # Allow access if: owner, or file is public
-    is_owner = file_record.user_id == current_user.id
-    is_public = file_record.visibility == FileVisibility.PUBLIC
-
-    if not is_owner and not is_public:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
-
-    # Check audio has been generated
     if not chapter.audio_bucket_name or not chapter.audio_object_name:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Audio not yet available. Check back once the file has finished processing.",
+        if tts_status == ChapterTTSStatus.READY:
+            return Response(status_code=status.HTTP_204_NO_CONTENT)
+        retry_after = {"Retry-After": str(AUDIO_PENDING_RETRY_AFTER_SECONDS)}
+        if tts_status not in (ChapterTTSStatus.QUEUED, ChapterTTSStatus.SYNTHESIZING):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many chapters are being synthesized on demand. Try again shortly.",
+                headers=retry_after,
+            )
+        pending = ChapterAudioPendingResponse(
+            chapter_id=chapter_id,
+            status=tts_status.value,
+            retry_after_seconds=AUDIO_PENDING_RETRY_AFTER_SECONDS,
         )
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=pending.model_dump(), headers=retry_after)
 
+    audio_format = get_audio_format(chapter.audio_format)
     url = await minio.generate_presigned_url(
         bucket_name=chapter.audio_bucket_name,
         object_name=chapter.audio_object_name,
@@ -109,6 +154,7 @@ async def get_chapter_audio(
             "user_id": current_user.id,
             "bucket": chapter.audio_bucket_name,
             "object": chapter.audio_object_name,
+            "format": audio_format.name,
         },
     )
 
@@ -116,4 +162,138 @@ async def get_chapter_audio(
         chapter_id=chapter_id,
         url=url,
         expires_in_seconds=int(PRESIGNED_URL_TTL.total_seconds()),
+        format=audio_format.name,
+        content_type=audio_format.content_type,
+    )
+
+
+@router.get(
+    "/{chapter_id}/segments",
+    response_model=ChapterSegmentsResponse,
+    summary="List the audio segments published so far for a chapter",
+    description="""
+    Returns presigned URLs for the chapter's audio segments in playback order,
+    as they become available while synthesis is still running. Poll again while
+    `has_more` is true to pick up newly published segments.
+
+    Chapters synthesized without progressive segments are returned as a single
+    segment covering the whole chapter once its audio exists. As with
+    `GET /chapters/{chapter_id}/audio`, a chapter not yet queued is queued on
+    demand; `status` stays `pending` while on-demand capacity is full. A
+    chapter with no text to synthesize is `ready` with no segments.
+
+    **Access rules:** same as `GET /chapters/{chapter_id}/audio`.
+
+    **Returns:**
+    - 200: Segments available so far (possibly none yet)
+    - 401: Not authenticated
+    - 403: Chapter belongs to a private file owned by another user
+    - 404: Chapter not found
+    """,
+    tags=["Chapters"],
+)
+async def get_chapter_segments(
+    chapter_id: int,
+    db: AsyncSession = Depends(get_db_session),
+    current_user: User = Depends(get_current_user_dependency),
+    minio: MinIOClient = Depends(get_minio_client),
+) -> ChapterSegmentsResponse:
+    chapter, file_record = await _get_accessible_chapter(db, chapter_id, current_user)
+    tts_status = await promote_listening_position(db, chapter)
+
+    result = await db.execute(
+        select(ChapterAudioSegment)
+        .where(ChapterAudioSegment.chapter_id == chapter.id)
+        .order_by(ChapterAudioSegment.segment_index.asc())
+    )
+    published = [
+        (segment.segment_index, segment.bucket_name, segment.object_name, segment.audio_format, segment.byte_size)
+        for segment in result.scalars().all()
+    ]
+    audio_complete = bool(chapter.audio_bucket_name and chapter.audio_object_name)
+    segment_count = chapter.segment_count
+    if not published and audio_complete:
+        published = [(0, chapter.audio_bucket_name, chapter.audio_object_name, chapter.audio_format, None)]
+        segment_count = 1
+
+    segments = []
+    for index, bucket_name, object_name, format_name, byte_size in published:
+        audio_format = get_audio_format(format_name)
+        url = await minio.generate_presigned_url(
+            bucket_name=bucket_name,
+            object_name=object_name,
+            expires=PRESIGNED_URL_TTL,
+        )
+        segments.append(
+            ChapterAudioSegmentOut(
+                index=index,
+                url=url,
+                format=audio_format.name,
+                content_type=audio_format.content_type,
+                byte_size=byte_size,
+            )
+        )
+
+    has_more = (
+        not audio_complete
+        and tts_status not in (ChapterTTSStatus.READY, ChapterTTSStatus.FAILED)
+        and file_record.status != FileStatus.FAILED
+    )
+    logger.info(
+        "Chapter segment URLs issued",
+        extra={
+            "chapter_id": chapter_id,
+            "file_id": chapter.file_id,
+            "user_id": current_user.id,
+            "segments": len(segments),
+            "has_more": has_more,
+        },
+    )
+
+    return ChapterSegmentsResponse(
+        chapter_id=chapter_id,
+        segments=segments,
+        segment_count=segment_count,
+        status=tts_status.value,
+        has_more=has_more,
+        expires_in_seconds=int(PRESIGNED_URL_TTL.total_seconds()),
+    )
+
+
+@router.get(
+    "/{chapter_id}/text",
+    response_model=ChapterTextResponse,
+    summary="Get the text of a chapter",
+    description="""
+    Returns the chapter's text as it was stored after parsing and
+    normalization, which is what gets synthesized. File listings and details
+    leave chapter text out; this is where to read it.
+
+    **Access rules:** same as `GET /chapters/{chapter_id}/audio`.
+
+    **Returns:**
+    - 200: Chapter text
+    - 401: Not authenticated
+    - 403: Chapter belongs to a private file owned by another user
+    - 404: Chapter not found
+    """,
+    tags=["Chapters"],
+)
+async def get_chapter_text(
+    chapter_id: int,
+    db: AsyncSession = Depends(get_db_session),
+    current_user: User = Depends(get_current_user_dependency),
+) -> ChapterTextResponse:
+    chapter, _ = await _get_accessible_chapter(db, chapter_id, current_user, undefer(Chapter.content))
+
+    logger.info(
+        "Chapter text request",
+        extra={"chapter_id": chapter_id, "user_id": current_user.id, "chars": len(chapter.content)},
+    )
+
+    return ChapterTextResponse(
+        chapter_id=chapter.id,
+        chapter_index=chapter.chapter_index,
+        title=chapter.title,
+        content=chapter.content,
     )
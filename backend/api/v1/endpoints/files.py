@@ -11,10 +11,11 @@ from starlette import status
 from core.database import get_db_session
 from core.session import get_session_token, sessions
 from models import User
-from models.file import File as FileModel, FileVisibility
+from models.file import File as FileModel, FileTTSMode, FileVisibility
 from schemas.file import FileUploadResponse, FileListResponse, FileOut, FileDeleteResponse, FileVisibilityUpdate
 from services.auth import AuthService
 from services.files import FileService, FileValidationError
+from services.pdf_engines import PDF_ENGINES
 from worker.tasks import process_pdf as process_pdf_task
 
 logger = logging.getLogger(__name__)
@@ -128,6 +129,14 @@ async def get_current_user_dependency(
 async def upload_file(
         file: UploadFile = File(..., description="PDF file to upload"),
         visibility: str = Form("private", description="File visibility: 'private' or 'public'"),
+        tts_mode: str | None = Form(
+            None,
+            description="Chapter synthesis: 'eager' (all chapters) or 'lazy' (on demand); defaults to the server setting",
+        ),
+        extract_engine: str | None = Form(
+            None,
+            description="PDF text extraction engine: 'pdfplumber', 'pdfminer' or 'pdfium'; defaults to the server setting",
+        ),
         db: AsyncSession = Depends(get_db_session),
         current_user: User = Depends(get_current_user_dependency)
 ):
@@ -159,6 +168,20 @@ async def upload_file(
                 detail=f"Invalid visibility value '{visibility}'. Allowed: private, public"
             )
 
+        try:
+            tts_mode_enum = FileTTSMode(tts_mode) if tts_mode else None
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid tts_mode value '{tts_mode}'. Allowed: eager, lazy"
+            )
+
+        if extract_engine and extract_engine not in PDF_ENGINES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid extract_engine value '{extract_engine}'. Allowed: {', '.join(PDF_ENGINES)}"
+            )
+
         FileService.validate_pdf_files(file)
 
         existing_file = await FileService.check_duplicate_file(
@@ -202,6 +225,8 @@ async def upload_file(
                 file_size=actual_file_size,
                 mime_type=file.content_type,
                 visibility=visibility_enum,
+                tts_mode=tts_mode_enum,
+                extract_engine=extract_engine or None,
             )
         except Exception:
             await FileService.delete_uploaded_file(stored_filename)
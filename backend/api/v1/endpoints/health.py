@@ -4,8 +4,13 @@ from typing import Dict, Any
 
 from fastapi import APIRouter
 from pydantic import BaseModel
+from redis.exceptions import RedisError
 
 from core.config import settings
+from core.redis import get_redis_client
+from services.tts_cache import get_tts_cache
+from services.tts_limiter import get_tts_limiter
+from services.tts_router import collect_replica_metrics
 
 router = APIRouter()
 
@@ -126,4 +131,23 @@ async def metrics_endpoint():
         "cpu_usage_percent": 0,  # TODO: Implement CPU monitoring
     }
 
+    if settings.TTS_CACHE_ENABLED:
+        try:
+            metrics["tts_cache"] = await get_tts_cache().stats()
+        except RedisError as e:
+            metrics["tts_cache"] = {"status": "unavailable", "error": str(e)}
+
+    if settings.TTS_LIMITER_MODE == "redis":
+        try:
+            metrics["tts_limiter"] = await get_tts_limiter().stats()
+        except RedisError as e:
+            metrics["tts_limiter"] = {"status": "unavailable", "error": str(e)}
+
+    if settings.TTS_BACKEND == "coqui":
+        try:
+            metrics["tts_routing"] = await collect_replica_metrics(get_redis_client().get_client())
+        except (RedisError, ValueError, KeyError) as e:
+            # ValueError/KeyError: a worker published a snapshot this version cannot read.
+            metrics["tts_routing"] = {"status": "unavailable", "error": str(e)}
+
     return metrics
@@ -13,6 +13,7 @@ from schemas.reading_history import ReadingHistoryUpdate, ReadingHistoryOut, His
 from services.auth import AuthService
 from services.files import FileService
 from services.history import HistoryService
+from worker.scheduling import promote_listening_position
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -48,11 +49,18 @@ async def upsert_history(
     db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user_dependency),
 ) -> ReadingHistoryOut:
-    """Save or update the current user's playback position for a file."""
+    """
+    Save or update the current user's playback position for a file.
+
+    The chapter being listened to and the one after it are moved to the front of
+    the TTS queue if their audio is not ready yet. Positions past the end of a
+    chapter whose audio duration is known are clamped to that duration.
+    """
     file_record = await FileService.get_file_by_id(db, file_id, current_user.id)
     if not file_record:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
 
+    chapter = None
     if body.chapter_id is not None:
         result = await db.execute(select(Chapter).where(Chapter.id == body.chapter_id))
         chapter = result.scalar_one_or_none()
@@ -62,13 +70,19 @@ async def upsert_history(
                 detail="chapter_id does not belong to this file",
             )
 
+    position_seconds = body.position_seconds
+    if chapter is not None and chapter.audio_duration_seconds is not None:
+        position_seconds = min(position_seconds, chapter.audio_duration_seconds)
+
     record = await HistoryService.upsert_progress(
         db=db,
         user_id=current_user.id,
         file_id=file_id,
         chapter_id=body.chapter_id,
-        position_seconds=body.position_seconds,
+        position_seconds=position_seconds,
     )
+    if chapter is not None:
+        await promote_listening_position(db, chapter)
     return ReadingHistoryOut.model_validate(record)
 
 
@@ -0,0 +1,90 @@
+"""
+Track memory while extracting a long PDF page by page.
+
+Run from the backend directory (Linux only, RSS is read from /proc):
+
+    python -m benchmarks.page_memory
+    python -m benchmarks.page_memory --pages 2000 --every 250 --retain
+
+A synthetic book is extracted with each engine in a fresh interpreter, and
+the process RSS is printed every ``--every`` pages. Engines release each page
+once its text is read, so the rows should stay flat. ``--retain`` adds a
+pdfplumber run that leaves pages open, as extraction used to; it grows by
+roughly 5 MiB per page, so expect gigabytes on a 1000-page book.
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import subprocess
+import sys
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+
+import pdfplumber
+
+from benchmarks.synthetic_pdf import build_pdf
+from services.pdf_engines import PDF_ENGINES, get_pdf_engine
+
+RETAIN = "retain"
+
+
+def _rss_mib() -> float:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def _retained_page_texts(pdf_bytes: bytes) -> Iterator[str]:
+    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+        for page in pdf.pages:
+            yield page.extract_text() or ""
+
+
+def _extract(pdf_path: str, engine: str, every: int) -> None:
+    """Extract every page in this process, printing RSS in MiB before the first page and every ``every`` pages."""
+    samples = [_rss_mib()]
+    if engine == RETAIN:
+        pages = _retained_page_texts(Path(pdf_path).read_bytes())
+    else:
+        pages = get_pdf_engine(engine).open(pdf_path).iter_page_texts()
+    for count, _ in enumerate(pages, start=1):
+        if count % every == 0:
+            samples.append(_rss_mib())
+    print(" ".join(f"{sample:.1f}" for sample in samples))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--every", type=int, default=200)
+    parser.add_argument("--engines", nargs="+", default=list(PDF_ENGINES), choices=list(PDF_ENGINES))
+    parser.add_argument("--retain", action="store_true", help="Also run pdfplumber without releasing pages")
+    parser.add_argument("--child", nargs=3, metavar=("PDF", "ENGINE", "EVERY"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        pdf_path, engine, every = args.child
+        _extract(pdf_path, engine, int(every))
+        return
+
+    engines = [*args.engines, *([RETAIN] if args.retain else [])]
+    with tempfile.TemporaryDirectory() as workdir:
+        pdf_path = Path(workdir) / "book.pdf"
+        pdf_path.write_bytes(build_pdf(args.pages))
+        checkpoints = range(0, args.pages + 1, args.every)
+        print(f"RSS in MiB after N pages of a {args.pages}-page book")
+        print(f"{'engine':<10} " + " ".join(f"{count:>8}" for count in checkpoints))
+        for engine in engines:
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.page_memory", "--child", str(pdf_path), engine, str(args.every)],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            print(f"{engine:<10} " + " ".join(f"{float(sample):>8.1f}" for sample in output.split()))
+
+
+if __name__ == "__main__":
+    main()
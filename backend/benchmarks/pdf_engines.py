@@ -0,0 +1,84 @@
+"""
+Compare PDF text-extraction engines for speed and chapter-split fidelity.
+
+Run from the backend directory:
+
+    python -m benchmarks.pdf_engines
+    python -m benchmarks.pdf_engines --pdf book.pdf other.pdf
+
+Each document in a fixed synthetic corpus (different seeds, lengths and
+chapter spacings), plus any ``--pdf`` files, is parsed with
+``PdfParsingService.extract_document`` under every engine. pdfplumber is the
+reference: for the other engines the table shows how many chapters were
+found, how many chapter boundaries (title and start page) match pdfplumber's,
+and how similar the chapter text is once whitespace is ignored.
+"""
+from __future__ import annotations
+
+import argparse
+import difflib
+import time
+from pathlib import Path
+
+from benchmarks.synthetic_pdf import build_pdf
+from services.pdf_engines import PDF_ENGINES, get_pdf_engine
+from services.pdf_parser import ParsedDocument, PdfParsingService
+
+REFERENCE_ENGINE = "pdfplumber"
+
+# (name, page count, pages per chapter, seed)
+CORPUS = (
+    ("short", 40, 4, 1),
+    ("medium", 120, 12, 2),
+    ("long", 300, 25, 3),
+    ("dense", 80, 2, 4),
+)
+
+
+def _corpus(paths: list[Path]) -> list[tuple[str, int, bytes]]:
+    documents = [
+        (name, pages, build_pdf(pages, pages_per_chapter=spacing, seed=seed))
+        for name, pages, spacing, seed in CORPUS
+    ]
+    for path in paths:
+        pdf_bytes = path.read_bytes()
+        with get_pdf_engine("pdfium").open(pdf_bytes) as pdf:
+            documents.append((path.name, pdf.page_count, pdf_bytes))
+    return documents
+
+
+def _similarity(parsed: ParsedDocument, reference: ParsedDocument) -> float:
+    return difflib.SequenceMatcher(
+        None,
+        " ".join(c.content for c in parsed.chapters).split(),
+        " ".join(c.content for c in reference.chapters).split(),
+        autojunk=False,
+    ).ratio()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pdf", type=Path, nargs="*", default=[], help="Extra PDF files to include")
+    parser.add_argument("--engines", nargs="+", default=list(PDF_ENGINES), choices=list(PDF_ENGINES))
+    args = parser.parse_args()
+
+    engines = [REFERENCE_ENGINE, *(engine for engine in args.engines if engine != REFERENCE_ENGINE)]
+    print(f"{'document':<16} {'engine':<10} {'seconds':>8} {'pages/s':>8} {'chapters':>8} {'bounds':>9} {'text':>6}")
+    for name, pages, pdf_bytes in _corpus(args.pdf):
+        reference: ParsedDocument | None = None
+        for engine in engines:
+            started = time.perf_counter()
+            parsed = PdfParsingService.extract_document(pdf_bytes, fallback_title=name, engine=engine)
+            seconds = time.perf_counter() - started
+            if reference is None:
+                reference = parsed
+            boundaries = {(c.title, c.start_page) for c in reference.chapters}
+            matched = sum((c.title, c.start_page) in boundaries for c in parsed.chapters)
+            print(
+                f"{name:<16} {engine:<10} {seconds:>8.2f} {pages / seconds:>8.1f} {len(parsed.chapters):>8}"
+                f" {matched:>4}/{len(reference.chapters):<4} {_similarity(parsed, reference):>6.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
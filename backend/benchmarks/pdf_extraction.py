@@ -0,0 +1,66 @@
+"""
+Measure page-parallel PDF extraction speedup against worker count.
+
+Run from the backend directory:
+
+    python -m benchmarks.pdf_extraction --pages 600 --workers 1 2 4 8
+
+A synthetic text PDF is extracted with ``PdfParsingService.extract_document``
+at each PDF_EXTRACT_WORKERS value; every parallel result is checked against
+the serial one. The pool is warmed up before timing, as it is in a long-lived
+worker, so process start-up is excluded.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+from benchmarks.synthetic_pdf import build_pdf
+from core.config import settings
+from services.pdf_parser import (
+    PdfParsingService,
+    get_pdf_extraction_pool,
+    shutdown_pdf_extraction_pool,
+)
+
+
+def _time_extraction(pdf_bytes: bytes, workers: int) -> tuple[float, object]:
+    settings.PDF_EXTRACT_WORKERS = workers
+    if workers > 1:
+        pool = get_pdf_extraction_pool(workers)
+        # Start every process before timing.
+        list(pool.map(abs, range(workers * 4)))
+    started = time.perf_counter()
+    parsed = PdfParsingService.extract_document(pdf_bytes)
+    return time.perf_counter() - started, parsed
+
+
+def main() -> None:
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=600)
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, 4, cores}))
+    args = parser.parse_args()
+
+    pdf_bytes = build_pdf(args.pages)
+    settings.PDF_PARALLEL_MIN_PAGES = 2
+    print(f"{args.pages} pages, {len(pdf_bytes) / 2**20:.1f} MiB, {cores} CPU cores")
+    print(f"{'workers':>7} {'seconds':>8} {'pages/s':>8} {'speedup':>8}")
+
+    baseline_seconds, baseline = _time_extraction(pdf_bytes, 1)
+    print(f"{1:>7} {baseline_seconds:>8.2f} {args.pages / baseline_seconds:>8.1f} {1:>8.2f}")
+    try:
+        for workers in args.workers:
+            if workers == 1:
+                continue
+            seconds, parsed = _time_extraction(pdf_bytes, workers)
+            if parsed != baseline:
+                raise SystemExit(f"Parallel extraction with {workers} workers differs from serial output")
+            print(f"{workers:>7} {seconds:>8.2f} {args.pages / seconds:>8.1f} {baseline_seconds / seconds:>8.2f}")
+    finally:
+        shutdown_pdf_extraction_pool()
+
+
+if __name__ == "__main__":
+    main()
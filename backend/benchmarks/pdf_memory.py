@@ -0,0 +1,76 @@
+"""
+Compare peak memory of parsing a PDF held in memory with parsing it from disk.
+
+Run from the backend directory:
+
+    python -m benchmarks.pdf_memory
+    python -m benchmarks.pdf_memory --pages 2000 --engines pdfium pdfminer
+    python -m benchmarks.pdf_memory --pdf book.pdf
+
+Each run happens in a fresh interpreter, so its peak RSS covers only that
+parse. "bytes" reads the whole file first and parses the bytes, as the worker
+used to; "path" parses straight from the file, as the worker does now after
+spooling the download to a temp file.
+"""
+from __future__ import annotations
+
+import argparse
+import resource
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.synthetic_pdf import build_pdf
+from services.pdf_engines import PDF_ENGINES
+from services.pdf_parser import PdfParsingService
+
+SOURCES = ("bytes", "path")
+
+
+def _parse(pdf_path: str, engine: str, source: str) -> None:
+    """Parse in this process and print its peak RSS in MiB."""
+    if source == "bytes":
+        PdfParsingService.extract_document(Path(pdf_path).read_bytes(), engine=engine)
+    else:
+        PdfParsingService.extract_document(pdf_path, engine=engine)
+    # ru_maxrss is in kilobytes on Linux.
+    print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)
+
+
+def _peak_rss_mib(pdf_path: Path, engine: str, source: str) -> float:
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.pdf_memory", "--child", str(pdf_path), engine, source],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return float(output.split()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--pdf", type=Path, help="Parse this file instead of a synthetic book")
+    parser.add_argument("--engines", nargs="+", default=list(PDF_ENGINES), choices=list(PDF_ENGINES))
+    parser.add_argument("--child", nargs=3, metavar=("PDF", "ENGINE", "SOURCE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _parse(*args.child)
+        return
+
+    with tempfile.TemporaryDirectory() as workdir:
+        pdf_path = args.pdf
+        if pdf_path is None:
+            pdf_path = Path(workdir) / "book.pdf"
+            pdf_path.write_bytes(build_pdf(args.pages))
+        print(f"{pdf_path.name}: {pdf_path.stat().st_size / 2**20:.1f} MiB")
+        print(f"{'engine':<10} {'source':<6} {'peak MiB':>9}")
+        for engine in args.engines:
+            for source in SOURCES:
+                print(f"{engine:<10} {source:<6} {_peak_rss_mib(pdf_path, engine, source):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Generate text PDFs of any length for extraction benchmarks and tests.
+
+The output is a plain PDF 1.4 file with one Helvetica text stream per page:
+a chapter heading every few pages, a page of prose lines and a page number.
+Optionally headings are set larger and bold, decoy lines that only look like
+headings are mixed into the prose, and the chapters are listed in an outline
+(bookmarks), which then records where every real chapter starts. It is
+deterministic for a given seed.
+"""
+from __future__ import annotations
+
+import random
+
+WORDS = (
+    "the", "river", "carried", "a", "quiet", "light", "across", "old", "stone", "bridge", "where",
+    "travellers", "paused", "to", "listen", "for", "voices", "of", "morning", "and", "distant", "bells",
+    "that", "rang", "over", "fields", "as", "clouds", "gathered", "slowly", "above", "harbour", "town",
+)
+LINE_HEIGHT = 14
+TOP_MARGIN = 770
+BODY_SIZE = 11
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _page_lines(
+    rng: random.Random, page_number: int, pages_per_chapter: int, lines_per_page: int, decoy_lines: int
+) -> list[str]:
+    lines = []
+    if (page_number - 1) % pages_per_chapter == 0:
+        chapter = (page_number - 1) // pages_per_chapter + 1
+        lines.append(f"Chapter {chapter} {rng.choice(WORDS).title()} {rng.choice(WORDS).title()}")
+    while len(lines) < lines_per_page:
+        sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 12)))
+        lines.append(f"{sentence[0].upper()}{sentence[1:]}.")
+    for _ in range(decoy_lines):
+        # Numbered steps and shouted phrases in body type, which text-based detection takes for headings.
+        words = [rng.choice(WORDS) for _ in range(rng.randint(3, 5))]
+        decoy = f"{rng.randint(1, 9)}.{rng.randint(1, 9)} {' '.join(words).capitalize()}" if rng.random() < 0.5 else " ".join(words).upper()
+        lines.insert(rng.randint(1 + len(lines) // 2, len(lines)), decoy)
+    return lines
+
+
+def _content_stream(lines: list[str], page_number: int, heading_size: float | None) -> bytes:
+    operations = [f"BT /F1 {BODY_SIZE} Tf {LINE_HEIGHT} TL 72 {TOP_MARGIN} Td"]
+    for line in lines:
+        if heading_size and line.startswith("Chapter "):
+            operations.append(
+                f"/F2 {heading_size:g} Tf ({_escape(line)}) Tj {heading_size * 1.5:g} TL T* /F1 {BODY_SIZE} Tf {LINE_HEIGHT} TL"
+            )
+        else:
+            operations.append(f"({_escape(line)}) Tj T*")
+    operations.append(f"ET BT /F1 9 Tf 300 40 Td ({page_number}) Tj ET")
+    return "\n".join(operations).encode("latin-1")
+
+
+def build_pdf(
+    page_count: int,
+    *,
+    lines_per_page: int = 45,
+    pages_per_chapter: int = 20,
+    title: str = "Synthetic Book",
+    author: str = "Benchmark Author",
+    seed: int = 0,
+    outline: bool = False,
+    heading_size: float | None = None,
+    decoy_lines: int = 0,
+) -> bytes:
+    """
+    Build a ``page_count``-page PDF with a chapter heading every ``pages_per_chapter`` pages.
+
+    With ``outline``, each chapter also gets a top-level bookmark titled like
+    its heading and pointing at its first page. With ``heading_size``,
+    headings are set in Helvetica Bold at that size. ``decoy_lines`` adds
+    that many heading-like lines in body type to every page.
+    """
+    rng = random.Random(seed)
+    # Objects 1-4 are the catalog, page tree, fonts and document info; pages follow in pairs.
+    page_ids = [5 + 2 * index for index in range(page_count)]
+    outline_id = 5 + 2 * page_count
+    objects: dict[int, bytes] = {
+        1: b"<< /Type /Catalog /Pages 2 0 R%s >>" % (b" /Outlines %d 0 R" % outline_id if outline else b""),
+        2: f"<< /Type /Pages /Kids [{' '.join(f'{pid} 0 R' for pid in page_ids)}] /Count {page_count} >>".encode(),
+        3: (
+            b"<< /F1 << /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"
+            b" /F2 << /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >> >>"
+        ),
+        4: f"<< /Title ({_escape(title)}) /Author ({_escape(author)}) >>".encode("latin-1"),
+    }
+    headings: list[tuple[str, int]] = []
+    for index, page_id in enumerate(page_ids):
+        page_number = index + 1
+        lines = _page_lines(rng, page_number, pages_per_chapter, lines_per_page, decoy_lines)
+        if (page_number - 1) % pages_per_chapter == 0:
+            headings.append((lines[0], page_id))
+        stream = _content_stream(lines, page_number, heading_size)
+        objects[page_id] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font 3 0 R >> /Contents {page_id + 1} 0 R >>"
+        ).encode()
+        objects[page_id + 1] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+
+    if outline:
+        entry_ids = [outline_id + 1 + index for index in range(len(headings))]
+        objects[outline_id] = b"<< /Type /Outlines /First %d 0 R /Last %d 0 R /Count %d >>" % (
+            entry_ids[0], entry_ids[-1], len(entry_ids)
+        )
+        for index, ((heading, page_id), entry_id) in enumerate(zip(headings, entry_ids, strict=True)):
+            links = f" /Prev {entry_id - 1} 0 R" if index else ""
+            links += f" /Next {entry_id + 1} 0 R" if index < len(entry_ids) - 1 else ""
+            objects[entry_id] = (
+                f"<< /Title ({_escape(heading)}) /Parent {outline_id} 0 R{links} /Dest [{page_id} 0 R /Fit] >>"
+            ).encode("latin-1")
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for object_id in sorted(objects):
+        offsets[object_id] = len(output)
+        output += b"%d 0 obj\n%s\nendobj\n" % (object_id, objects[object_id])
+
+    xref_offset = len(output)
+    size = max(objects) + 1
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % size
+    output += b"".join(b"%010d 00000 n \n" % offsets[object_id] for object_id in range(1, size))
+    output += b"trailer\n<< /Size %d /Root 1 0 R /Info 4 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref_offset)
+    return bytes(output)
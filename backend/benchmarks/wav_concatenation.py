@@ -0,0 +1,117 @@
+"""
+Compare WAV segment concatenation strategies on long synthesized audio.
+
+Run from the backend directory:
+
+    python -m benchmarks.wav_concatenation --minutes 60 --segments 240
+
+Segments are generated on disk first, then joined by:
+
+- naive: decode every segment with soundfile, join the samples in one array and
+  re-encode it (the approach the assembler replaces);
+- file: ``AudioService.concatenate_wav`` into a temp file;
+- stream: ``AudioService.iter_concatenated_wav`` consumed chunk by chunk, as the
+  worker does when uploading.
+
+Peak memory is the tracemalloc high-water mark, which includes numpy buffers.
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+import wave
+from collections.abc import Callable
+from contextlib import ExitStack
+from pathlib import Path
+from typing import BinaryIO
+
+import numpy as np
+import soundfile as sf
+
+from services.audio import AudioService
+
+GENERATE_BLOCK_FRAMES = 1 << 20
+
+
+def _write_segment(path: Path, frames: int, sample_rate: int, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    with wave.open(str(path), "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(sample_rate)
+        remaining = frames
+        while remaining:
+            count = min(remaining, GENERATE_BLOCK_FRAMES)
+            writer.writeframes(rng.integers(-8000, 8000, count, dtype="<i2").tobytes())
+            remaining -= count
+
+
+def _naive(sources: list[BinaryIO], destination: BinaryIO) -> None:
+    samples = []
+    sample_rate = 0
+    for source in sources:
+        data, sample_rate = sf.read(source, dtype="int16")
+        samples.append(data)
+    sf.write(destination, np.concatenate(samples), sample_rate, format="WAV", subtype="PCM_16")
+
+
+def _file(sources: list[BinaryIO], destination: BinaryIO) -> None:
+    AudioService.concatenate_wav(sources, destination)
+
+
+def _stream(sources: list[BinaryIO], destination: BinaryIO) -> None:
+    destination.writelines(AudioService.iter_concatenated_wav(sources))
+
+
+STRATEGIES: dict[str, Callable[[list[BinaryIO], BinaryIO], None]] = {
+    "naive": _naive,
+    "file": _file,
+    "stream": _stream,
+}
+
+
+def _run(strategy: Callable[[list[BinaryIO], BinaryIO], None], paths: list[Path], workdir: Path) -> tuple[float, int, int]:
+    output = workdir / "combined.wav"
+    with ExitStack() as files:
+        sources = [files.enter_context(path.open("rb")) for path in paths]
+        destination = files.enter_context(output.open("wb"))
+        tracemalloc.start()
+        started = time.perf_counter()
+        strategy(sources, destination)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    size = output.stat().st_size
+    output.unlink()
+    return elapsed, peak, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--minutes", type=float, default=60.0, help="total audio length")
+    parser.add_argument("--segments", type=int, default=240, help="number of segments to join")
+    parser.add_argument("--sample-rate", type=int, default=22050)
+    parser.add_argument("--strategies", nargs="+", choices=STRATEGIES, default=list(STRATEGIES))
+    args = parser.parse_args()
+
+    total_frames = int(args.minutes * 60 * args.sample_rate)
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        paths = []
+        for index in range(args.segments):
+            frames = total_frames // args.segments + (index < total_frames % args.segments)
+            path = workdir / f"segment_{index:04d}.wav"
+            _write_segment(path, frames, args.sample_rate, seed=index)
+            paths.append(path)
+
+        print(f"{args.minutes:g} min at {args.sample_rate} Hz mono in {args.segments} segments")
+        print(f"{'strategy':<8} {'seconds':>8} {'peak MiB':>9} {'output MiB':>11}")
+        for name in args.strategies:
+            elapsed, peak, size = _run(STRATEGIES[name], paths, workdir)
+            print(f"{name:<8} {elapsed:>8.2f} {peak / 2**20:>9.1f} {size / 2**20:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -36,8 +36,98 @@ class Settings(BaseSettings):
 
     CELERY_BROKER_URL: str = os.getenv("CELERY_BROKER_URL")
     CELERY_RESULT_BACKEND: str = os.getenv("CELERY_RESULT_BACKEND")
+    WORKER_MAX_MEMORY_MB: int = os.getenv("WORKER_MAX_MEMORY_MB", "0")
+    CELERY_TASK_TIME_LIMIT: int = os.getenv("CELERY_TASK_TIME_LIMIT", "300")
+    CELERY_TASK_SOFT_TIME_LIMIT: int = os.getenv("CELERY_TASK_SOFT_TIME_LIMIT", "240")
 
     TTS_SERVICE_URL: str = os.getenv("TTS_SERVICE_URL", "http://coqui-tts:5002")
+    TTS_SERVICE_URLS: str = os.getenv("TTS_SERVICE_URLS", "")
+    TTS_BACKEND: str = os.getenv("TTS_BACKEND", "coqui")
+
+    TTS_ROUTER_BALANCE_BY: str = os.getenv("TTS_ROUTER_BALANCE_BY", "chars")
+    TTS_ROUTER_FAILURE_THRESHOLD: int = os.getenv("TTS_ROUTER_FAILURE_THRESHOLD", "3")
+    TTS_ROUTER_LATENCY_SPIKE_FACTOR: float = os.getenv("TTS_ROUTER_LATENCY_SPIKE_FACTOR", "4.0")
+    TTS_ROUTER_PROBE_INTERVAL: float = os.getenv("TTS_ROUTER_PROBE_INTERVAL", "10")
+    TTS_ROUTER_PROBE_TIMEOUT: float = os.getenv("TTS_ROUTER_PROBE_TIMEOUT", "2")
+    TTS_ROUTER_PROBE_PATH: str = os.getenv("TTS_ROUTER_PROBE_PATH", "/")
+    TTS_ROUTER_METRICS_INTERVAL: float = os.getenv("TTS_ROUTER_METRICS_INTERVAL", "5")
+    TTS_BREAKER_OPEN_SECONDS: float = os.getenv("TTS_BREAKER_OPEN_SECONDS", "30")
+    TTS_HEDGE_ENABLED: bool = os.getenv("TTS_HEDGE_ENABLED", "false")
+    TTS_HEDGE_PERCENTILE: float = os.getenv("TTS_HEDGE_PERCENTILE", "95")
+    TTS_HEDGE_MIN_DELAY: float = os.getenv("TTS_HEDGE_MIN_DELAY", "1.0")
+    TTS_HEDGE_MAX_RATIO: float = os.getenv("TTS_HEDGE_MAX_RATIO", "0.1")
+
+    TTS_LIMITER_MODE: str = os.getenv("TTS_LIMITER_MODE", "redis")
+    TTS_LIMITER_INITIAL: float = os.getenv("TTS_LIMITER_INITIAL", "4")
+    TTS_LIMITER_MIN: float = os.getenv("TTS_LIMITER_MIN", "1")
+    TTS_LIMITER_MAX: float = os.getenv("TTS_LIMITER_MAX", "64")
+    TTS_LIMITER_DECREASE_FACTOR: float = os.getenv("TTS_LIMITER_DECREASE_FACTOR", "0.5")
+    TTS_LIMITER_TARGET_MS_PER_CHAR: float = os.getenv("TTS_LIMITER_TARGET_MS_PER_CHAR", "60")
+    TTS_LIMITER_DECREASE_COOLDOWN: float = os.getenv("TTS_LIMITER_DECREASE_COOLDOWN", "2")
+    TTS_LIMITER_LEASE_TTL: float = os.getenv("TTS_LIMITER_LEASE_TTL", "30")
+
+    TTS_STUB_SAMPLE_RATE: int = os.getenv("TTS_STUB_SAMPLE_RATE", "22050")
+    TTS_STUB_SECONDS_PER_CHAR: float = os.getenv("TTS_STUB_SECONDS_PER_CHAR", "0.06")
+    TTS_STUB_LATENCY_SECONDS: float = os.getenv("TTS_STUB_LATENCY_SECONDS", "0")
+    TTS_STUB_CHARS_PER_SECOND: float = os.getenv("TTS_STUB_CHARS_PER_SECOND", "0")
+
+    TTS_HTTP_MAX_CONNECTIONS: int = os.getenv("TTS_HTTP_MAX_CONNECTIONS", "20")
+    TTS_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = os.getenv("TTS_HTTP_MAX_KEEPALIVE_CONNECTIONS", "10")
+    TTS_HTTP_KEEPALIVE_EXPIRY: float = os.getenv("TTS_HTTP_KEEPALIVE_EXPIRY", "60.0")
+    TTS_HTTP_CONNECT_TIMEOUT: float = os.getenv("TTS_HTTP_CONNECT_TIMEOUT", "5.0")
+    TTS_HTTP_READ_TIMEOUT: float = os.getenv("TTS_HTTP_READ_TIMEOUT", "120.0")
+    TTS_HTTP_WRITE_TIMEOUT: float = os.getenv("TTS_HTTP_WRITE_TIMEOUT", "30.0")
+    TTS_HTTP_POOL_TIMEOUT: float = os.getenv("TTS_HTTP_POOL_TIMEOUT", "30.0")
+
+    PDF_EXTRACT_ENGINE: str = os.getenv("PDF_EXTRACT_ENGINE", "pdfplumber")
+    PDF_OUTLINE_CHAPTERS: bool = os.getenv("PDF_OUTLINE_CHAPTERS", "true")
+    PDF_HEADING_DETECTION: str = os.getenv("PDF_HEADING_DETECTION", "text")
+    PDF_HEADING_SIZE_RATIO: float = os.getenv("PDF_HEADING_SIZE_RATIO", "1.2")
+    PDF_HEADING_MAX_PAGE_CHARS: int = os.getenv("PDF_HEADING_MAX_PAGE_CHARS", "20000")
+    PDF_PAGE_CACHE_ENABLED: bool = os.getenv("PDF_PAGE_CACHE_ENABLED", "true")
+    PDF_PAGE_CACHE_TTL_SECONDS: int = os.getenv("PDF_PAGE_CACHE_TTL_SECONDS", str(7 * 24 * 3600))
+    PDF_CHECKPOINT_MARGIN_SECONDS: int = os.getenv("PDF_CHECKPOINT_MARGIN_SECONDS", "30")
+    PDF_MAX_CONTINUATIONS: int = os.getenv("PDF_MAX_CONTINUATIONS", "20")
+    PDF_CHAPTER_INSERT_BATCH: int = os.getenv("PDF_CHAPTER_INSERT_BATCH", "100")
+    PDF_EXTRACT_WORKERS: int = os.getenv("PDF_EXTRACT_WORKERS", "1")
+    PDF_PARALLEL_MIN_PAGES: int = os.getenv("PDF_PARALLEL_MIN_PAGES", "24")
+
+    TEXT_NORMALIZATION_RULES: str = os.getenv(
+        "TEXT_NORMALIZATION_RULES",
+        # abbreviations and numbers rewrite the words of the stored text, so they are opt-in.
+        "dehyphenate,page_numbers,urls,numeric_noise,unwrap,punctuation",
+    )
+
+    TTS_SEGMENT_MAX_CHARS: int = os.getenv("TTS_SEGMENT_MAX_CHARS", "1000")
+    TTS_SEGMENT_CONCURRENCY: int = os.getenv("TTS_SEGMENT_CONCURRENCY", "4")
+    TTS_PROGRESSIVE_SEGMENTS: bool = os.getenv("TTS_PROGRESSIVE_SEGMENTS", "true")
+
+    TTS_PROCESSING_MODE: str = os.getenv("TTS_PROCESSING_MODE", "eager")
+    TTS_EAGER_CHAPTERS: int = os.getenv("TTS_EAGER_CHAPTERS", "3")
+    TTS_PREFETCH_CHAPTERS: int = os.getenv("TTS_PREFETCH_CHAPTERS", "1")
+    TTS_ON_DEMAND_MAX_JOBS: int = os.getenv("TTS_ON_DEMAND_MAX_JOBS", "8")
+    TTS_PROMOTION_DEDUPE_SECONDS: int = os.getenv("TTS_PROMOTION_DEDUPE_SECONDS", "60")
+    TTS_CHAPTER_LOCK_TTL: int = os.getenv("TTS_CHAPTER_LOCK_TTL", "330")
+    TTS_CHAPTER_DEFER_SECONDS: float = os.getenv("TTS_CHAPTER_DEFER_SECONDS", "30")
+
+    TTS_STREAM_CHUNK_SIZE: int = os.getenv("TTS_STREAM_CHUNK_SIZE", str(64 * 1024))
+    TTS_SPOOL_MAX_MEMORY: int = os.getenv("TTS_SPOOL_MAX_MEMORY", str(2 * 1024 * 1024))
+    TTS_UPLOAD_PART_SIZE: int = os.getenv("TTS_UPLOAD_PART_SIZE", str(8 * 1024 * 1024))
+    TTS_UPLOAD_PARALLEL_PARTS: int = os.getenv("TTS_UPLOAD_PARALLEL_PARTS", "3")
+
+    TTS_OUTPUT_FORMAT: str = os.getenv("TTS_OUTPUT_FORMAT", "wav")
+    TTS_OUTPUT_BITRATE_KBPS: int = os.getenv("TTS_OUTPUT_BITRATE_KBPS", "32")
+    TTS_OUTPUT_SAMPLE_RATE: int = os.getenv("TTS_OUTPUT_SAMPLE_RATE", "24000")
+    TTS_OUTPUT_MONO: bool = os.getenv("TTS_OUTPUT_MONO", "true")
+
+    TTS_MODEL_NAME: str = os.getenv("TTS_MODEL_NAME", "tts_models/en/ljspeech/tacotron2-DDC")
+    TTS_VOICE: str = os.getenv("TTS_VOICE", "")
+
+    TTS_CACHE_ENABLED: bool = os.getenv("TTS_CACHE_ENABLED", "false")
+    TTS_CACHE_BUCKET: str = os.getenv("TTS_CACHE_BUCKET", "tts-cache")
+    TTS_CACHE_MAX_BYTES: int = os.getenv("TTS_CACHE_MAX_BYTES", str(20 * 1024 ** 3))
+    TTS_CACHE_MAX_AGE_SECONDS: int = os.getenv("TTS_CACHE_MAX_AGE_SECONDS", str(30 * 24 * 3600))
+    TTS_CACHE_LOCK_TIMEOUT: float = os.getenv("TTS_CACHE_LOCK_TIMEOUT", "180")
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -54,6 +144,80 @@ class Settings(BaseSettings):
             return v
         raise ValueError("ALLOWED_HOSTS must be a list or comma-separated string")
 
+    @field_validator("TTS_BACKEND", mode="before")
+    @classmethod
+    def validate_tts_backend(cls, v):
+        backend = str(v).strip().lower()
+        if backend not in {"coqui", "stub"}:
+            raise ValueError("TTS_BACKEND must be one of: coqui, stub")
+        return backend
+
+    @field_validator("TTS_ROUTER_BALANCE_BY", mode="before")
+    @classmethod
+    def validate_tts_router_balance_by(cls, v):
+        balance_by = str(v).strip().lower()
+        if balance_by not in {"chars", "requests"}:
+            raise ValueError("TTS_ROUTER_BALANCE_BY must be one of: chars, requests")
+        return balance_by
+
+    @field_validator("TTS_LIMITER_MODE", mode="before")
+    @classmethod
+    def validate_tts_limiter_mode(cls, v):
+        mode = str(v).strip().lower()
+        if mode not in {"off", "local", "redis"}:
+            raise ValueError("TTS_LIMITER_MODE must be one of: off, local, redis")
+        return mode
+
+    @field_validator("PDF_EXTRACT_ENGINE", mode="before")
+    @classmethod
+    def validate_pdf_extract_engine(cls, v):
+        engine = str(v).strip().lower()
+        if engine not in {"pdfplumber", "pdfminer", "pdfium"}:
+            raise ValueError("PDF_EXTRACT_ENGINE must be one of: pdfplumber, pdfminer, pdfium")
+        return engine
+
+    @field_validator("PDF_HEADING_DETECTION", mode="before")
+    @classmethod
+    def validate_pdf_heading_detection(cls, v):
+        detection = str(v).strip().lower()
+        if detection not in {"text", "font"}:
+            raise ValueError("PDF_HEADING_DETECTION must be one of: text, font")
+        return detection
+
+    @field_validator("PDF_CHECKPOINT_MARGIN_SECONDS")
+    @classmethod
+    def validate_pdf_checkpoint_margin(cls, v, info):
+        soft_limit = (info.data or {}).get("CELERY_TASK_SOFT_TIME_LIMIT")
+        if soft_limit and v >= soft_limit:
+            raise ValueError("PDF_CHECKPOINT_MARGIN_SECONDS must be less than CELERY_TASK_SOFT_TIME_LIMIT")
+        return v
+
+    @field_validator("TEXT_NORMALIZATION_RULES", mode="before")
+    @classmethod
+    def validate_text_normalization_rules(cls, v):
+        rules = [rule.strip().lower() for rule in str(v).split(",") if rule.strip()]
+        allowed = {"dehyphenate", "page_numbers", "urls", "numeric_noise", "unwrap", "punctuation", "abbreviations", "numbers"}
+        unknown = sorted(set(rules) - allowed)
+        if unknown:
+            raise ValueError(f"TEXT_NORMALIZATION_RULES has unknown rules: {', '.join(unknown)}")
+        return ",".join(rules)
+
+    @field_validator("TTS_PROCESSING_MODE", mode="before")
+    @classmethod
+    def validate_tts_processing_mode(cls, v):
+        mode = str(v).strip().lower()
+        if mode not in {"eager", "lazy"}:
+            raise ValueError("TTS_PROCESSING_MODE must be one of: eager, lazy")
+        return mode
+
+    @field_validator("TTS_OUTPUT_FORMAT", mode="before")
+    @classmethod
+    def validate_tts_output_format(cls, v):
+        fmt = str(v).strip().lower()
+        if fmt not in {"wav", "opus", "mp3", "flac"}:
+            raise ValueError("TTS_OUTPUT_FORMAT must be one of: wav, opus, mp3, flac")
+        return fmt
+
     @staticmethod
     def _build_redis_url(data: dict) -> str:
         redis_host = data.get("REDIS_HOST", "localhost")
@@ -91,6 +255,19 @@ class Settings(BaseSettings):
             f"@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
 
+    @computed_field
+    @property
+    def tts_service_urls(self) -> list[str]:
+        """TTS replicas to balance across; falls back to the single TTS_SERVICE_URL."""
+        urls = [url.strip() for url in self.TTS_SERVICE_URLS.split(",") if url.strip()]
+        return urls or [self.TTS_SERVICE_URL]
+
+    @computed_field
+    @property
+    def text_normalization_rules(self) -> list[str]:
+        """Enabled text normalization rules; empty when normalization is off."""
+        return [rule for rule in self.TEXT_NORMALIZATION_RULES.split(",") if rule]
+
     @computed_field
     @property
     def redis_url(self) -> str:
@@ -72,6 +72,63 @@ async def run_schema_migrations():
         ALTER TABLE files
           ADD COLUMN IF NOT EXISTS visibility filevisibility NOT NULL DEFAULT 'PRIVATE'
         """,
+        """
+        ALTER TABLE chapters
+          ADD COLUMN IF NOT EXISTS audio_format VARCHAR(16)
+        """,
+        """
+        ALTER TABLE chapters
+          ADD COLUMN IF NOT EXISTS segment_count INTEGER
+        """,
+        """
+        DO $$
+        BEGIN
+          IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'filettsmode') THEN
+            CREATE TYPE filettsmode AS ENUM ('EAGER', 'LAZY');
+          END IF;
+          IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'chapterttsstatus') THEN
+            CREATE TYPE chapterttsstatus AS ENUM ('PENDING', 'QUEUED', 'SYNTHESIZING', 'READY', 'FAILED');
+          END IF;
+        END $$
+        """,
+        """
+        ALTER TABLE files
+          ADD COLUMN IF NOT EXISTS tts_mode filettsmode
+        """,
+        """
+        ALTER TABLE chapters
+          ADD COLUMN IF NOT EXISTS tts_status chapterttsstatus NOT NULL DEFAULT 'PENDING',
+          ADD COLUMN IF NOT EXISTS tts_on_demand BOOLEAN NOT NULL DEFAULT FALSE
+        """,
+        """
+        UPDATE chapters SET tts_status = 'READY'
+          WHERE tts_status = 'PENDING' AND audio_object_name IS NOT NULL
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS ix_chapters_tts_status ON chapters (tts_status)
+        """,
+        """
+        ALTER TABLE chapters
+          ADD COLUMN IF NOT EXISTS audio_duration_seconds DOUBLE PRECISION,
+          ADD COLUMN IF NOT EXISTS audio_byte_size BIGINT,
+          ADD COLUMN IF NOT EXISTS audio_sample_rate INTEGER,
+          ADD COLUMN IF NOT EXISTS audio_channels INTEGER,
+          ADD COLUMN IF NOT EXISTS audio_checksum VARCHAR(64)
+        """,
+        """
+        ALTER TABLE files
+          ADD COLUMN IF NOT EXISTS audio_duration_seconds DOUBLE PRECISION,
+          ADD COLUMN IF NOT EXISTS audio_byte_size BIGINT
+        """,
+        """
+        ALTER TABLE files
+          ADD COLUMN IF NOT EXISTS chapter_count INTEGER,
+          ADD COLUMN IF NOT EXISTS extract_engine VARCHAR(16)
+        """,
+        """
+        UPDATE files SET chapter_count = (SELECT COUNT(*) FROM chapters WHERE chapters.file_id = files.id)
+          WHERE chapter_count IS NULL AND EXISTS (SELECT 1 FROM chapters WHERE chapters.file_id = files.id)
+        """,
     ]
     try:
         async with engine.begin() as conn:
@@ -4,7 +4,9 @@ MinIO client configuration and utilities for object storage.
 This module provides a singleton MinIO client instance and utility functions
 for file operations including bucket management and file uploads.
 """
+import asyncio
 import logging
+from collections.abc import AsyncIterable
 from datetime import timedelta
 from typing import Optional, Union, BinaryIO
 from io import BytesIO
@@ -16,6 +18,43 @@ from core.config import settings
 
 logger = logging.getLogger(__name__)
 
+class _AsyncIterableReader:
+    """
+    Blocking file-like adapter over an async byte iterator.
+
+    minio's ``put_object`` reads its input synchronously from a worker thread;
+    each ``read`` pulls the next chunks from the iterator on the owning event loop.
+    """
+
+    def __init__(self, chunks: AsyncIterable[bytes], loop: asyncio.AbstractEventLoop):
+        self._iterator = chunks.__aiter__()
+        self._loop = loop
+        self._buffer = bytearray()
+        self._exhausted = False
+        self.bytes_read = 0
+
+    async def _next_chunk(self) -> Optional[bytes]:
+        try:
+            return await self._iterator.__anext__()
+        except StopAsyncIteration:
+            return None
+
+    def read(self, size: int = -1) -> bytes:
+        while not self._exhausted and (size < 0 or len(self._buffer) < size):
+            chunk = asyncio.run_coroutine_threadsafe(self._next_chunk(), self._loop).result()
+            if chunk is None:
+                self._exhausted = True
+            else:
+                self._buffer.extend(chunk)
+
+        if size < 0 or size > len(self._buffer):
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        self.bytes_read += len(data)
+        return data
+
+
 class MinIOClient:
 
     def __init__(self):
@@ -146,6 +185,81 @@ class MinIOClient:
             )
             raise
 
+    async def upload_stream(
+            self,
+            bucket_name: str,
+            object_name: str,
+            chunks: AsyncIterable[bytes],
+            content_type: str = "application/octet-stream",
+            part_size: int = 8 * 1024 * 1024,
+            num_parallel_uploads: int = 3
+    ) -> int:
+        """
+        Upload an async byte stream of unknown length as a multipart upload.
+
+        Data is consumed part by part while parts upload in parallel, so memory
+        stays at roughly ``part_size * (num_parallel_uploads + 1)`` regardless of
+        the object size. A failed stream aborts the multipart upload.
+
+        Args:
+            bucket_name: Target bucket name
+            object_name: Name for the stored object
+            chunks: Async iterator producing the object's bytes
+            content_type: MIME type of the object
+            part_size: Multipart part size in bytes (minimum 5 MiB)
+            num_parallel_uploads: Number of parts uploaded concurrently
+
+        Returns:
+            int: Number of bytes uploaded
+
+        Raises:
+            S3Error: If upload fails
+        """
+        client = self.get_client()
+        reader = _AsyncIterableReader(chunks, asyncio.get_running_loop())
+
+        try:
+            await self.ensure_bucket_exists(bucket_name)
+
+            await asyncio.to_thread(
+                client.put_object,
+                bucket_name=bucket_name,
+                object_name=object_name,
+                data=reader,
+                length=-1,
+                content_type=content_type,
+                part_size=part_size,
+                num_parallel_uploads=num_parallel_uploads
+            )
+
+            logger.info(
+                "Stream uploaded to MinIO",
+                extra={
+                    "bucket_name": bucket_name,
+                    "object_name": object_name,
+                    "file_size": reader.bytes_read,
+                    "part_size": part_size,
+                    "content_type": content_type
+                }
+            )
+
+            return reader.bytes_read
+        except S3Error as e:
+            logger.error(
+                "Failed to upload stream to MinIO",
+                extra={
+                    "bucket_name": bucket_name,
+                    "object_name": object_name,
+                    "error": str(e),
+                    "error_code": e.code
+                }
+            )
+            raise
+        finally:
+            close_stream = getattr(chunks, "aclose", None)
+            if close_stream is not None:
+                await close_stream()
+
     async def get_file(self, bucket_name: str, object_name: str) -> HTTPResponse:
         """
         Download a file from MinIO.
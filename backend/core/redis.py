@@ -0,0 +1,47 @@
+"""
+Redis client configuration for application-level state.
+
+This module provides a lazily created asyncio Redis client shared by the
+TTS cache and other coordination helpers. Celery keeps its own connections.
+"""
+import logging
+
+from redis.asyncio import Redis
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RedisClient:
+
+    def __init__(self):
+        """Initialize Redis client holder with settings from config."""
+        self._client: Redis | None = None
+
+    def get_client(self) -> Redis:
+        """
+        Get or create Redis client instance.
+
+        Returns:
+            Redis: Configured asyncio Redis client
+        """
+        if self._client is None:
+            self._client = Redis.from_url(settings.redis_url)
+            logger.info(
+                "Redis client initialized",
+                extra={"host": settings.REDIS_HOST, "port": settings.REDIS_PORT, "db": settings.REDIS_DB}
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the client and its connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+redis_client = RedisClient()
+
+def get_redis_client() -> RedisClient:
+    return redis_client
@@ -2,6 +2,7 @@
 from .user import User
 from .file import File
 from .chapter import Chapter
+from .chapter_audio_segment import ChapterAudioSegment
 from .reading_history import ReadingHistory
 
 
@@ -9,6 +10,7 @@ MODEL_REGISTRY = {
     'user': User,
     'file': File,
     'chapter': Chapter,
+    'chapter_audio_segment': ChapterAudioSegment,
     'reading_history': ReadingHistory,
 }
 
@@ -17,6 +19,7 @@ __all__ = [
     "User",
     "File",
     "Chapter",
+    "ChapterAudioSegment",
     "ReadingHistory",
     "MODEL_REGISTRY",
 ]
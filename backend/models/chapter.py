@@ -1,12 +1,21 @@
 import datetime
+from enum import Enum
 
-from sqlalchemy import Column, Integer, ForeignKey, String, Text
+from sqlalchemy import BigInteger, Boolean, Column, Float, Integer, ForeignKey, String, Text, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import TIMESTAMP
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 
 from core.database import Base
 
 
+class ChapterTTSStatus(str, Enum):
+    PENDING = "pending"
+    QUEUED = "queued"
+    SYNTHESIZING = "synthesizing"
+    READY = "ready"
+    FAILED = "failed"
+
+
 class Chapter(Base):
     """Model that stores parsed chapter content for an uploaded file."""
 
@@ -16,11 +25,27 @@ class Chapter(Base):
     file_id = Column(Integer, ForeignKey("files.id", ondelete="CASCADE"), nullable=False, index=True)
     chapter_index = Column(Integer, nullable=False)
     title = Column(String(255), nullable=False)
-    content = Column(Text, nullable=False)
+    # A chapter's text can run to megabytes and only the TTS worker and the text endpoint
+    # need it; everything else leaves it unloaded, and reading it unloaded raises.
+    content = deferred(Column(Text, nullable=False), raiseload=True)
     start_page = Column(Integer, nullable=False)
     end_page = Column(Integer, nullable=False)
     audio_bucket_name = Column(String(100), nullable=True)
     audio_object_name = Column(String(500), nullable=True)
+    audio_format = Column(String(16), nullable=True)
+    segment_count = Column(Integer, nullable=True)
+    audio_duration_seconds = Column(Float, nullable=True)
+    audio_byte_size = Column(BigInteger, nullable=True)
+    audio_sample_rate = Column(Integer, nullable=True)
+    audio_channels = Column(Integer, nullable=True)
+    audio_checksum = Column(String(64), nullable=True)
+    tts_status = Column(
+        SQLEnum(ChapterTTSStatus),
+        default=ChapterTTSStatus.PENDING,
+        nullable=False,
+        index=True,
+    )
+    tts_on_demand = Column(Boolean, default=False, nullable=False)
     created_at = Column(
         TIMESTAMP(timezone=True),
         default=lambda: datetime.datetime.now(datetime.UTC),
@@ -28,6 +53,12 @@ class Chapter(Base):
     )
 
     file = relationship("File", back_populates="chapters")
+    audio_segments = relationship(
+        "ChapterAudioSegment",
+        back_populates="chapter",
+        cascade="all, delete-orphan",
+        order_by="ChapterAudioSegment.segment_index",
+    )
 
     def __repr__(self) -> str:
         return (
@@ -0,0 +1,38 @@
+import datetime
+
+from sqlalchemy import BigInteger, Column, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import TIMESTAMP
+from sqlalchemy.orm import relationship
+
+from core.database import Base
+
+
+class ChapterAudioSegment(Base):
+    """Model for one published piece of a chapter's audio, playable before the chapter finishes."""
+
+    __tablename__ = "chapter_audio_segments"
+
+    id = Column(Integer, primary_key=True, index=True)
+    chapter_id = Column(Integer, ForeignKey("chapters.id", ondelete="CASCADE"), nullable=False, index=True)
+    segment_index = Column(Integer, nullable=False)
+    bucket_name = Column(String(100), nullable=False)
+    object_name = Column(String(500), nullable=False)
+    audio_format = Column(String(16), nullable=False)
+    byte_size = Column(BigInteger, nullable=False)
+    created_at = Column(
+        TIMESTAMP(timezone=True),
+        default=lambda: datetime.datetime.now(datetime.UTC),
+        nullable=False,
+    )
+
+    chapter = relationship("Chapter", back_populates="audio_segments")
+
+    __table_args__ = (
+        UniqueConstraint("chapter_id", "segment_index", name="uq_chapter_audio_segments_chapter_index"),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<ChapterAudioSegment(id={self.id}, chapter_id={self.chapter_id}, "
+            f"index={self.segment_index})>"
+        )
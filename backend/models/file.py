@@ -1,7 +1,7 @@
 import datetime
 from enum import Enum
 
-from sqlalchemy import Column, Integer, ForeignKey, String, BigInteger, Enum as SQLEnum
+from sqlalchemy import Column, Integer, ForeignKey, String, BigInteger, Float, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import TIMESTAMP
 from sqlalchemy.orm import relationship
 
@@ -20,6 +20,11 @@ class FileVisibility(str, Enum):
     PUBLIC = "public"
 
 
+class FileTTSMode(str, Enum):
+    EAGER = "eager"
+    LAZY = "lazy"
+
+
 class File(Base):
     """
    Model for storing file metadata.
@@ -34,7 +39,12 @@ class File(Base):
        bucket_name: MinIO bucket where file is stored
        status: Current processing status
        visibility: Whether the file is public or private (default: private)
+       tts_mode: Eager or lazy chapter synthesis; None follows TTS_PROCESSING_MODE
+       extract_engine: PDF text extraction engine; None follows PDF_EXTRACT_ENGINE
        error_message: Error details if status is FAILED
+       chapter_count: Number of parsed chapters; None until parsing has finished
+       audio_duration_seconds: Total duration of the chapters synthesized so far
+       audio_byte_size: Total size of the chapter audio objects synthesized so far
        upload_date: Timestamp of file upload
        processed_date: Timestamp of processing completion
        user: Relationship to User model
@@ -62,9 +72,14 @@ class File(Base):
         nullable=False,
         index=True
     )
+    tts_mode = Column(SQLEnum(FileTTSMode), nullable=True)
+    extract_engine = Column(String(16), nullable=True)
     error_message = Column(String(500), nullable=True)
     parsed_title = Column(String(255), nullable=True)
     parsed_author = Column(String(255), nullable=True)
+    chapter_count = Column(Integer, nullable=True)
+    audio_duration_seconds = Column(Float, nullable=True)
+    audio_byte_size = Column(BigInteger, nullable=True)
 
     upload_date = Column(
         TIMESTAMP(timezone=True),
@@ -95,9 +110,14 @@ class File(Base):
             "bucket_name": self.bucket_name,
             "status": self.status,
             "visibility": self.visibility,
+            "tts_mode": self.tts_mode,
+            "extract_engine": self.extract_engine,
             "error_message": self.error_message,
             "parsed_title": self.parsed_title,
             "parsed_author": self.parsed_author,
+            "chapter_count": self.chapter_count,
+            "audio_duration_seconds": self.audio_duration_seconds,
+            "audio_byte_size": self.audio_byte_size,
             "upload_date": self.upload_date,
             "processed_date": self.processed_date
         }
@@ -13,6 +13,14 @@ class ChapterOut(BaseModel):
     end_page: int
     audio_bucket_name: Optional[str] = None
     audio_object_name: Optional[str] = None
+    audio_format: Optional[str] = None
+    segment_count: Optional[int] = None
+    audio_duration_seconds: Optional[float] = None
+    audio_byte_size: Optional[int] = None
+    audio_sample_rate: Optional[int] = None
+    audio_channels: Optional[int] = None
+    audio_checksum: Optional[str] = None
+    tts_status: str
     created_at: datetime
 
     model_config = {"from_attributes": True}
@@ -22,13 +30,85 @@ class ChapterAudioResponse(BaseModel):
     chapter_id: int = Field(..., description="Chapter identifier")
     url: str = Field(..., description="Presigned URL for streaming audio")
     expires_in_seconds: int = Field(..., description="URL validity in seconds")
+    format: str = Field(..., description="Audio codec the chapter was encoded with")
+    content_type: str = Field(..., description="MIME type served for the audio")
 
     model_config = {
         "json_schema_extra": {
             "example": {
                 "chapter_id": 3,
-                "url": "http://minio:9000/completed-files/1/3.wav?...",
+                "url": "http://minio:9000/completed-files/file_1/chapter_3_3.opus?...",
                 "expires_in_seconds": 3600,
+                "format": "opus",
+                "content_type": "audio/ogg",
+            }
+        }
+    }
+
+
+class ChapterAudioPendingResponse(BaseModel):
+    chapter_id: int = Field(..., description="Chapter identifier")
+    status: str = Field(..., description="Synthesis state: 'queued' or 'synthesizing'")
+    retry_after_seconds: int = Field(..., description="Suggested delay before asking again")
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {"chapter_id": 3, "status": "queued", "retry_after_seconds": 5}
+        }
+    }
+
+
+class ChapterAudioSegmentOut(BaseModel):
+    index: int = Field(..., description="Position of the segment within the chapter, from 0")
+    url: str = Field(..., description="Presigned URL for streaming the segment")
+    format: str = Field(..., description="Audio codec the segment was encoded with")
+    content_type: str = Field(..., description="MIME type served for the segment")
+    byte_size: Optional[int] = Field(None, description="Size of the segment object in bytes, when recorded")
+
+
+class ChapterSegmentsResponse(BaseModel):
+    chapter_id: int = Field(..., description="Chapter identifier")
+    segments: list[ChapterAudioSegmentOut] = Field(..., description="Segments available so far, in playback order")
+    segment_count: Optional[int] = Field(None, description="Total segments the chapter will have, once known")
+    status: str = Field(..., description="Synthesis state: pending, queued, synthesizing, ready or failed")
+    has_more: bool = Field(..., description="Whether further segments are still being synthesized")
+    expires_in_seconds: int = Field(..., description="URL validity in seconds")
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "chapter_id": 3,
+                "segments": [
+                    {
+                        "index": 0,
+                        "url": "http://minio:9000/completed-files/file_1/chapter_3_3/segment_0000.opus?...",
+                        "format": "opus",
+                        "content_type": "audio/ogg",
+                        "byte_size": 48213,
+                    }
+                ],
+                "segment_count": 12,
+                "status": "synthesizing",
+                "has_more": True,
+                "expires_in_seconds": 3600,
+            }
+        }
+    }
+
+
+class ChapterTextResponse(BaseModel):
+    chapter_id: int = Field(..., description="Chapter identifier")
+    chapter_index: int = Field(..., description="Position of the chapter within the file, from 1")
+    title: str = Field(..., description="Chapter title")
+    content: str = Field(..., description="Normalized chapter text, as sent to TTS")
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "chapter_id": 3,
+                "chapter_index": 1,
+                "title": "Chapter 1 Introduction",
+                "content": "It was a bright cold day in April...",
             }
         }
     }
@@ -42,7 +42,12 @@ class FileOut(BaseModel):
     bucket_name: str
     status: str
     visibility: str
+    tts_mode: Optional[str] = None
+    extract_engine: Optional[str] = None
     error_message: Optional[str] = None
+    chapter_count: Optional[int] = None
+    audio_duration_seconds: Optional[float] = None
+    audio_byte_size: Optional[int] = None
     upload_date: datetime
     processed_date: Optional[datetime] = None
     chapters: list[ChapterOut] = []
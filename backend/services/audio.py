@@ -0,0 +1,407 @@
+"""Audio helpers for assembling synthesized speech."""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import struct
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from typing import BinaryIO
+
+import numpy as np
+import soundfile as sf
+
+COPY_BLOCK_FRAMES = 64 * 1024
+COPY_BUFFER_BYTES = 256 * 1024
+# Leading bytes kept from a streamed WAV to find its fmt and data chunks.
+WAV_HEADER_PROBE_BYTES = 8 * 1024
+# Streaming writers that do not know the length up front leave these in the data chunk size.
+WAV_UNKNOWN_DATA_SIZES = (0, 0xFFFFFFFF)
+
+OPUS_SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)
+MP3_SAMPLE_RATES = (8000, 11025, 12000, 16000, 22050, 24000, 32000, 44100, 48000)
+
+
+class WavFormatError(ValueError):
+    """Raised when WAV segments cannot be combined."""
+
+
+class AudioEncodingError(ValueError):
+    """Raised when audio cannot be encoded with the requested output settings."""
+
+
+@dataclass(frozen=True, slots=True)
+class AudioFormat:
+    """Output container/codec and how the stored object is labelled."""
+
+    name: str
+    extension: str
+    content_type: str
+    container: str
+    subtype: str
+
+
+AUDIO_FORMATS: dict[str, AudioFormat] = {
+    "wav": AudioFormat("wav", "wav", "audio/wav", "WAV", "PCM_16"),
+    "opus": AudioFormat("opus", "opus", "audio/ogg", "OGG", "OPUS"),
+    "mp3": AudioFormat("mp3", "mp3", "audio/mpeg", "MP3", "MPEG_LAYER_III"),
+    "flac": AudioFormat("flac", "flac", "audio/flac", "FLAC", "PCM_16"),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class AudioInfo:
+    """Playback properties of stored audio, recorded so clients need not fetch it."""
+
+    duration_seconds: float
+    sample_rate: int
+    channels: int
+
+
+class AudioDigest:
+    """
+    Checksums audio as it streams past, keeping only its leading bytes.
+
+    Chunks are hashed in place; nothing beyond WAV_HEADER_PROBE_BYTES is retained.
+    """
+
+    def __init__(self) -> None:
+        self._hash = hashlib.sha256()
+        self._header = bytearray()
+        self.byte_size = 0
+
+    def update(self, chunk: bytes) -> None:
+        self._hash.update(chunk)
+        self.byte_size += len(chunk)
+        if len(self._header) < WAV_HEADER_PROBE_BYTES:
+            self._header += chunk[: WAV_HEADER_PROBE_BYTES - len(self._header)]
+
+    @property
+    def checksum(self) -> str:
+        """Hex SHA-256 of everything seen so far."""
+        return self._hash.hexdigest()
+
+    @property
+    def header(self) -> bytes:
+        return bytes(self._header)
+
+
+def get_audio_format(name: str | None) -> AudioFormat:
+    """
+    Look up an output format by name; chapters stored before encoding existed are WAV.
+
+    Raises:
+        AudioEncodingError: If the format is unknown.
+    """
+    try:
+        return AUDIO_FORMATS[(name or "wav").lower()]
+    except KeyError:
+        raise AudioEncodingError(f"Unsupported audio format: {name}") from None
+
+
+def _compression_level(audio_format: AudioFormat, bitrate_kbps: int, sample_rate: int, channels: int) -> float | None:
+    """
+    Map a target bitrate onto libsndfile's 0.0 (best) - 1.0 (smallest) compression level.
+
+    libsndfile spreads the level linearly over the encoder's bitrate range: 6-256 kbps
+    per channel for Opus, and the MPEG version's CBR table for MP3.
+    """
+    if audio_format.name == "opus":
+        low, high = 6 * channels, 256 * channels
+    elif audio_format.name == "mp3":
+        if sample_rate >= 32000:
+            low, high = 32, 320
+        elif sample_rate >= 16000:
+            low, high = 8, 160
+        else:
+            low, high = 8, 64
+    else:
+        return None
+    level = (high - bitrate_kbps) / (high - low)
+    # libsndfile rejects exactly 1.0 for MP3; the lowest bitrate is still reached below it.
+    return min(max(level, 0.0), 0.99)
+
+
+def _downmix(block: np.ndarray) -> np.ndarray:
+    return block.mean(axis=1, keepdims=True, dtype=np.float32)
+
+
+def _resample(blocks: Iterator[np.ndarray], source_rate: int, target_rate: int) -> Iterator[np.ndarray]:
+    """
+    Linearly resample a stream of (frames, channels) blocks.
+
+    The last input frame of each block is carried into the next one so
+    interpolation is continuous across block boundaries.
+    """
+    step = source_rate / target_rate
+    position = 0.0
+    offset = 0
+    carry: np.ndarray | None = None
+
+    for block in blocks:
+        buffer = block if carry is None else np.concatenate((carry, block))
+        if not len(buffer):
+            continue
+        last = offset + len(buffer) - 1
+        count = int((last - position) // step) + 1 if position <= last else 0
+        if count:
+            positions = position + step * np.arange(count) - offset
+            frame_indices = np.arange(len(buffer))
+            yield np.column_stack(
+                [np.interp(positions, frame_indices, buffer[:, channel]) for channel in range(buffer.shape[1])]
+            ).astype(np.float32)
+            position += step * count
+        carry = buffer[-1:]
+        offset = last
+
+
+@dataclass(frozen=True, slots=True)
+class _WavLayout:
+    """Where a WAV file's fmt and PCM data live, from its chunk headers."""
+
+    fmt_chunk: bytes
+    channels: int
+    sample_rate: int
+    block_align: int
+    data_offset: int
+    data_size: int
+
+    @property
+    def format_key(self) -> tuple[int, int, int, int]:
+        format_tag, channels, sample_rate, _, _, bits = struct.unpack_from("<HHIIHH", self.fmt_chunk)
+        return format_tag, channels, sample_rate, bits
+
+
+def _parse_wav_layout(header: bytes, total_size: int) -> _WavLayout:
+    if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+        raise WavFormatError("Not a RIFF/WAVE file")
+
+    fmt_chunk: bytes | None = None
+    offset = 12
+    while offset + 8 <= len(header):
+        chunk_id, chunk_size = struct.unpack_from("<4sI", header, offset)
+        body = offset + 8
+        if chunk_id == b"fmt ":
+            if chunk_size < 16 or body + chunk_size > len(header):
+                break
+            fmt_chunk = header[body : body + chunk_size]
+        elif chunk_id == b"data":
+            if fmt_chunk is None:
+                raise WavFormatError("WAV data chunk precedes its fmt chunk")
+            _, channels, sample_rate, _, block_align, _ = struct.unpack_from("<HHIIHH", fmt_chunk)
+            if not sample_rate or not block_align:
+                raise WavFormatError("WAV fmt chunk has no sample rate or frame size")
+            available = max(total_size - body, 0)
+            data_size = available if chunk_size in WAV_UNKNOWN_DATA_SIZES else min(chunk_size, available)
+            return _WavLayout(
+                fmt_chunk=fmt_chunk,
+                channels=channels,
+                sample_rate=sample_rate,
+                block_align=block_align,
+                data_offset=body,
+                # A streamed WAV cut off mid-frame keeps only its whole frames.
+                data_size=data_size - data_size % block_align,
+            )
+        offset = body + chunk_size + (chunk_size & 1)
+
+    raise WavFormatError("WAV header has no data chunk within the probed bytes")
+
+
+def _read_wav_layout(source: BinaryIO) -> _WavLayout:
+    total_size = source.seek(0, io.SEEK_END)
+    source.seek(0)
+    return _parse_wav_layout(source.read(WAV_HEADER_PROBE_BYTES), total_size)
+
+
+def _plan_concatenation(sources: Sequence[BinaryIO]) -> list[_WavLayout]:
+    if not sources:
+        raise WavFormatError("No audio segments to concatenate")
+
+    layouts = [_read_wav_layout(source) for source in sources]
+    expected = layouts[0].format_key
+    for index, layout in enumerate(layouts[1:], start=1):
+        if layout.format_key != expected:
+            raise WavFormatError(f"Segment {index} format {layout.format_key} does not match {expected}")
+
+    # RIFF sizes are 32-bit: the RIFF size counts "WAVE", the fmt and data chunk headers and bodies.
+    riff_size = 4 + 8 + len(layouts[0].fmt_chunk) + 8 + sum(layout.data_size for layout in layouts)
+    if riff_size > 0xFFFFFFFF:
+        raise WavFormatError("Combined audio is too long for a single WAV file")
+    return layouts
+
+
+def _wav_header(fmt_chunk: bytes, data_size: int) -> bytes:
+    riff_size = 4 + 8 + len(fmt_chunk) + 8 + data_size + (data_size & 1)
+    return (
+        struct.pack("<4sI4s", b"RIFF", riff_size, b"WAVE")
+        + struct.pack("<4sI", b"fmt ", len(fmt_chunk))
+        + fmt_chunk
+        + struct.pack("<4sI", b"data", data_size)
+    )
+
+
+class AudioService:
+    """Operations on WAV audio produced by the TTS backends."""
+
+    @staticmethod
+    def wav_info(header: bytes, total_size: int) -> AudioInfo:
+        """
+        Read duration, rate and channels from the start of a WAV file.
+
+        Only the RIFF chunk headers are parsed. When the data chunk size is
+        missing (streamed WAV) or overruns the file, the audio is taken to run
+        to the end of the file.
+
+        Args:
+            header: Leading bytes of the file, up to and including the data chunk header.
+            total_size: Size of the whole file in bytes.
+
+        Raises:
+            WavFormatError: If the bytes are not a PCM WAV header.
+        """
+        layout = _parse_wav_layout(header, total_size)
+        return AudioInfo(
+            duration_seconds=layout.data_size // layout.block_align / layout.sample_rate,
+            sample_rate=layout.sample_rate,
+            channels=layout.channels,
+        )
+
+    @staticmethod
+    def iter_concatenated_wav(sources: Sequence[BinaryIO], chunk_size: int = COPY_BUFFER_BYTES) -> Iterator[bytes]:
+        """
+        Yield WAV segments joined in order, as one WAV file, without decoding them.
+
+        Every segment's header is parsed and checked up front, so a single header
+        carrying the combined data size is yielded first and nothing is ever
+        rewritten. Each segment's PCM payload is then read through in chunks of
+        at most ``chunk_size`` bytes; no chunk is retained once yielded, so the
+        output can feed a multipart upload directly.
+
+        Args:
+            sources: Seekable WAV files sharing format, channel count, sample width and rate.
+            chunk_size: Largest chunk yielded.
+
+        Raises:
+            WavFormatError: If there are no segments, their formats differ or the
+                combined audio does not fit in a WAV file.
+        """
+        layouts = _plan_concatenation(sources)
+        yield _wav_header(layouts[0].fmt_chunk, sum(layout.data_size for layout in layouts))
+
+        for source, layout in zip(sources, layouts):
+            source.seek(layout.data_offset)
+            remaining = layout.data_size
+            while remaining:
+                chunk = source.read(min(chunk_size, remaining))
+                if not chunk:
+                    raise WavFormatError("WAV segment ended before its data chunk did")
+                remaining -= len(chunk)
+                yield chunk
+        if sum(layout.data_size for layout in layouts) & 1:
+            yield b"\x00"
+
+    @staticmethod
+    def concatenate_wav(sources: Sequence[BinaryIO], destination: BinaryIO) -> None:
+        """
+        Join WAV segments in order into a single WAV file.
+
+        The header is written once with the final size, then PCM payloads are
+        copied through one reused buffer, so memory use does not grow with
+        segment length and the destination never needs to be seeked.
+
+        Args:
+            sources: Seekable WAV files sharing format, channel count, sample width and rate.
+            destination: Binary file the combined WAV is written to.
+
+        Raises:
+            WavFormatError: If there are no segments or their formats differ.
+        """
+        layouts = _plan_concatenation(sources)
+        total_size = sum(layout.data_size for layout in layouts)
+        destination.write(_wav_header(layouts[0].fmt_chunk, total_size))
+
+        buffer = memoryview(bytearray(COPY_BUFFER_BYTES))
+        for source, layout in zip(sources, layouts):
+            source.seek(layout.data_offset)
+            remaining = layout.data_size
+            while remaining:
+                read = source.readinto(buffer[: min(len(buffer), remaining)])
+                if not read:
+                    raise WavFormatError("WAV segment ended before its data chunk did")
+                destination.write(buffer[:read])
+                remaining -= read
+        if total_size & 1:
+            destination.write(b"\x00")
+
+    @staticmethod
+    def encode(
+        source: BinaryIO,
+        destination: BinaryIO,
+        audio_format: AudioFormat,
+        *,
+        bitrate_kbps: int,
+        sample_rate: int | None = None,
+        mono: bool = True,
+    ) -> AudioInfo:
+        """
+        Encode a WAV file into the requested output format.
+
+        Samples are processed in blocks: channels are averaged down to mono and
+        the signal is linearly resampled with vectorized numpy operations before
+        being handed to the encoder, so memory use does not grow with duration.
+
+        Args:
+            source: Seekable WAV file produced by synthesis.
+            destination: Seekable binary file the encoded audio is written to.
+            audio_format: Target container/codec.
+            bitrate_kbps: Target bitrate for lossy codecs; ignored for WAV/FLAC.
+            sample_rate: Output sample rate, or None to keep the source rate.
+            mono: Downmix to a single channel.
+
+        Returns:
+            The duration, sample rate and channel count of the encoded audio.
+
+        Raises:
+            AudioEncodingError: If the sample rate is not supported by the codec.
+        """
+        with sf.SoundFile(source) as reader:
+            source_rate = reader.samplerate
+            target_rate = sample_rate or source_rate
+            channels = 1 if mono else reader.channels
+
+            if audio_format.name == "opus" and target_rate not in OPUS_SAMPLE_RATES:
+                raise AudioEncodingError(f"Opus does not support a {target_rate} Hz sample rate")
+            if audio_format.name == "mp3" and target_rate not in MP3_SAMPLE_RATES:
+                raise AudioEncodingError(f"MP3 does not support a {target_rate} Hz sample rate")
+
+            blocks: Iterator[np.ndarray] = reader.blocks(
+                blocksize=COPY_BLOCK_FRAMES, dtype="float32", always_2d=True
+            )
+            if mono:
+                blocks = (_downmix(block) for block in blocks)
+            if target_rate != source_rate:
+                blocks = _resample(blocks, source_rate, target_rate)
+
+            writer_options = {}
+            level = _compression_level(audio_format, bitrate_kbps, target_rate, channels)
+            if level is not None:
+                writer_options["compression_level"] = level
+            if audio_format.name == "mp3":
+                writer_options["bitrate_mode"] = "CONSTANT"
+
+            with sf.SoundFile(
+                destination,
+                "w",
+                samplerate=target_rate,
+                channels=channels,
+                format=audio_format.container,
+                subtype=audio_format.subtype,
+                **writer_options,
+            ) as writer:
+                frames = 0
+                for block in blocks:
+                    writer.write(np.clip(block, -1.0, 1.0))
+                    frames += len(block)
+
+        return AudioInfo(duration_seconds=frames / target_rate, sample_rate=target_rate, channels=channels)
@@ -19,7 +19,9 @@ from sqlalchemy.orm import selectinload
 from starlette import status
 
 from core.minio import get_minio_client
-from models.file import File, FileStatus, FileVisibility
+from models.chapter import Chapter
+from models.file import File, FileStatus, FileTTSMode, FileVisibility
+from schemas.chapter import ChapterOut
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +29,10 @@ MAX_FILE_SIZE = 50 * 1024 * 1024 #50mb
 ALLOWED_MIME_TYPES = {"application/pdf"}
 ALLOWED_EXTENSIONS = {".pdf"}
 RAW_PDF_BUCKET = "raw-pdf-uploads"
+# File responses list chapters as ChapterOut: load just those columns, and raise on any other.
+CHAPTER_LISTING = selectinload(File.chapters).load_only(
+    *(getattr(Chapter, name) for name in ChapterOut.model_fields), raiseload=True
+)
 
 class FileValidationError(Exception):
     """Custom exception for file validation errors."""
@@ -258,6 +264,8 @@ class FileService:
             file_size: int,
             mime_type: str,
             visibility: FileVisibility = FileVisibility.PRIVATE,
+            tts_mode: FileTTSMode | None = None,
+            extract_engine: str | None = None,
     ) -> File:
         """
         Create a database record for the uploaded file.
@@ -269,6 +277,9 @@ class FileService:
             stored_filename: Unique name used in storage
             file_size: Size of the file in bytes
             mime_type: MIME type of the file
+            visibility: Whether the file is private or public
+            tts_mode: Eager or lazy chapter synthesis; None follows the server setting
+            extract_engine: PDF text extraction engine; None follows the server setting
 
         Returns:
             File: Created file record
@@ -300,6 +311,8 @@ class FileService:
                 bucket_name=RAW_PDF_BUCKET,
                 status=FileStatus.PENDING,
                 visibility=visibility,
+                tts_mode=tts_mode,
+                extract_engine=extract_engine,
             )
 
             db.add(file_record)
@@ -434,7 +447,7 @@ class FileService:
         try:
             result = await db.execute(
                 select(File)
-                .options(selectinload(File.chapters))
+                .options(CHAPTER_LISTING)
                 .where(and_(File.user_id == user_id))
                 .order_by(File.upload_date.desc())
                 .offset(skip)
@@ -473,7 +486,7 @@ class FileService:
             user_id: int,
     ) -> Optional[File]:
         """
-        Get a specific file by ID for the owning user, with chapters eager-loaded.
+        Get a specific file by ID for the owning user, with chapters eager-loaded (without their text).
 
         Returns the file if:
           - The file exists AND belongs to user_id, OR
@@ -490,7 +503,7 @@ class FileService:
         try:
             result = await db.execute(
                 select(File)
-                .options(selectinload(File.chapters))
+                .options(CHAPTER_LISTING)
                 .where(
                     File.id == file_id,
                     (File.user_id == user_id) | (File.visibility == FileVisibility.PUBLIC),
@@ -533,7 +546,7 @@ class FileService:
         try:
             result = await db.execute(
                 select(File)
-                .options(selectinload(File.chapters))
+                .options(CHAPTER_LISTING)
                 .where(File.id == file_id, File.user_id == user_id)
                 .limit(1)
             )
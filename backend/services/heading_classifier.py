@@ -0,0 +1,61 @@
+"""Finds chapter headings from font sizes and weights rather than text patterns."""
+
+from __future__ import annotations
+
+import re
+
+import numpy as np
+
+from services.pdf_engines import PageGlyphs
+
+BOLD_FONT = re.compile(r"bold|black|heavy|demi|semibold", re.IGNORECASE)
+# Sizes are compared in half points, so 10.98pt and 11pt body text count as one size.
+SIZE_STEP = 0.5
+MAX_HEADING_CHARS = 120
+# A line is bold if nearly all of its characters are; a bold run inside a sentence is not.
+BOLD_LINE_FRACTION = 0.9
+
+
+class FontHeadingClassifier:
+    """Flags heading lines by comparing each line's type with the page's body text."""
+
+    @staticmethod
+    def classify(page: PageGlyphs, size_ratio: float) -> list[bool] | None:
+        """
+        Flag the lines of ``page`` that are set larger or bolder than its body text.
+
+        The body size is the size most characters on the page are set in. A
+        line is a heading if its mean character size is at least
+        ``size_ratio`` times that, or if it is entirely bold, at least body
+        size, and the body text is not itself bold. Lines longer than
+        MAX_HEADING_CHARS or without letters are never headings.
+
+        Returns:
+            One flag per line, or None if the page has no font data, in
+            which case the caller should fall back to text heuristics.
+        """
+        if page.char_lines is None or page.char_sizes is None or page.char_fonts is None:
+            return None
+
+        line_count = len(page.lines)
+        sizes = np.round(page.char_sizes / SIZE_STEP) * SIZE_STEP
+        fonts, font_ids = np.unique(page.char_fonts, return_inverse=True)
+        bold = np.fromiter((bool(BOLD_FONT.search(font)) for font in fonts), dtype=bool, count=len(fonts))[font_ids]
+
+        values, counts = np.unique(sizes, return_counts=True)
+        body_size = values[np.argmax(counts)]
+        body_bold = bold[sizes == body_size].mean() >= 0.5
+
+        chars_per_line = np.maximum(np.bincount(page.char_lines, minlength=line_count), 1)
+        line_sizes = np.bincount(page.char_lines, weights=sizes, minlength=line_count) / chars_per_line
+        line_bold = np.bincount(page.char_lines, weights=bold, minlength=line_count) / chars_per_line >= BOLD_LINE_FRACTION
+
+        larger = line_sizes >= body_size * size_ratio
+        bolder = line_bold & ~body_bold & (line_sizes >= body_size - SIZE_STEP / 2)
+        candidates = np.flatnonzero(larger | bolder)
+
+        flags = [False] * line_count
+        for index in candidates:
+            line = page.lines[index]
+            flags[index] = len(line) <= MAX_HEADING_CHARS and any(char.isalpha() for char in line)
+        return flags
@@ -0,0 +1,333 @@
+"""Interchangeable engines for extracting page text from PDFs."""
+
+from __future__ import annotations
+
+import io
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import ExitStack
+from dataclasses import dataclass
+from typing import Self
+
+import numpy as np
+import pdfminer
+import pdfplumber
+import pypdfium2
+from pdfminer.converter import PDFPageAggregator, TextConverter
+from pdfminer.layout import LAParams, LTChar, LTTextContainer, LTTextLine
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfexceptions import PDFException
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import PDFObjRef, resolve1
+from pdfminer.psparser import PSLiteral
+from pdfminer.utils import decode_text
+
+
+class PdfEngineError(ValueError):
+    """Raised when an unknown extraction engine is requested."""
+
+
+@dataclass(slots=True)
+class OutlineEntry:
+    """An outline (bookmark) entry: ``level`` and ``page_index`` count from zero."""
+
+    title: str
+    page_index: int
+    level: int
+
+
+@dataclass(slots=True)
+class PageGlyphs:
+    """
+    A page's non-empty text lines, stripped, with the size and font name of
+    each of their characters as parallel arrays: ``char_lines`` holds the
+    index of the line each character belongs to.
+
+    The character arrays are None when the engine has no font information or
+    the page has more characters than the caller's budget.
+    """
+
+    lines: list[str]
+    char_lines: np.ndarray | None = None
+    char_sizes: np.ndarray | None = None
+    char_fonts: np.ndarray | None = None
+
+
+def _page_glyphs(lines: list[tuple[str, list[tuple[float, str]]]], max_chars: int) -> PageGlyphs:
+    """Build ``PageGlyphs`` from (text, [(size, font name), ...]) pairs, dropping empty lines."""
+    lines = [(text.strip(), chars) for text, chars in lines if text.strip()]
+    texts = [text for text, _ in lines]
+    counts = [len(chars) for _, chars in lines]
+    total = sum(counts)
+    if not total or total > max_chars:
+        return PageGlyphs(lines=texts)
+    return PageGlyphs(
+        lines=texts,
+        char_lines=np.repeat(np.arange(len(lines)), counts),
+        char_sizes=np.fromiter((size for _, chars in lines for size, _ in chars), dtype=np.float32, count=total),
+        char_fonts=np.array([font for _, chars in lines for _, font in chars], dtype=object),
+    )
+
+
+class ExtractedPdf(ABC):
+    """An open PDF whose metadata and page text can be read."""
+
+    metadata: dict | None
+    page_count: int
+
+    @abstractmethod
+    def iter_page_texts(self, start: int = 0, stop: int | None = None) -> Iterator[str]:
+        """Yield the text of pages [start, stop), one string per page, lines separated by newlines."""
+
+    def iter_page_glyphs(self, start: int = 0, stop: int | None = None, max_chars: int = 0) -> Iterator[PageGlyphs]:
+        """
+        Yield the lines of pages [start, stop) with their characters' sizes and fonts.
+
+        Pages with more than ``max_chars`` characters come without font data,
+        as do all pages from engines that cannot provide it (the default).
+        """
+        for text in self.iter_page_texts(start, stop):
+            yield PageGlyphs(lines=[line.strip() for line in text.splitlines() if line.strip()])
+
+    @abstractmethod
+    def outline(self) -> list[OutlineEntry]:
+        """
+        The outline entries that point at a page, in outline order.
+
+        Empty if the PDF has no outline; entries that cannot be resolved to a
+        page, or an outline that cannot be read at all, are left out.
+        """
+
+    @abstractmethod
+    def close(self) -> None:
+        """Release the document."""
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class PdfTextEngine(ABC):
+    """
+    Opens PDFs for text extraction; ``source`` is the file's bytes or a path to it.
+
+    ``version`` changes whenever the library doing the extraction does.
+    """
+
+    name: str
+    version: str
+
+    @abstractmethod
+    def open(self, source: bytes | str) -> ExtractedPdf:
+        """Open ``source``. Errors from malformed PDFs propagate unchanged."""
+
+
+def _metadata_text(value: object) -> str | None:
+    value = resolve1(value)
+    if isinstance(value, bytes):
+        return decode_text(value)
+    if isinstance(value, PSLiteral):
+        return str(value.name)
+    return value if isinstance(value, str) else None
+
+
+def _pdfminer_destination_page(document: PDFDocument, dest: object, action: object) -> object:
+    """The page reference an outline entry's destination or GoTo action points at."""
+    if dest is None:
+        action = resolve1(action)
+        dest = action.get("D") if isinstance(action, dict) else None
+    dest = resolve1(dest)
+    if isinstance(dest, (bytes, str, PSLiteral)):
+        # A named destination.
+        dest = resolve1(document.get_dest(dest.name if isinstance(dest, PSLiteral) else dest))
+    if isinstance(dest, dict):
+        dest = resolve1(dest.get("D"))
+    return dest[0] if isinstance(dest, list) and dest else None
+
+
+def _pdfminer_outline(document: PDFDocument, page_ids: Callable[[], Iterable[int]]) -> list[OutlineEntry]:
+    """Resolve ``document``'s outline; ``page_ids`` lists page object ids in page order and is only called if needed."""
+    entries = []
+    try:
+        outlines = list(document.get_outlines())
+        page_indexes = {page_id: index for index, page_id in enumerate(page_ids())} if outlines else {}
+        for level, title, dest, action, _ in outlines:
+            page = _pdfminer_destination_page(document, dest, action)
+            index = page_indexes.get(page.objid) if isinstance(page, PDFObjRef) else None
+            if index is not None and title and title.strip():
+                # pdfminer counts the outline root as level 0.
+                entries.append(OutlineEntry(title=title.strip(), page_index=index, level=level - 1))
+    except (PDFException, KeyError, TypeError, ValueError):
+        return []
+    return entries
+
+
+class _PdfplumberPdf(ExtractedPdf):
+    # pdfplumber keeps every page's layout objects until the page is closed, so
+    # each page is closed once read; memory then stays flat however long the PDF.
+
+    def __init__(self, source: bytes | str):
+        self._stack = ExitStack()
+        self._pdf = self._stack.enter_context(
+            pdfplumber.open(io.BytesIO(source) if isinstance(source, bytes) else source)
+        )
+        self.metadata = self._pdf.metadata
+        self.page_count = len(self._pdf.pages)
+
+    def iter_page_texts(self, start: int = 0, stop: int | None = None) -> Iterator[str]:
+        for page in self._pdf.pages[start:stop]:
+            try:
+                text = page.extract_text() or ""
+            finally:
+                page.close()
+            yield text
+
+    def iter_page_glyphs(self, start: int = 0, stop: int | None = None, max_chars: int = 0) -> Iterator[PageGlyphs]:
+        for page in self._pdf.pages[start:stop]:
+            try:
+                lines = page.extract_text_lines(return_chars=True)
+            finally:
+                page.close()
+            yield _page_glyphs(
+                [(line["text"], [(char["size"], char["fontname"]) for char in line["chars"]]) for line in lines],
+                max_chars,
+            )
+
+    def outline(self) -> list[OutlineEntry]:
+        return _pdfminer_outline(self._pdf.doc, lambda: (page.page_obj.pageid for page in self._pdf.pages))
+
+    def close(self) -> None:
+        self._stack.close()
+
+
+class PdfplumberEngine(PdfTextEngine):
+    """pdfplumber's layout-aware extraction: the most faithful line breaks and spacing, and the slowest."""
+
+    name = "pdfplumber"
+    version = f"pdfplumber-{pdfplumber.__version__}"
+
+    def open(self, source: bytes | str) -> ExtractedPdf:
+        return _PdfplumberPdf(source)
+
+
+class _PdfminerPdf(ExtractedPdf):
+    # Characters are still grouped into lines, but text boxes are not reordered
+    # into reading flow, which is where most of pdfminer's layout time goes.
+    LAPARAMS = LAParams(boxes_flow=None)
+
+    def __init__(self, source: bytes | str):
+        with ExitStack() as stack:
+            stream = io.BytesIO(source) if isinstance(source, bytes) else stack.enter_context(open(source, "rb"))
+            self._document = document = PDFDocument(PDFParser(stream))
+            self.metadata = {
+                key: text
+                for info in document.info
+                for key, value in info.items()
+                if (text := _metadata_text(value)) is not None
+            }
+            self._pages = list(PDFPage.create_pages(document))
+            self.page_count = len(self._pages)
+            self._resources = PDFResourceManager(caching=True)
+            # pdfminer reads pages from the file lazily; it stays open until close(), or now if parsing failed.
+            self._stack = stack.pop_all()
+
+    def iter_page_texts(self, start: int = 0, stop: int | None = None) -> Iterator[str]:
+        for page in self._pages[start:stop]:
+            output = io.StringIO()
+            with TextConverter(self._resources, output, laparams=self.LAPARAMS) as device:
+                PDFPageInterpreter(self._resources, device).process_page(page)
+            yield output.getvalue()
+
+    def iter_page_glyphs(self, start: int = 0, stop: int | None = None, max_chars: int = 0) -> Iterator[PageGlyphs]:
+        for page in self._pages[start:stop]:
+            device = PDFPageAggregator(self._resources, laparams=self.LAPARAMS)
+            PDFPageInterpreter(self._resources, device).process_page(page)
+            yield _page_glyphs(
+                [
+                    (line.get_text(), [(char.size, char.fontname) for char in line if isinstance(char, LTChar)])
+                    for box in device.get_result()
+                    if isinstance(box, LTTextContainer)
+                    for line in box
+                    if isinstance(line, LTTextLine)
+                ],
+                max_chars,
+            )
+
+    def outline(self) -> list[OutlineEntry]:
+        return _pdfminer_outline(self._document, lambda: (page.pageid for page in self._pages))
+
+    def close(self) -> None:
+        self._pages = []
+        self._stack.close()
+
+
+class PdfminerEngine(PdfTextEngine):
+    """pdfminer without reading-order analysis: same parser as pdfplumber, a few times faster."""
+
+    name = "pdfminer"
+    version = f"pdfminer-{pdfminer.__version__}"
+
+    def open(self, source: bytes | str) -> ExtractedPdf:
+        return _PdfminerPdf(source)
+
+
+class _PdfiumPdf(ExtractedPdf):
+    def __init__(self, source: bytes | str):
+        self._document = pypdfium2.PdfDocument(source)
+        self.metadata = self._document.get_metadata_dict(skip_empty=True)
+        self.page_count = len(self._document)
+
+    def iter_page_texts(self, start: int = 0, stop: int | None = None) -> Iterator[str]:
+        for index in range(start, self.page_count if stop is None else min(stop, self.page_count)):
+            page = self._document[index]
+            text_page = page.get_textpage()
+            try:
+                yield text_page.get_text_range().replace("\r\n", "\n")
+            finally:
+                text_page.close()
+                page.close()
+
+    def outline(self) -> list[OutlineEntry]:
+        entries = []
+        for bookmark in self._document.get_toc():
+            dest = bookmark.get_dest()
+            index = dest.get_index() if dest is not None else None
+            title = bookmark.get_title().strip()
+            if index is not None and 0 <= index < self.page_count and title:
+                entries.append(OutlineEntry(title=title, page_index=index, level=bookmark.level))
+        return entries
+
+    def close(self) -> None:
+        self._document.close()
+
+
+class PdfiumEngine(PdfTextEngine):
+    """PDFium's native text extraction: an order of magnitude faster, with plainer line handling."""
+
+    name = "pdfium"
+    version = f"pypdfium2-{pypdfium2.version.PYPDFIUM_INFO}"
+
+    def open(self, source: bytes | str) -> ExtractedPdf:
+        return _PdfiumPdf(source)
+
+
+PDF_ENGINES: dict[str, PdfTextEngine] = {
+    engine.name: engine for engine in (PdfplumberEngine(), PdfminerEngine(), PdfiumEngine())
+}
+
+
+def get_pdf_engine(name: str) -> PdfTextEngine:
+    """
+    Look up an extraction engine by name.
+
+    Raises:
+        PdfEngineError: If the engine is unknown.
+    """
+    try:
+        return PDF_ENGINES[name.lower()]
+    except KeyError:
+        raise PdfEngineError(f"Unsupported PDF extraction engine: {name}") from None
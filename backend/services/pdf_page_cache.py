@@ -0,0 +1,136 @@
+"""Cache of extracted PDF page text in Redis, so retried and re-run parses skip finished pages."""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from collections.abc import Awaitable
+
+import numpy as np
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from core.config import settings
+from core.redis import get_redis_client
+from services.pdf_engines import PageGlyphs, PdfTextEngine
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "pdf:pages:"
+# Bump when a change to text extraction (not to chapter splitting) makes cached pages stale.
+EXTRACTION_VERSION = 1
+# Marks a cached page holding glyphs (for font-based heading detection) rather than plain text.
+GLYPHS_PREFIX = "\x1eglyphs:"
+
+
+def encode_page(content: str | PageGlyphs) -> str:
+    """
+    A page's text, or its glyphs as JSON, for the cache.
+
+    Glyphs are stored per line as runs of characters sharing a size and font,
+    which is compact since a line rarely changes type more than once or twice.
+    """
+    if isinstance(content, str):
+        return content
+    runs = None
+    fonts: list[str] = []
+    if content.char_lines is not None:
+        font_ids: dict[str, int] = {}
+        runs = [[] for _ in content.lines]
+        for line, size, font in zip(
+            content.char_lines.tolist(), content.char_sizes.tolist(), content.char_fonts.tolist(), strict=True
+        ):
+            font_id = font_ids.setdefault(font, len(font_ids))
+            line_runs = runs[line]
+            if line_runs and line_runs[-1][1] == size and line_runs[-1][2] == font_id:
+                line_runs[-1][0] += 1
+            else:
+                line_runs.append([1, size, font_id])
+        fonts = list(font_ids)
+    return GLYPHS_PREFIX + json.dumps({"lines": content.lines, "runs": runs, "fonts": fonts})
+
+
+def is_cached_page(value: str, glyphs: bool) -> bool:
+    """Whether a cached page holds the kind of content wanted: glyphs, or plain text."""
+    return value.startswith(GLYPHS_PREFIX) == glyphs
+
+
+def decode_page(value: str) -> str | PageGlyphs:
+    """Undo ``encode_page``."""
+    if not value.startswith(GLYPHS_PREFIX):
+        return value
+    data = json.loads(value[len(GLYPHS_PREFIX):])
+    if data["runs"] is None:
+        return PageGlyphs(lines=data["lines"])
+    runs = [(line, *run) for line, line_runs in enumerate(data["runs"]) for run in line_runs]
+    lines, counts, sizes, font_ids = zip(*runs, strict=True) if runs else ((), (), (), ())
+    return PageGlyphs(
+        lines=data["lines"],
+        char_lines=np.repeat(np.array(lines, dtype=np.int64), counts),
+        char_sizes=np.repeat(np.array(sizes, dtype=np.float32), counts),
+        char_fonts=np.repeat(np.array([data["fonts"][font_id] for font_id in font_ids], dtype=object), counts),
+    )
+
+
+class PdfPageCache:
+    """
+    Extracted page text (or glyphs, see ``encode_page``), one Redis hash per document and extractor.
+
+    A document is identified by the SHA-256 of its bytes, and an extractor by
+    the engine with its library version plus EXTRACTION_VERSION, so a new PDF
+    or a new extractor never sees stale text. Fields are zero-based page
+    indexes. Every write refreshes the hash's expiry. Cache failures never fail
+    a parse; they are logged and the pages are extracted again.
+    """
+
+    def __init__(self, redis: Redis, ttl_seconds: int):
+        self._redis = redis
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def cache_key(source: bytes | str, engine: PdfTextEngine, variant: str = "") -> str:
+        """
+        Key for a PDF given as bytes or as a path, which is hashed without reading it into memory whole.
+
+        ``variant`` separates extractions of the same document that produce
+        different page content, such as glyphs under a given character budget.
+        """
+        if isinstance(source, bytes):
+            digest = hashlib.sha256(source).hexdigest()
+        else:
+            with open(source, "rb") as pdf_file:
+                digest = hashlib.file_digest(pdf_file, "sha256").hexdigest()
+        key = f"{KEY_PREFIX}{digest}:{engine.name}:{engine.version}:{EXTRACTION_VERSION}"
+        return f"{key}:{variant}" if variant else key
+
+    async def load(self, key: str) -> dict[int, str]:
+        """The cached pages of a document, by page index; empty if none are cached."""
+        pages = await self._safe(self._redis.hgetall(key))
+        return {int(index): text.decode("utf-8") for index, text in (pages or {}).items()}
+
+    async def store(self, key: str, pages: dict[int, str]) -> None:
+        """Add ``pages`` (page index to text) to a document's cached pages."""
+        if not pages:
+            return
+        await self._safe(self._redis.hset(key, mapping={index: text.encode("utf-8") for index, text in pages.items()}))
+        await self._safe(self._redis.expire(key, self.ttl_seconds))
+
+    async def _safe(self, operation: Awaitable):
+        try:
+            return await operation
+        except RedisError as exc:
+            logger.warning("PDF page cache operation failed; continuing without cache", extra={"error": str(exc)})
+            return None
+
+
+_pdf_page_cache: PdfPageCache | None = None
+
+
+def get_pdf_page_cache() -> PdfPageCache:
+    global _pdf_page_cache
+    if _pdf_page_cache is None:
+        _pdf_page_cache = PdfPageCache(
+            redis=get_redis_client().get_client(),
+            ttl_seconds=settings.PDF_PAGE_CACHE_TTL_SECONDS,
+        )
+    return _pdf_page_cache
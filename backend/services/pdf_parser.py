@@ -2,20 +2,61 @@
 
 from __future__ import annotations
 
-import io
+import asyncio
 import logging
+import multiprocessing
+import os
 import re
+import tempfile
+import threading
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Generator, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import aclosing, contextmanager
 from dataclasses import dataclass
 
-import pdfplumber
-from sqlalchemy import delete
+from sqlalchemy import delete, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.config import settings
 from models.chapter import Chapter
 from models.file import File
+from services.heading_classifier import FontHeadingClassifier
+from services.pdf_engines import ExtractedPdf, OutlineEntry, PageGlyphs, get_pdf_engine
+from services.pdf_page_cache import (
+    PdfPageCache,
+    decode_page,
+    encode_page,
+    get_pdf_page_cache,
+    is_cached_page,
+)
+from services.text_normalizer import TextNormalizer
 
 logger = logging.getLogger(__name__)
 
+# Page ranges handed out per extraction process, so one slow range does not hold up the rest.
+RANGES_PER_WORKER = 2
+# Outline levels searched for chapter entries, e.g. below a single "book" or "part" bookmark.
+MAX_OUTLINE_DEPTH = 3
+
+_extraction_pool: ProcessPoolExecutor | None = None
+_extraction_pool_workers = 0
+
+
+class PdfParseDeadline(Exception):
+    """
+    Raised when a parse reaches its deadline with pages still to extract.
+
+    Pages extracted so far are in the page cache and stored chapters stay;
+    ``chapters_stored`` says how many there are, for the run that resumes.
+    """
+
+    def __init__(self, page_index: int):
+        super().__init__(f"PDF parse deadline reached before page {page_index + 1}")
+        self.page_index = page_index
+        self.chapters_stored = 0
+
 
 @dataclass(slots=True)
 class ChapterPayload:
@@ -24,6 +65,15 @@ class ChapterPayload:
     content: str
     start_page: int
     end_page: int
+    chars_removed: int = 0
+
+
+@dataclass(slots=True)
+class StoredChapter:
+    """A chapter row just inserted, as returned by the INSERT."""
+
+    id: int
+    chapter_index: int
 
 
 @dataclass(slots=True)
@@ -33,6 +83,152 @@ class ParsedDocument:
     chapters: list[ChapterPayload]
 
 
+def get_pdf_extraction_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Get the process pool used for page-parallel extraction, sized to ``workers``.
+
+    Processes are spawned rather than forked: the calling worker process runs
+    an event loop and client threads whose state must not be copied.
+    """
+    global _extraction_pool, _extraction_pool_workers
+    if _extraction_pool is None or _extraction_pool_workers != workers:
+        shutdown_pdf_extraction_pool()
+        _extraction_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        _extraction_pool_workers = workers
+    return _extraction_pool
+
+
+def shutdown_pdf_extraction_pool() -> None:
+    """Stop the extraction processes, if any were started."""
+    global _extraction_pool, _extraction_pool_workers
+    if _extraction_pool is not None:
+        _extraction_pool.shutdown(cancel_futures=True)
+    _extraction_pool = None
+    _extraction_pool_workers = 0
+
+
+def _page_ranges(page_count: int, range_count: int) -> list[tuple[int, int]]:
+    """Split ``page_count`` pages into ``range_count`` contiguous, near-equal [start, stop) ranges."""
+    size, extra = divmod(page_count, range_count)
+    ranges = []
+    start = 0
+    for index in range(range_count):
+        stop = start + size + (index < extra)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def _page_runs(indexes: list[int]) -> list[tuple[int, int]]:
+    """Group ascending page indexes into contiguous [start, stop) runs."""
+    runs: list[tuple[int, int]] = []
+    for index in indexes:
+        if runs and runs[-1][1] == index:
+            runs[-1] = (runs[-1][0], index + 1)
+        else:
+            runs.append((index, index + 1))
+    return runs
+
+
+def _run_ranges(runs: list[tuple[int, int]], range_count: int) -> list[tuple[int, int]]:
+    """Split page runs into about ``range_count`` ranges in proportion to their length, none spanning two runs."""
+    total = sum(stop - start for start, stop in runs)
+    ranges = []
+    for start, stop in runs:
+        count = max(1, min(stop - start, round(range_count * (stop - start) / total)))
+        ranges += [(start + first, start + last) for first, last in _page_ranges(stop - start, count)]
+    return ranges
+
+
+@contextmanager
+def _shared_path(source: bytes | str) -> Iterator[str]:
+    """A path other processes can open ``source`` from: the path itself, or a temp file holding the bytes."""
+    if isinstance(source, str):
+        yield source
+        return
+    with tempfile.NamedTemporaryFile(suffix=".pdf") as shared_pdf:
+        shared_pdf.write(source)
+        shared_pdf.flush()
+        yield shared_pdf.name
+
+
+_END = object()
+# Items _ready_batches lets its producer get ahead of the consumer.
+READY_BATCH_AHEAD = 2
+
+
+async def _ready_batches(items: Generator, max_size: int) -> AsyncIterator[list]:
+    """
+    Run ``items`` in a thread and yield what it has produced in lists of at most ``max_size``.
+
+    A list is yielded as soon as one item is ready, with whatever else is ready
+    by then, so nothing ever waits for a batch to fill. The thread gets at most
+    READY_BATCH_AHEAD items ahead of the caller, then waits for it. An
+    exception from ``items`` is raised after the items before it. When the
+    caller stops early, ``items`` is closed after the item it is working on.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=READY_BATCH_AHEAD)
+    stop = threading.Event()
+
+    def _put(item: object) -> None:
+        asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+
+    def _produce() -> None:
+        try:
+            for item in items:
+                _put(item)
+                if stop.is_set():
+                    break
+        finally:
+            items.close()
+            _put(_END)
+
+    producer = loop.run_in_executor(None, _produce)
+    try:
+        finished = False
+        while not finished:
+            batch = []
+            item = await queue.get()
+            while True:
+                if item is _END:
+                    finished = True
+                    break
+                batch.append(item)
+                if len(batch) == max_size or queue.empty():
+                    break
+                item = queue.get_nowait()
+            if batch:
+                yield batch
+        # Raises whatever ``items`` raised.
+        await producer
+    finally:
+        stop.set()
+        # Free the queue so a producer waiting to put can see ``stop``; it then puts at most
+        # the item it was working on and _END, which fit.
+        while not queue.empty():
+            queue.get_nowait()
+        # A caller that stopped early does not get the error from an item it never asked for.
+        await asyncio.gather(producer, return_exceptions=True)
+
+
+def _page_contents(
+    pdf: ExtractedPdf, start: int, stop: int | None, font_budget: int | None
+) -> Iterator[str] | Iterator[PageGlyphs]:
+    """Page texts, or with a ``font_budget`` (characters per page) page glyphs."""
+    if font_budget is None:
+        return pdf.iter_page_texts(start, stop)
+    return pdf.iter_page_glyphs(start, stop, font_budget)
+
+
+def _extract_page_range(
+    engine: str, path: str, start: int, stop: int, font_budget: int | None = None
+) -> list[str] | list[PageGlyphs]:
+    """Extract pages [start, stop) as by ``_page_contents``; runs in an extraction process."""
+    with get_pdf_engine(engine).open(path) as pdf:
+        return list(_page_contents(pdf, start, stop, font_budget))
+
+
 class PdfParsingService:
     """Extracts PDF metadata/text and stores chapter records."""
 
@@ -53,6 +249,46 @@ class PdfParsingService:
             return True
         return False
 
+    @staticmethod
+    def _outline_chapters(outline: list[OutlineEntry]) -> list[OutlineEntry]:
+        """
+        The outline entries that start chapters, or [] if the outline is unusable.
+
+        Chapters are the entries of the shallowest level with at least two of
+        them, so a lone top-level bookmark wrapping the whole book is skipped.
+        Their pages must not go backwards.
+        """
+        for level in range(MAX_OUTLINE_DEPTH):
+            entries = [entry for entry in outline if entry.level == level]
+            if len(entries) >= 2:
+                pages = [entry.page_index for entry in entries]
+                return entries if pages == sorted(pages) else []
+        return []
+
+    @staticmethod
+    def _title_line(lines: list[str], title: str) -> int | None:
+        """Index of the line a chapter titled ``title`` starts at, if it is among ``lines``."""
+        wanted = " ".join(title.split()).casefold()
+        for index, line in enumerate(lines):
+            text = " ".join(line.split()).casefold()
+            if text and (text == wanted or text.startswith(wanted) or wanted.startswith(text)):
+                return index
+        return None
+
+    @staticmethod
+    def _page_headings(page: str | PageGlyphs) -> tuple[list[str], list[bool], bool]:
+        """
+        A page's non-empty lines, which of them are headings, and whether
+        that was decided by font (the page has font data) or by text.
+        """
+        if isinstance(page, str):
+            lines = [line.strip() for line in page.splitlines() if line.strip()]
+            return lines, [PdfParsingService._is_heading(line) for line in lines], False
+        flags = FontHeadingClassifier.classify(page, settings.PDF_HEADING_SIZE_RATIO)
+        if flags is None:
+            return page.lines, [PdfParsingService._is_heading(line) for line in page.lines], False
+        return page.lines, flags, True
+
     @staticmethod
     def _normalize_metadata(metadata: dict | None) -> tuple[str | None, str | None]:
         if not metadata:
@@ -67,113 +303,473 @@ class PdfParsingService:
         return title, author
 
     @staticmethod
-    def extract_document(pdf_bytes: bytes, fallback_title: str | None = None) -> ParsedDocument:
-        lines: list[tuple[int, str]] = []
-        metadata_title: str | None = None
-        metadata_author: str | None = None
-
-        with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
-            metadata_title, metadata_author = PdfParsingService._normalize_metadata(pdf.metadata)
-
-            for page_idx, page in enumerate(pdf.pages, start=1):
-                text = page.extract_text() or ""
-                for raw_line in text.splitlines():
-                    line = raw_line.strip()
-                    if line:
-                        lines.append((page_idx, line))
-
-        derived_title = metadata_title
-        if not derived_title and lines:
-            derived_title = lines[0][1]
-        if not derived_title:
-            derived_title = fallback_title
-
-        chapter_start_indices: list[int] = []
-        for idx, (_, line) in enumerate(lines):
-            if PdfParsingService._is_heading(line):
-                chapter_start_indices.append(idx)
-
-        chapters: list[ChapterPayload] = []
-        if chapter_start_indices:
-            for chapter_num, start_idx in enumerate(chapter_start_indices, start=1):
-                end_idx = (
-                    chapter_start_indices[chapter_num] - 1
-                    if chapter_num < len(chapter_start_indices)
-                    else len(lines) - 1
-                )
-
-                title = lines[start_idx][1]
-                start_page = lines[start_idx][0]
-                end_page = lines[end_idx][0]
-                content = "\n".join(line for _, line in lines[start_idx:end_idx + 1]).strip()
-
-                if content:
-                    chapters.append(
-                        ChapterPayload(
-                            chapter_index=chapter_num,
-                            title=title,
-                            content=content,
-                            start_page=start_page,
-                            end_page=end_page,
-                        )
-                    )
+    def _extract_workers(page_count: int) -> int:
+        if page_count < max(settings.PDF_PARALLEL_MIN_PAGES, 2) or settings.PDF_EXTRACT_WORKERS == 1:
+            return 1
+        if multiprocessing.current_process().daemon:
+            # Celery's prefork pool processes are daemonic, and daemonic processes cannot start children.
+            logger.warning(
+                "PDF extraction runs in a daemonic process; extracting serially "
+                "(run the pdf_processing queue on a --pool solo worker)"
+            )
+            return 1
+        workers = settings.PDF_EXTRACT_WORKERS or os.cpu_count() or 1
+        return max(1, min(workers, page_count))
 
-        if not chapters:
-            all_text = "\n".join(line for _, line in lines).strip()
-            if all_text:
-                start_page = lines[0][0] if lines else 1
-                end_page = lines[-1][0] if lines else 1
-                chapters.append(
-                    ChapterPayload(
-                        chapter_index=1,
-                        title=derived_title or "Full document",
-                        content=all_text,
-                        start_page=start_page,
-                        end_page=end_page,
-                    )
-                )
+    @staticmethod
+    def _extract_pages(
+        pdf: ExtractedPdf,
+        engine: str,
+        source: bytes | str,
+        runs: list[tuple[int, int]],
+        font_budget: int | None,
+    ) -> Iterator[tuple[int, str | PageGlyphs]]:
+        """
+        Yield (page index, content) for the pages in ``runs``, ascending
+        [start, stop) ranges, in page order; see ``_page_contents``.
+
+        When there are enough pages, they are split into contiguous ranges
+        extracted by a pool of PDF_EXTRACT_WORKERS processes, each opening the
+        PDF by path (a temp file if ``source`` is bytes); ranges are yielded as
+        soon as they and every range before them are done. The text is the
+        same as extracting page by page here, which is also what happens from
+        the first missing page if the pool breaks (an extraction process died)
+        or cannot start, and throughout in a daemonic process such as a Celery
+        prefork pool worker.
+        """
+        workers = PdfParsingService._extract_workers(sum(stop - start for start, stop in runs))
+        next_page = 0
+        if workers > 1:
+            ranges = _run_ranges(runs, workers * RANGES_PER_WORKER)
+            with _shared_path(source) as shared_path:
+                futures = []
+                try:
+                    pool = get_pdf_extraction_pool(workers)
+                    futures = [
+                        pool.submit(_extract_page_range, engine, shared_path, first, stop, font_budget)
+                        for first, stop in ranges
+                    ]
+                    for (first, _), future in zip(ranges, futures, strict=True):
+                        for index, content in enumerate(future.result(), start=first):
+                            next_page = index + 1
+                            yield index, content
+                except (BrokenProcessPool, OSError) as exc:
+                    logger.warning("PDF extraction pool failed; extracting serially", extra={"error": str(exc)})
+                    shutdown_pdf_extraction_pool()
+                finally:
+                    # A consumer that stops early must not leave ranges queued behind the next document.
+                    for future in futures:
+                        future.cancel()
+
+        for start, stop in runs:
+            start = max(start, next_page)
+            if start < stop:
+                yield from enumerate(_page_contents(pdf, start, stop, font_budget), start=start)
+
+    @staticmethod
+    def _iter_page_texts(
+        pdf: ExtractedPdf,
+        engine: str,
+        source: bytes | str,
+        start: int = 0,
+        font_budget: int | None = None,
+        cached: dict[int, str] | None = None,
+        extracted: dict[int, str] | None = None,
+        deadline: float | None = None,
+    ) -> Iterator[str] | Iterator[PageGlyphs]:
+        """
+        Yield the text of every page of the open ``pdf`` from page ``start`` on, in page order.
+
+        With a ``font_budget``, pages are yielded as ``PageGlyphs`` instead,
+        with font data for pages of at most that many characters. Pages in
+        ``cached`` (page index to ``encode_page`` output, from an earlier run)
+        are not extracted again, and newly extracted pages are added to
+        ``extracted``.
+
+        Raises:
+            PdfParseDeadline: If ``deadline`` (a ``time.monotonic()`` value)
+                has passed when a page is due to be extracted. At least one
+                page is extracted first, so every run makes progress.
+        """
+        glyphs = font_budget is not None
+        cached = {index: value for index, value in (cached or {}).items() if is_cached_page(value, glyphs)}
+        runs = _page_runs([index for index in range(start, pdf.page_count) if index not in cached])
+        pages = PdfParsingService._extract_pages(pdf, engine, source, runs, font_budget)
+        progressed = False
+        try:
+            for index in range(start, pdf.page_count):
+                if index in cached:
+                    yield decode_page(cached[index])
+                    continue
+                if progressed and deadline is not None and time.monotonic() >= deadline:
+                    raise PdfParseDeadline(index)
+                _, content = next(pages)
+                progressed = True
+                if extracted is not None:
+                    extracted[index] = encode_page(content)
+                yield content
+        finally:
+            pages.close()
 
-        return ParsedDocument(title=derived_title, author=metadata_author, chapters=chapters)
+    @staticmethod
+    def stream_document(
+        source: bytes | str,
+        fallback_title: str | None = None,
+        engine: str | None = None,
+        cached_pages: dict[int, str] | None = None,
+        deadline: float | None = None,
+    ) -> ChapterStream:
+        """
+        Parse a PDF lazily: chapters are produced one at a time as the result is iterated.
+
+        Args:
+            source: The PDF's bytes, or a path to it.
+            fallback_title: Title used when the PDF has neither a title nor any text.
+            engine: Text extraction engine (see ``PDF_ENGINES``); PDF_EXTRACT_ENGINE if None.
+            cached_pages: Pages by page index from an earlier run with the same
+                engine, as ``encode_page`` output.
+            deadline: ``time.monotonic()`` value after which extraction stops
+                with ``PdfParseDeadline``.
+
+        Raises:
+            PdfEngineError: If the engine is unknown.
+        """
+        return ChapterStream(
+            source,
+            fallback_title,
+            get_pdf_engine(engine or settings.PDF_EXTRACT_ENGINE).name,
+            cached_pages=cached_pages,
+            deadline=deadline,
+        )
+
+    @staticmethod
+    def extract_document(
+        source: bytes | str,
+        fallback_title: str | None = None,
+        engine: str | None = None,
+    ) -> ParsedDocument:
+        stream = PdfParsingService.stream_document(source, fallback_title, engine)
+        chapters = list(stream)
+        return ParsedDocument(title=stream.title, author=stream.author, chapters=chapters)
+
+    @staticmethod
+    async def _insert_chapters(db: AsyncSession, file_id: int, payloads: list[ChapterPayload]) -> list[StoredChapter]:
+        """Insert ``payloads`` as chapters of ``file_id`` in one statement, without committing."""
+        if not payloads:
+            return []
+        result = await db.execute(
+            insert(Chapter).returning(Chapter.id, Chapter.chapter_index, sort_by_parameter_order=True),
+            [
+                {
+                    "file_id": file_id,
+                    "chapter_index": payload.chapter_index,
+                    "title": payload.title,
+                    "content": payload.content,
+                    "start_page": payload.start_page,
+                    "end_page": payload.end_page,
+                }
+                for payload in payloads
+            ],
+        )
+        return [StoredChapter(id=row.id, chapter_index=row.chapter_index) for row in result]
 
     @staticmethod
     async def parse_and_store(
         db: AsyncSession,
         file_record: File,
-        pdf_bytes: bytes,
+        source: bytes | str,
+        on_chapters: Callable[[list[StoredChapter]], Awaitable[None]] | None = None,
+        resume_from: int = 0,
+        deadline: float | None = None,
     ) -> int:
-        """Parse a PDF and persist parsed chapter records for a file."""
-        parsed = PdfParsingService.extract_document(
-            pdf_bytes=pdf_bytes,
+        """
+        Parse a PDF and persist its chapter records as they are parsed.
+
+        Parsing runs in a thread. Chapters are inserted as soon as the next
+        heading (or the end of the document) closes them, all those parsed by
+        then in one INSERT of up to PDF_CHAPTER_INSERT_BATCH rows, and their
+        ids are passed to ``on_chapters``, so work on early chapters can start
+        while later pages are still being read. The file's previous chapters
+        and parsed title/author are replaced together with the first new
+        chapters; if that first write fails, nothing changes.
+
+        ``source`` is the PDF's bytes or a path to it; a path keeps the
+        document off the heap, and extraction processes open it directly.
+
+        With PDF_PAGE_CACHE_ENABLED, page text (or glyphs, for font-based
+        heading detection) is cached as chapters are stored and when parsing
+        stops, so a retry or re-run only extracts missing pages.
+
+        Args:
+            resume_from: Chapters already stored by an interrupted run of this
+                parse, which are kept and skipped rather than replaced.
+            deadline: ``time.monotonic()`` value at which to stop with
+                ``PdfParseDeadline``; its ``chapters_stored`` is the
+                ``resume_from`` for the run that carries on.
+
+        Returns:
+            The number of chapters stored, including resumed ones.
+        """
+        engine = get_pdf_engine(file_record.extract_engine or settings.PDF_EXTRACT_ENGINE)
+        page_cache = get_pdf_page_cache() if settings.PDF_PAGE_CACHE_ENABLED else None
+        # Font-based heading detection caches glyphs, which depend on the per-page character budget.
+        variant = f"glyphs{settings.PDF_HEADING_MAX_PAGE_CHARS}" if settings.PDF_HEADING_DETECTION == "font" else ""
+        cache_key = PdfPageCache.cache_key(source, engine, variant) if page_cache is not None else ""
+        cached_pages = await page_cache.load(cache_key) if page_cache is not None else {}
+
+        stream = PdfParsingService.stream_document(
+            source=source,
             fallback_title=file_record.original_filename,
+            engine=engine.name,
+            cached_pages=cached_pages,
+            deadline=deadline,
         )
 
-        transaction = db.begin_nested() if db.in_transaction() else db.begin()
-        async with transaction:
-            await db.execute(delete(Chapter).where(Chapter.file_id == file_record.id))
-
-            for chapter in parsed.chapters:
-                db.add(
-                    Chapter(
-                        file_id=file_record.id,
-                        chapter_index=chapter.chapter_index,
-                        title=chapter.title,
-                        content=chapter.content,
-                        start_page=chapter.start_page,
-                        end_page=chapter.end_page,
+        async def _save_pages() -> None:
+            # The parsing thread keeps adding pages, so take them one by one rather than copy and clear.
+            pages = {index: stream.extracted_pages.pop(index) for index in list(stream.extracted_pages)}
+            if page_cache is not None and pages:
+                await page_cache.store(cache_key, pages)
+
+        chapter_count = resume_from
+        chars_removed = 0
+
+        async def _store(payloads: list[ChapterPayload]) -> list[StoredChapter]:
+            try:
+                if chapter_count == 0:
+                    await db.execute(delete(Chapter).where(Chapter.file_id == file_record.id))
+                    file_record.parsed_title = stream.title
+                    file_record.parsed_author = stream.author
+                stored = await PdfParsingService._insert_chapters(db, file_record.id, payloads)
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+            return stored
+
+        try:
+            async with aclosing(_ready_batches(iter(stream), settings.PDF_CHAPTER_INSERT_BATCH)) as batches:
+                async for batch in batches:
+                    payloads = [payload for payload in batch if payload.chapter_index > resume_from]
+                    if not payloads:
+                        continue
+                    stored = await _store(payloads)
+                    chapter_count += len(payloads)
+                    chars_removed += sum(payload.chars_removed for payload in payloads)
+                    logger.info(
+                        "Stored parsed chapters",
+                        extra={
+                            "file_id": file_record.id,
+                            "chapter_indexes": [payload.chapter_index for payload in payloads],
+                            "chars": sum(len(payload.content) for payload in payloads),
+                        },
                     )
-                )
-
-            file_record.parsed_title = parsed.title
-            file_record.parsed_author = parsed.author
+                    await _save_pages()
+                    if on_chapters is not None:
+                        await on_chapters(stored)
+        except PdfParseDeadline as exc:
+            exc.chapters_stored = chapter_count
+            logger.info(
+                "PDF parse deadline reached",
+                extra={"file_id": file_record.id, "chapters_stored": chapter_count, "page": exc.page_index + 1},
+            )
+            raise
+        finally:
+            await _save_pages()
+
+        if chapter_count == 0:
+            await _store([])
 
         logger.info(
             "Parsed PDF and stored chapter records",
             extra={
                 "file_id": file_record.id,
-                "chapter_count": len(parsed.chapters),
-                "parsed_title": parsed.title,
-                "parsed_author": parsed.author,
+                "chapter_count": chapter_count,
+                "resumed_chapters": resume_from,
+                "cached_pages": len(cached_pages),
+                "engine": stream.engine,
+                "chapter_source": stream.chapter_source,
+                "chars_removed": chars_removed,
+                "parsed_title": stream.title,
+                "parsed_author": stream.author,
             },
         )
 
-        return len(parsed.chapters)
+        return chapter_count
+
+
+class ChapterStream:
+    """
+    The chapters of a PDF, parsed as they are iterated.
+
+    Chapters follow the PDF's outline (bookmarks) when it has a usable one,
+    and lines that look like headings otherwise; ``chapter_source`` says
+    which ("outline" or "headings") once iteration has started. Only the
+    lines of the chapter being assembled are held, except in a document
+    without headings, which becomes a single chapter. ``title`` and
+    ``author`` are set once iteration has started (the title may come from
+    the first line of text) and final once it has finished.
+    """
+
+    def __init__(
+        self,
+        source: bytes | str,
+        fallback_title: str | None,
+        engine: str,
+        cached_pages: dict[int, str] | None = None,
+        deadline: float | None = None,
+    ):
+        self._source = source
+        self._fallback_title = fallback_title
+        self._cached_pages = cached_pages or {}
+        self._deadline = deadline
+        self.engine = engine
+        # Pages extracted (not taken from ``cached_pages``) since the caller last cleared it.
+        self.extracted_pages: dict[int, str] = {}
+        self.title: str | None = None
+        self.author: str | None = None
+        self.chapter_source: str | None = None
+
+    def __iter__(self) -> Iterator[ChapterPayload]:
+        """
+        Yield chapters numbered from 1, normalized with TEXT_NORMALIZATION_RULES.
+
+        A chapter left without text by normalization (say, a "PAGE 12" heading
+        over a page number) is dropped, and later chapters are numbered on.
+        """
+        with get_pdf_engine(self.engine).open(self._source) as pdf:
+            self.title, self.author = PdfParsingService._normalize_metadata(pdf.metadata)
+            entries = PdfParsingService._outline_chapters(pdf.outline()) if settings.PDF_OUTLINE_CHAPTERS else []
+            if entries:
+                self.chapter_source = "outline"
+                chapters = self._outline_chapters(pdf, entries)
+            else:
+                self.chapter_source = "headings"
+                chapters = self._heading_chapters(pdf)
+
+            rules = settings.text_normalization_rules
+            chapter_index = 0
+            for chapter in chapters:
+                if rules:
+                    normalized = TextNormalizer.normalize(chapter.content, rules)
+                    chapter.content = normalized.text
+                    chapter.chars_removed = normalized.chars_removed
+                if not chapter.content:
+                    logger.info(
+                        "Dropped chapter left empty by normalization",
+                        extra={"title": chapter.title, "start_page": chapter.start_page},
+                    )
+                    continue
+                chapter_index += 1
+                chapter.chapter_index = chapter_index
+                yield chapter
+
+    def _outline_chapters(self, pdf: ExtractedPdf, entries: list[OutlineEntry]) -> Iterator[ChapterPayload]:
+        """
+        Split the text at the outline's chapter entries.
+
+        Extraction starts at the first chapter's page, so front matter is
+        never read. A chapter starting mid-page begins at the line matching
+        its title, or with the whole page if no line does. Chapters left
+        without text (e.g. two entries for one page) are skipped.
+        """
+        if self.title is None:
+            self.title = next(
+                (line.strip() for text in pdf.iter_page_texts(0, 1) for line in text.splitlines() if line.strip()),
+                self._fallback_title,
+            )
+
+        first_page = entries[0].page_index
+        pending = iter(entries)
+        upcoming = next(pending, None)
+        title: str | None = None
+        current: list[tuple[int, str]] = []
+
+        texts = PdfParsingService._iter_page_texts(
+            pdf,
+            self.engine,
+            self._source,
+            first_page,
+            cached=self._cached_pages,
+            extracted=self.extracted_pages,
+            deadline=self._deadline,
+        )
+        for page_idx, text in enumerate(texts, start=first_page + 1):
+            lines = [line.strip() for line in text.splitlines() if line.strip()]
+            while upcoming is not None and upcoming.page_index == page_idx - 1:
+                split = PdfParsingService._title_line(lines, upcoming.title) or 0
+                current.extend((page_idx, line) for line in lines[:split])
+                if title is not None and current:
+                    yield self._chapter(title, current)
+                title, current, lines = upcoming.title, [], lines[split:]
+                upcoming = next(pending, None)
+            current.extend((page_idx, line) for line in lines)
+
+        if title is not None and current:
+            yield self._chapter(title, current)
+
+    def _heading_chapters(self, pdf: ExtractedPdf) -> Iterator[ChapterPayload]:
+        """
+        Split the text at heading lines, found by their text (``_is_heading``)
+        or, with PDF_HEADING_DETECTION=font, by their type size and weight.
+
+        Pages without font data (engine support, or over the
+        PDF_HEADING_MAX_PAGE_CHARS budget) fall back to text detection. On
+        pages classified by font, consecutive heading lines opening a chapter
+        are one heading set over several lines.
+        """
+        font_budget = settings.PDF_HEADING_MAX_PAGE_CHARS if settings.PDF_HEADING_DETECTION == "font" else None
+        pages = PdfParsingService._iter_page_texts(
+            pdf,
+            self.engine,
+            self._source,
+            font_budget=font_budget,
+            cached=self._cached_pages,
+            extracted=self.extracted_pages,
+            deadline=self._deadline,
+        )
+        # Lines before the first heading are dropped, unless no heading ever comes.
+        preamble: list[tuple[int, str]] = []
+        current: list[tuple[int, str]] | None = None
+        title = ""
+        in_heading = False
+
+        for page_idx, page in enumerate(pages, start=1):
+            lines, flags, by_font = PdfParsingService._page_headings(page)
+            for line, is_heading in zip(lines, flags, strict=True):
+                if self.title is None:
+                    self.title = line
+                if is_heading and by_font and in_heading and current[-1][0] == page_idx:
+                    title = f"{title} {line}"
+                    current.append((page_idx, line))
+                elif is_heading:
+                    if current is not None:
+                        yield self._chapter(title, current)
+                    preamble = []
+                    title = line
+                    current = [(page_idx, line)]
+                    in_heading = True
+                elif current is not None:
+                    current.append((page_idx, line))
+                    in_heading = False
+                else:
+                    preamble.append((page_idx, line))
+
+        if self.title is None:
+            self.title = self._fallback_title
+
+        if current is not None:
+            yield self._chapter(title, current)
+        elif preamble:
+            yield self._chapter(self.title or "Full document", preamble)
+
+    @staticmethod
+    def _chapter(title: str, lines: list[tuple[int, str]]) -> ChapterPayload:
+        """A chapter of raw text from (page number, line) pairs; ``__iter__`` numbers and normalizes it."""
+        return ChapterPayload(
+            chapter_index=0,
+            title=title,
+            content="\n".join(line for _, line in lines).strip(),
+            start_page=lines[0][0],
+            end_page=lines[-1][0],
+        )
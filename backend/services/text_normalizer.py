@@ -0,0 +1,224 @@
+"""Cleans extracted PDF text before it is stored and sent to TTS."""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+HYPHENATED_BREAK = re.compile(r"(\w)-\n[ \t]*(?=[a-z])")
+PAGE_NUMBER_LINE = re.compile(
+    r"^[ \t]*(?:(?:page|p\.)[ \t]*)?[-–—]?[ \t]*(?:\d{1,4}|[ivxlc]{1,7})[ \t]*(?:(?:of|/)[ \t]*\d{1,4}[ \t]*)?[-–—]?[ \t]*$\n?",
+    re.IGNORECASE | re.MULTILINE,
+)
+URL = re.compile(r"\b(?:https?://|www\.)\S+?(?=[.,;:!?)\]]*(?:\s|$))|\b[\w.+-]+@[\w-]+(?:\.[\w-]+)+\b", re.IGNORECASE)
+CITATION_MARKER = re.compile(r"[ \t]*\[\d+(?:[ \t]*[,–-][ \t]*\d+)*\]")
+ISBN = re.compile(r"\bISBN(?:-1[03])?:?[ \t]*[\dX][\dX -]{8,16}[\dX]\b", re.IGNORECASE)
+DIGIT_RUN = re.compile(r"(?<![\w.,])\d{8,}(?![\w.,])")
+SOFT_LINE_BREAK = re.compile(r"(?<=[^\n])\n(?=[ \t]*[a-z0-9(])|(?<=[,;–-])\n(?=[^\n])")
+DOT_LEADER = re.compile(r"(?:[ \t]*[.·]){4,}[ \t]*")
+REPEATED_PUNCTUATION = re.compile(r"([!?,;:])(?:[ \t]*[!?,;:])+")
+SEPARATOR_RUN = re.compile(r"[-_=*~#]{3,}")
+EMPTY_BRACKETS = re.compile(r"\([ \t]*\)|\[[ \t]*\]")
+SPACE_BEFORE_PUNCTUATION = re.compile(r"[ \t]+(?=[,.;:!?])")
+HORIZONTAL_SPACE = re.compile(r"[ \t]{2,}")
+BLANK_LINES = re.compile(r"[ \t]*\n(?:[ \t]*\n)+")
+NUMBER = re.compile(r"(?<![\w.,])(\d{1,3}(?:,\d{3})+|\d+)(?:\.(\d+))?(st|nd|rd|th)?(%)?(?!\w|[.,]\d)")
+
+ABBREVIATIONS: tuple[tuple[re.Pattern[str], str], ...] = tuple(
+    (re.compile(pattern), replacement)
+    for pattern, replacement in (
+        (r"\be\.g\.(?=\W)", "for example"),
+        (r"\bi\.e\.(?=\W)", "that is"),
+        (r"\bcf\.(?=\s)", "compare"),
+        (r"\bvs\.(?=\s)", "versus"),
+        (r"\bapprox\.(?=\s)", "approximately"),
+        (r"\bDr\.(?=\s+[A-Z])", "Doctor"),
+        (r"\bMr\.(?=\s+[A-Z])", "Mister"),
+        (r"\bMrs\.(?=\s+[A-Z])", "Missus"),
+        (r"\bProf\.(?=\s+[A-Z])", "Professor"),
+        (r"\bSt\.(?=\s+[A-Z])", "Saint"),
+        (r"\b[Ff]ig\.(?=\s*\d)", "Figure"),
+        (r"\b[Nn]o\.(?=\s*\d)", "Number"),
+        (r"\b[Vv]ol\.(?=\s*\d)", "Volume"),
+        (r"\b[Cc]h\.(?=\s*\d)", "Chapter"),
+        (r"\bpp\.(?=\s*\d)", "pages"),
+    )
+)
+# "etc." keeps its full stop only where it ends the sentence.
+ET_CETERA = re.compile(r"\betc\.(\s+[A-Z]|\s*$)?", re.MULTILINE)
+
+ONES = (
+    "zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten",
+    "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen", "seventeen", "eighteen", "nineteen",
+)
+TENS = ("", "", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety")
+SCALES = ((10**12, "trillion"), (10**9, "billion"), (10**6, "million"), (10**3, "thousand"))
+IRREGULAR_ORDINALS = {
+    "one": "first", "two": "second", "three": "third", "five": "fifth",
+    "eight": "eighth", "nine": "ninth", "twelve": "twelfth",
+}
+
+
+@dataclass(slots=True)
+class NormalizedText:
+    text: str
+    chars_removed: int
+
+
+def _dehyphenate(text: str) -> str:
+    return HYPHENATED_BREAK.sub(r"\1", text)
+
+
+def _strip_page_numbers(text: str) -> str:
+    return PAGE_NUMBER_LINE.sub("", text)
+
+
+def _strip_urls(text: str) -> str:
+    return URL.sub("", text)
+
+
+def _strip_numeric_noise(text: str) -> str:
+    text = CITATION_MARKER.sub("", text)
+    text = ISBN.sub("", text)
+    return DIGIT_RUN.sub("", text)
+
+
+def _unwrap_lines(text: str) -> str:
+    return SOFT_LINE_BREAK.sub(" ", text)
+
+
+def _collapse_punctuation(text: str) -> str:
+    text = DOT_LEADER.sub(" ", text)
+    text = REPEATED_PUNCTUATION.sub(r"\1", text)
+    return SEPARATOR_RUN.sub(" ", text)
+
+
+def _expand_abbreviations(text: str) -> str:
+    for pattern, replacement in ABBREVIATIONS:
+        text = pattern.sub(replacement, text)
+    return ET_CETERA.sub(lambda match: f"et cetera.{match.group(1)}" if match.group(1) is not None else "et cetera", text)
+
+
+def _integer_words(number: int) -> str:
+    if number < 20:
+        return ONES[number]
+    if number < 100:
+        tens, ones = divmod(number, 10)
+        return TENS[tens] + (f"-{ONES[ones]}" if ones else "")
+    if number < 1000:
+        hundreds, rest = divmod(number, 100)
+        return f"{ONES[hundreds]} hundred" + (f" {_integer_words(rest)}" if rest else "")
+    if number >= 1000 * SCALES[0][0]:
+        return " ".join(ONES[int(digit)] for digit in str(number))
+    for scale, name in SCALES:
+        if number >= scale:
+            leading, rest = divmod(number, scale)
+            return f"{_integer_words(leading)} {name}" + (f" {_integer_words(rest)}" if rest else "")
+    raise AssertionError("unreachable")
+
+
+def _year_words(year: int) -> str:
+    century, rest = divmod(year, 100)
+    if rest == 0:
+        return f"{_integer_words(century)} hundred"
+    if 2000 <= year < 2010:
+        return f"two thousand {_integer_words(rest)}"
+    return f"{_integer_words(century)} {'oh ' if rest < 10 else ''}{_integer_words(rest)}"
+
+
+def _ordinal_words(number: int) -> str:
+    words = _integer_words(number)
+    head, separator, last = words.rpartition("-" if "-" in words.rsplit(" ", 1)[-1] else " ")
+    if last in IRREGULAR_ORDINALS:
+        last = IRREGULAR_ORDINALS[last]
+    elif last.endswith("y"):
+        last = f"{last[:-1]}ieth"
+    else:
+        last = f"{last}th"
+    return f"{head}{separator}{last}"
+
+
+def _number_words(match: re.Match[str]) -> str:
+    digits, fraction, ordinal_suffix, percent = match.groups()
+    grouped = "," in digits
+    number = int(digits.replace(",", ""))
+
+    if ordinal_suffix and not fraction:
+        words = _ordinal_words(number)
+    elif not grouped and not fraction and len(digits) == 4 and 1100 <= number < 2100:
+        words = _year_words(number)
+    elif len(digits) > 1 and digits.startswith("0"):
+        words = " ".join(ONES[int(digit)] for digit in digits)
+    else:
+        words = _integer_words(number)
+
+    if fraction:
+        words += " point " + " ".join(ONES[int(digit)] for digit in fraction)
+    if percent:
+        words += " percent"
+    return words
+
+
+def _expand_numbers(text: str) -> str:
+    return NUMBER.sub(_number_words, text)
+
+
+# Applied in this order whatever order the rules are configured in: line-based
+# rules need the original line breaks, and abbreviations must be expanded
+# before numbers so "No. 5" reads as "Number five".
+RULES: dict[str, Callable[[str], str]] = {
+    "dehyphenate": _dehyphenate,
+    "page_numbers": _strip_page_numbers,
+    "urls": _strip_urls,
+    "numeric_noise": _strip_numeric_noise,
+    "unwrap": _unwrap_lines,
+    "punctuation": _collapse_punctuation,
+    "abbreviations": _expand_abbreviations,
+    "numbers": _expand_numbers,
+}
+
+
+class TextNormalizer:
+    """Rewrites extracted text into the form that is stored and synthesized."""
+
+    @staticmethod
+    def _tidy(text: str) -> str:
+        text = EMPTY_BRACKETS.sub("", text)
+        text = SPACE_BEFORE_PUNCTUATION.sub("", text)
+        text = HORIZONTAL_SPACE.sub(" ", text)
+        text = BLANK_LINES.sub("\n", text)
+        return "\n".join(line.strip() for line in text.splitlines()).strip()
+
+    @staticmethod
+    def normalize(text: str, rules: Iterable[str]) -> NormalizedText:
+        """
+        Apply the named normalization rules to ``text``.
+
+        Rules run in the canonical order of ``RULES``; surrounding whitespace,
+        empty brackets left behind by removals and runs of spaces are always
+        tidied afterwards.
+
+        Args:
+            text: Chapter text as extracted from the PDF, one line per line.
+            rules: Names of the rules to apply (see ``RULES``).
+
+        Returns:
+            The normalized text and how many characters shorter it is than the
+            input. The count is negative when expansions outweigh removals.
+
+        Raises:
+            ValueError: If ``rules`` names an unknown rule.
+        """
+        enabled = set(rules)
+        unknown = enabled - RULES.keys()
+        if unknown:
+            raise ValueError(f"Unknown text normalization rules: {', '.join(sorted(unknown))}")
+
+        normalized = text
+        for name, rule in RULES.items():
+            if name in enabled:
+                normalized = rule(normalized)
+        normalized = TextNormalizer._tidy(normalized)
+
+        return NormalizedText(text=normalized, chars_removed=len(text) - len(normalized))
@@ -0,0 +1,99 @@
+"""Splits chapter text into TTS-sized segments at paragraph and sentence boundaries."""
+
+from __future__ import annotations
+
+import re
+
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+SENTENCE_END = re.compile(r"(?<=[.!?…])[\"'”’)\]]*\s+")
+CLAUSE_END = re.compile(r"(?<=[,;:])\s+")
+
+
+class TextSegmenter:
+    """Packs sentences into segments no longer than a character budget."""
+
+    @staticmethod
+    def _split_long_sentence(sentence: str, max_chars: int) -> list[str]:
+        tokens: list[str] = []
+        for clause in CLAUSE_END.split(sentence):
+            tokens.extend([clause] if len(clause) <= max_chars else clause.split())
+
+        pieces: list[str] = []
+        current = ""
+        for token in tokens:
+            while len(token) > max_chars:
+                if current:
+                    pieces.append(current)
+                    current = ""
+                pieces.append(token[:max_chars])
+                token = token[max_chars:]
+            if not current:
+                current = token
+            elif len(current) + 1 + len(token) <= max_chars:
+                current = f"{current} {token}"
+            else:
+                pieces.append(current)
+                current = token
+        if current:
+            pieces.append(current)
+        return pieces
+
+    @staticmethod
+    def _sentences(paragraph: str, max_chars: int) -> list[str]:
+        flattened = " ".join(paragraph.split())
+        sentences: list[str] = []
+        for sentence in SENTENCE_END.split(flattened):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            if len(sentence) > max_chars:
+                sentences.extend(TextSegmenter._split_long_sentence(sentence, max_chars))
+            else:
+                sentences.append(sentence)
+        return sentences
+
+    @staticmethod
+    def split(text: str, max_chars: int) -> list[str]:
+        """
+        Split text into ordered segments of at most ``max_chars`` characters.
+
+        Paragraph breaks are preferred split points; within a paragraph whole
+        sentences are packed greedily. Sentences longer than the budget are cut
+        at clause punctuation, then at word boundaries.
+
+        Args:
+            text: Chapter text to split.
+            max_chars: Maximum characters per segment.
+
+        Returns:
+            Non-empty segments in reading order.
+        """
+        if max_chars <= 0:
+            raise ValueError("max_chars must be positive")
+
+        segments: list[str] = []
+        current = ""
+        for paragraph in PARAGRAPH_BREAK.split(text):
+            sentences = TextSegmenter._sentences(paragraph, max_chars)
+            if not sentences:
+                continue
+
+            paragraph_length = sum(len(sentence) for sentence in sentences) + len(sentences) - 1
+            if current and len(current) + 2 + paragraph_length > max_chars:
+                segments.append(current)
+                current = ""
+
+            for position, sentence in enumerate(sentences):
+                separator = "\n\n" if position == 0 else " "
+                if not current:
+                    current = sentence
+                elif len(current) + len(separator) + len(sentence) <= max_chars:
+                    current = f"{current}{separator}{sentence}"
+                else:
+                    segments.append(current)
+                    current = sentence
+
+        if current:
+            segments.append(current)
+
+        return segments
@@ -1,20 +1,155 @@
-"""Coqui TTS service for text-to-speech conversion via HTTP."""
+"""Text-to-speech backends: the Coqui TTS HTTP server and an in-process stub engine."""
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
 import logging
+import struct
+import time
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import AsyncExitStack, nullcontext
+from typing import TypeVar
 
 import httpx
+import numpy as np
 
 from core.config import settings
+from core.redis import get_redis_client
+from services.tts_limiter import get_tts_limiter
+from services.tts_router import TTSReplicaRouter
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
 
-class CoquiTTSService:
-    """Calls the Coqui TTS HTTP server and returns raw audio bytes."""
 
-    @staticmethod
-    async def synthesize(text: str) -> bytes:
+class TTSHttpClient:
+    """
+    Long-lived, pooled HTTP client shared by all TTS calls in a process.
+
+    The underlying ``httpx.AsyncClient`` is created lazily so it binds to the
+    event loop that first uses it, and is kept open for keep-alive reuse until
+    ``aclose`` is called on worker shutdown.
+    """
+
+    def __init__(self):
+        self._client: httpx.AsyncClient | None = None
+
+    def get_client(self) -> httpx.AsyncClient:
+        """
+        Get or create the pooled client instance.
+
+        Returns:
+            httpx.AsyncClient: Client configured with pool limits and timeouts from settings
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(
+                    connect=settings.TTS_HTTP_CONNECT_TIMEOUT,
+                    read=settings.TTS_HTTP_READ_TIMEOUT,
+                    write=settings.TTS_HTTP_WRITE_TIMEOUT,
+                    pool=settings.TTS_HTTP_POOL_TIMEOUT,
+                ),
+                limits=httpx.Limits(
+                    max_connections=settings.TTS_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.TTS_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.TTS_HTTP_KEEPALIVE_EXPIRY,
+                ),
+            )
+            logger.info(
+                "TTS HTTP client initialized",
+                extra={
+                    "max_connections": settings.TTS_HTTP_MAX_CONNECTIONS,
+                    "max_keepalive_connections": settings.TTS_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                },
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the pooled client and drop all idle connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            logger.info("TTS HTTP client closed")
+
+
+tts_http_client = TTSHttpClient()
+
+
+def get_tts_http_client() -> TTSHttpClient:
+    return tts_http_client
+
+
+_tts_router: TTSReplicaRouter | None = None
+
+
+def get_tts_router() -> TTSReplicaRouter:
+    """Return the process-wide replica router, rebuilding it if the replica list changed."""
+    global _tts_router
+    urls = [url.rstrip("/") for url in settings.tts_service_urls]
+    if _tts_router is None or _tts_router.urls != urls:
+        _tts_router = TTSReplicaRouter(
+            urls=urls,
+            probe_client=tts_http_client.get_client,
+            balance_by=settings.TTS_ROUTER_BALANCE_BY,
+            failure_threshold=settings.TTS_ROUTER_FAILURE_THRESHOLD,
+            latency_spike_factor=settings.TTS_ROUTER_LATENCY_SPIKE_FACTOR,
+            open_seconds=settings.TTS_BREAKER_OPEN_SECONDS,
+            probe_interval_seconds=settings.TTS_ROUTER_PROBE_INTERVAL,
+            probe_timeout_seconds=settings.TTS_ROUTER_PROBE_TIMEOUT,
+            probe_path=settings.TTS_ROUTER_PROBE_PATH,
+            hedge_percentile=settings.TTS_HEDGE_PERCENTILE if settings.TTS_HEDGE_ENABLED else None,
+            hedge_min_delay_seconds=settings.TTS_HEDGE_MIN_DELAY,
+            hedge_max_ratio=settings.TTS_HEDGE_MAX_RATIO,
+            redis=get_redis_client().get_client() if settings.TTS_ROUTER_METRICS_INTERVAL > 0 else None,
+            metrics_interval_seconds=settings.TTS_ROUTER_METRICS_INTERVAL,
+        )
+    return _tts_router
+
+
+def _limiter_slot(text_length: int):
+    limiter = get_tts_limiter()
+    return limiter.slot(text_length) if limiter is not None else nullcontext()
+
+
+class TTSBackend(ABC):
+    """Engine that turns text into mono 16-bit WAV audio."""
+
+    name: str
+
+    @property
+    def model_name(self) -> str:
+        """Identity of the voice model; part of the TTS cache key."""
+        return self.name
+
+    async def synthesize(self, text: str) -> bytes:
+        """Synthesize ``text`` and return the complete WAV file."""
+        return b"".join([chunk async for chunk in self.synthesize_stream(text)])
+
+    @abstractmethod
+    def synthesize_stream(self, text: str) -> AsyncIterator[bytes]:
+        """Synthesize ``text``, yielding the WAV file in chunks as it is produced."""
+
+
+class CoquiHTTPBackend(TTSBackend):
+    """
+    Calls Coqui TTS HTTP servers through the pooled per-process client.
+
+    Each request first takes a slot from the adaptive concurrency limiter, then
+    is routed by ``get_tts_router()`` to the replica with the least outstanding
+    work among TTS_SERVICE_URLS. With hedging enabled, a request still waiting
+    after the router's hedge delay is duplicated onto another replica.
+    """
+
+    name = "coqui"
+
+    @property
+    def model_name(self) -> str:
+        return settings.TTS_MODEL_NAME
+
+    async def synthesize(self, text: str) -> bytes:
         """
         Convert text to speech using the Coqui TTS service.
 
@@ -27,16 +162,249 @@ class CoquiTTSService:
         Raises:
             httpx.HTTPStatusError: If the TTS service returns a non-2xx response.
             httpx.RequestError: If the TTS service is unreachable.
+            TTSUnavailableError: If every replica's circuit breaker is open.
         """
-        url = f"{settings.TTS_SERVICE_URL}/api/tts"
-
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.post(url, json={"text": text})
-            response.raise_for_status()
+        client = get_tts_http_client().get_client()
+        replica_url, response = await self._hedged(text, functools.partial(self._post, client, text))
 
         logger.info(
             "TTS synthesis completed",
-            extra={"text_length": len(text), "audio_bytes": len(response.content)},
+            extra={"text_length": len(text), "audio_bytes": len(response.content), "replica": replica_url},
         )
 
         return response.content
+
+    async def synthesize_stream(self, text: str) -> AsyncIterator[bytes]:
+        """
+        Convert text to speech, yielding the WAV response body as it arrives.
+
+        Args:
+            text: Text to synthesize.
+
+        Yields:
+            Chunks of WAV audio bytes of at most TTS_STREAM_CHUNK_SIZE bytes.
+
+        Raises:
+            httpx.HTTPStatusError: If the TTS service returns a non-2xx response.
+            httpx.RequestError: If the TTS service is unreachable.
+            TTSUnavailableError: If every replica's circuit breaker is open.
+        """
+        audio_bytes = 0
+
+        client = get_tts_http_client().get_client()
+        request_stack, replica_url, response = await self._hedged(
+            text,
+            functools.partial(self._open_stream, client, text),
+            discard=lambda opened: opened[0].aclose(),
+        )
+        async with request_stack:
+            async for chunk in response.aiter_bytes(settings.TTS_STREAM_CHUNK_SIZE):
+                audio_bytes += len(chunk)
+                yield chunk
+
+        logger.info(
+            "TTS synthesis streamed",
+            extra={"text_length": len(text), "audio_bytes": audio_bytes, "replica": replica_url},
+        )
+
+    @staticmethod
+    async def _post(client: httpx.AsyncClient, text: str, in_use: set[str]) -> tuple[str, httpx.Response]:
+        async with _limiter_slot(len(text)), get_tts_router().lease(len(text), exclude=in_use) as replica:
+            in_use.add(replica.url)
+            response = await client.post(f"{replica.url}/api/tts", json={"text": text})
+            response.raise_for_status()
+            return replica.url, response
+
+    @staticmethod
+    async def _open_stream(
+        client: httpx.AsyncClient, text: str, in_use: set[str]
+    ) -> tuple[AsyncExitStack, str, httpx.Response]:
+        # Returns once response headers are in; the caller owns the stack holding the
+        # limiter slot, replica lease and open response until the body is consumed.
+        async with AsyncExitStack() as stack:
+            await stack.enter_async_context(_limiter_slot(len(text)))
+            replica = await stack.enter_async_context(get_tts_router().lease(len(text), exclude=in_use))
+            in_use.add(replica.url)
+            response = await stack.enter_async_context(
+                client.stream("POST", f"{replica.url}/api/tts", json={"text": text})
+            )
+            response.raise_for_status()
+            return stack.pop_all(), replica.url, response
+
+    @staticmethod
+    async def _hedged(
+        text: str,
+        attempt: Callable[[set[str]], Awaitable[T]],
+        discard: Callable[[T], Awaitable[None]] | None = None,
+    ) -> T:
+        """
+        Run ``attempt`` and, if it is still outstanding after the router's hedge
+        delay, a duplicate on another replica; return whichever succeeds first.
+
+        ``attempt`` receives the set of replica URLs already in use so the
+        duplicate avoids them. The loser is cancelled, or passed to ``discard``
+        if it also completed.
+        """
+        router = get_tts_router()
+        in_use: set[str] = set()
+        started = time.monotonic()
+        primary = asyncio.create_task(attempt(in_use))
+        tasks = [primary]
+        winner: asyncio.Task | None = None
+        try:
+            delay = router.hedge_delay(len(text))
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done:
+                    router.stats.hedges_sent += 1
+                    tasks.append(asyncio.create_task(attempt(in_use)))
+                    logger.info("TTS request hedged", extra={"text_length": len(text), "delay_seconds": delay})
+
+            pending = set(tasks)
+            error: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        winner = task
+                        break
+                    error = error or task.exception()
+                if winner is not None:
+                    break
+
+            if winner is None:
+                raise error
+            if winner is not primary:
+                router.stats.hedges_won += 1
+            router.stats.observe(time.monotonic() - started, len(text))
+            return winner.result()
+        finally:
+            losers = [task for task in tasks if task is not winner]
+            for task in losers:
+                task.cancel()
+            for task, outcome in zip(losers, await asyncio.gather(*losers, return_exceptions=True), strict=True):
+                if discard is not None and not task.cancelled() and not isinstance(outcome, BaseException):
+                    await discard(outcome)
+
+
+class StubTTSBackend(TTSBackend):
+    """
+    Deterministic in-process engine for tests, benchmarks and load tests.
+
+    Produces a sine tone whose pitch is derived from the text hash and whose
+    duration is proportional to the text length, so identical input always
+    yields identical bytes. Server behaviour can be simulated with a fixed
+    time-to-first-byte and a processing throughput in characters per second.
+    """
+
+    name = "stub"
+    AMPLITUDE = 8000
+
+    def __init__(
+        self,
+        sample_rate: int = 22050,
+        seconds_per_char: float = 0.06,
+        latency_seconds: float = 0.0,
+        chars_per_second: float = 0.0,
+        chunk_size: int = 64 * 1024,
+    ):
+        self.sample_rate = sample_rate
+        self.seconds_per_char = seconds_per_char
+        self.latency_seconds = latency_seconds
+        self.chars_per_second = chars_per_second
+        self.chunk_size = chunk_size
+
+    @property
+    def model_name(self) -> str:
+        return f"stub:{self.sample_rate}:{self.seconds_per_char}"
+
+    def frame_count(self, text: str) -> int:
+        return max(1, round(len(text) * self.seconds_per_char * self.sample_rate))
+
+    def _wav_header(self, frames: int) -> bytes:
+        data_size = frames * 2
+        return (
+            b"RIFF" + struct.pack("<I", 36 + data_size) + b"WAVE"
+            + b"fmt " + struct.pack("<IHHIIHH", 16, 1, 1, self.sample_rate, self.sample_rate * 2, 2, 16)
+            + b"data" + struct.pack("<I", data_size)
+        )
+
+    async def synthesize_stream(self, text: str) -> AsyncIterator[bytes]:
+        """
+        Yield a WAV file for ``text``: the header first, then PCM frames in chunks.
+
+        Args:
+            text: Text to "synthesize".
+
+        Yields:
+            Chunks of WAV audio bytes of at most ``chunk_size`` bytes after the header.
+        """
+        frames = self.frame_count(text)
+        frequency = 110 + int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:2], "big") % 330
+        processing_seconds = len(text) / self.chars_per_second if self.chars_per_second > 0 else 0.0
+        frames_per_chunk = max(1, self.chunk_size // 2)
+
+        if self.latency_seconds > 0:
+            await asyncio.sleep(self.latency_seconds)
+        yield self._wav_header(frames)
+
+        for start in range(0, frames, frames_per_chunk):
+            count = min(frames_per_chunk, frames - start)
+            if processing_seconds:
+                await asyncio.sleep(processing_seconds * count / frames)
+            phase = 2 * np.pi * frequency * np.arange(start, start + count) / self.sample_rate
+            yield (np.sin(phase) * self.AMPLITUDE).astype("<i2").tobytes()
+
+
+_tts_backend: TTSBackend | None = None
+
+
+def _build_tts_backend(name: str) -> TTSBackend:
+    if name == "stub":
+        return StubTTSBackend(
+            sample_rate=settings.TTS_STUB_SAMPLE_RATE,
+            seconds_per_char=settings.TTS_STUB_SECONDS_PER_CHAR,
+            latency_seconds=settings.TTS_STUB_LATENCY_SECONDS,
+            chars_per_second=settings.TTS_STUB_CHARS_PER_SECOND,
+            chunk_size=settings.TTS_STREAM_CHUNK_SIZE,
+        )
+    return CoquiHTTPBackend()
+
+
+def get_tts_backend() -> TTSBackend:
+    """Return the backend selected by TTS_BACKEND, rebuilding it if the setting changed."""
+    global _tts_backend
+    if _tts_backend is None or _tts_backend.name != settings.TTS_BACKEND:
+        _tts_backend = _build_tts_backend(settings.TTS_BACKEND)
+        logger.info("TTS backend selected", extra={"backend": _tts_backend.name})
+    return _tts_backend
+
+
+class TTSService:
+    """Synthesizes speech with whichever backend is configured via TTS_BACKEND."""
+
+    @staticmethod
+    async def synthesize(text: str) -> bytes:
+        """
+        Convert text to speech.
+
+        Args:
+            text: Text to synthesize.
+
+        Returns:
+            WAV audio bytes.
+        """
+        return await get_tts_backend().synthesize(text)
+
+    @staticmethod
+    def synthesize_stream(text: str) -> AsyncIterator[bytes]:
+        """
+        Convert text to speech, yielding WAV bytes as they are produced.
+
+        Args:
+            text: Text to synthesize.
+
+        Returns:
+            Async iterator over chunks of WAV audio bytes.
+        """
+        return get_tts_backend().synthesize_stream(text)
@@ -0,0 +1,276 @@
+"""Content-addressed cache for synthesized speech, stored in MinIO and indexed in Redis."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import time
+import unicodedata
+from collections.abc import Awaitable, Callable
+
+from minio import S3Error
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from core.config import settings
+from core.minio import MinIOClient, get_minio_client
+from core.redis import get_redis_client
+from services.tts import get_tts_backend
+
+logger = logging.getLogger(__name__)
+
+INDEX_KEY = "tts:cache:index"
+SIZES_KEY = "tts:cache:sizes"
+TOTAL_BYTES_KEY = "tts:cache:bytes"
+HITS_KEY = "tts:cache:hits"
+MISSES_KEY = "tts:cache:misses"
+SAVED_CHARS_KEY = "tts:cache:saved_chars"
+LOCK_KEY_PREFIX = "tts:cache:lock:"
+
+CACHE_ERRORS = (RedisError, S3Error, OSError)
+EVICTION_BATCH_SIZE = 100
+
+
+class TTSAudioCache:
+    """
+    Caches synthesized audio keyed by normalized text plus model/voice identity.
+
+    Audio objects live in a dedicated MinIO bucket; a Redis sorted set scored by
+    last access time is the lookup index and drives least-recently-used eviction.
+    Concurrent misses for the same key are collapsed: in-process through a shared
+    future, across workers through a short-lived Redis lock. Cache failures never
+    fail synthesis; they are logged and the text is synthesized directly.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        minio: MinIOClient,
+        bucket_name: str,
+        max_bytes: int,
+        max_age_seconds: int,
+        lock_timeout_seconds: float,
+        poll_interval_seconds: float = 0.5,
+    ):
+        self._redis = redis
+        self._minio = minio
+        self.bucket_name = bucket_name
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.lock_timeout_seconds = lock_timeout_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self._inflight: dict[str, asyncio.Future[bytes]] = {}
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Canonical form used for hashing: NFKC with collapsed whitespace."""
+        return " ".join(unicodedata.normalize("NFKC", text).split())
+
+    @staticmethod
+    def cache_key(text: str, model_name: str, voice: str) -> str:
+        digest = hashlib.sha256()
+        for part in (model_name, voice, TTSAudioCache.normalize_text(text)):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    @staticmethod
+    def object_name(key: str) -> str:
+        return f"{key[:2]}/{key}.wav"
+
+    async def get_or_synthesize(
+        self,
+        text: str,
+        synthesize: Callable[[str], Awaitable[bytes]],
+    ) -> bytes:
+        """
+        Return cached audio for ``text`` or synthesize, store and return it.
+
+        Args:
+            text: Text to synthesize.
+            synthesize: Coroutine function performing the actual synthesis on a miss.
+
+        Returns:
+            WAV audio bytes.
+        """
+        key = self.cache_key(text, get_tts_backend().model_name, settings.TTS_VOICE)
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future: asyncio.Future[bytes] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            audio = await self._lookup_or_fill(key, text, synthesize)
+        except BaseException as exc:
+            if isinstance(exc, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(exc)
+                future.exception()  # followers re-raise it; avoid "never retrieved" warnings
+            raise
+        else:
+            future.set_result(audio)
+            return audio
+        finally:
+            del self._inflight[key]
+
+    async def stats(self) -> dict:
+        """Hit/miss counters and index size shared by all workers."""
+        hits, misses, saved_chars, total_bytes = await self._redis.mget(
+            HITS_KEY, MISSES_KEY, SAVED_CHARS_KEY, TOTAL_BYTES_KEY
+        )
+        hits, misses = int(hits or 0), int(misses or 0)
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "saved_characters": int(saved_chars or 0),
+            "entries": await self._redis.zcard(INDEX_KEY),
+            "bytes": int(total_bytes or 0),
+        }
+
+    async def _lookup_or_fill(
+        self,
+        key: str,
+        text: str,
+        synthesize: Callable[[str], Awaitable[bytes]],
+    ) -> bytes:
+        audio = await self._safe(self._read(key))
+        if audio is not None:
+            await self._safe(self._record_hit(len(text)))
+            return audio
+
+        lock_key = f"{LOCK_KEY_PREFIX}{key}"
+        has_lock = await self._safe(self._acquire_lock(lock_key))
+        if has_lock is False:
+            # Another worker is synthesizing this key; wait for it to publish.
+            audio = await self._wait_for_fill(key, lock_key)
+            if audio is not None:
+                await self._safe(self._record_hit(len(text)))
+                return audio
+
+        await self._safe(self._redis.incr(MISSES_KEY))
+        try:
+            audio = await synthesize(text)
+            await self._safe(self._store(key, audio))
+        finally:
+            if has_lock:
+                await self._safe(self._redis.delete(lock_key))
+
+        await self._safe(self._evict())
+        return audio
+
+    async def _acquire_lock(self, lock_key: str) -> bool:
+        acquired = await self._redis.set(lock_key, b"1", nx=True, ex=max(1, int(self.lock_timeout_seconds)))
+        return bool(acquired)
+
+    async def _wait_for_fill(self, key: str, lock_key: str) -> bytes | None:
+        deadline = time.monotonic() + self.lock_timeout_seconds
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.poll_interval_seconds)
+            audio = await self._safe(self._read(key))
+            if audio is not None:
+                return audio
+            if not await self._safe(self._redis.exists(lock_key)):
+                return None
+        return None
+
+    async def _read(self, key: str) -> bytes | None:
+        last_access = await self._redis.zscore(INDEX_KEY, key)
+        if last_access is None:
+            return None
+
+        now = time.time()
+        if now - last_access > self.max_age_seconds:
+            await self._remove(key)
+            return None
+
+        try:
+            audio = await asyncio.to_thread(self._download, key)
+        except S3Error:
+            await self._remove(key)
+            return None
+
+        await self._redis.zadd(INDEX_KEY, {key: now})
+        return audio
+
+    def _download(self, key: str) -> bytes:
+        """Fetch a cached segment from MinIO; blocks, so it runs in a thread."""
+        response = self._minio.get_client().get_object(self.bucket_name, self.object_name(key))
+        try:
+            return response.read()
+        finally:
+            response.close()
+            response.release_conn()
+
+    async def _store(self, key: str, audio: bytes) -> None:
+        await self._minio.upload_file(
+            bucket_name=self.bucket_name,
+            object_name=self.object_name(key),
+            file_data=audio,
+            file_size=len(audio),
+            content_type="audio/wav",
+        )
+        previous_size = await self._redis.hget(SIZES_KEY, key)
+        await self._redis.zadd(INDEX_KEY, {key: time.time()})
+        await self._redis.hset(SIZES_KEY, key, len(audio))
+        await self._redis.incrby(TOTAL_BYTES_KEY, len(audio) - int(previous_size or 0))
+
+    async def _record_hit(self, text_length: int) -> None:
+        await self._redis.incr(HITS_KEY)
+        await self._redis.incrby(SAVED_CHARS_KEY, text_length)
+
+    async def _remove(self, key: str) -> None:
+        try:
+            await self._minio.delete_file(self.bucket_name, self.object_name(key))
+        except S3Error:
+            pass
+        size = await self._redis.hget(SIZES_KEY, key)
+        removed = await self._redis.zrem(INDEX_KEY, key)
+        await self._redis.hdel(SIZES_KEY, key)
+        if removed and size is not None:
+            await self._redis.decrby(TOTAL_BYTES_KEY, int(size))
+
+    async def _evict(self) -> None:
+        cutoff = time.time() - self.max_age_seconds
+        for key in await self._redis.zrangebyscore(INDEX_KEY, "-inf", cutoff, start=0, num=EVICTION_BATCH_SIZE):
+            await self._remove(key.decode() if isinstance(key, bytes) else key)
+
+        evicted = 0
+        while int(await self._redis.get(TOTAL_BYTES_KEY) or 0) > self.max_bytes:
+            oldest = await self._redis.zrange(INDEX_KEY, 0, 0)
+            if not oldest or evicted >= EVICTION_BATCH_SIZE:
+                break
+            key = oldest[0]
+            await self._remove(key.decode() if isinstance(key, bytes) else key)
+            evicted += 1
+
+        if evicted:
+            logger.info("TTS cache evicted entries over size budget", extra={"evicted": evicted})
+
+    async def _safe(self, operation: Awaitable):
+        try:
+            return await operation
+        except CACHE_ERRORS as exc:
+            logger.warning("TTS cache operation failed; continuing without cache", extra={"error": str(exc)})
+            return None
+
+
+_tts_cache: TTSAudioCache | None = None
+
+
+def get_tts_cache() -> TTSAudioCache:
+    global _tts_cache
+    if _tts_cache is None:
+        _tts_cache = TTSAudioCache(
+            redis=get_redis_client().get_client(),
+            minio=get_minio_client(),
+            bucket_name=settings.TTS_CACHE_BUCKET,
+            max_bytes=settings.TTS_CACHE_MAX_BYTES,
+            max_age_seconds=settings.TTS_CACHE_MAX_AGE_SECONDS,
+            lock_timeout_seconds=settings.TTS_CACHE_LOCK_TIMEOUT,
+        )
+    return _tts_cache
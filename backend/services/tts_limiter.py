@@ -0,0 +1,292 @@
+"""Adaptive (AIMD) concurrency limit for calls to the TTS farm, shared through Redis."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from enum import Enum
+
+import httpx
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from core.config import settings
+from core.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+LIMIT_KEY = "tts:limiter:limit"
+LEASES_KEY = "tts:limiter:leases"
+DECREASED_AT_KEY = "tts:limiter:decreased_at"
+
+# Leases are a sorted set scored by expiry, so slots held by a killed worker free themselves.
+ACQUIRE_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+local limit = tonumber(redis.call('GET', KEYS[1]) or ARGV[2])
+if redis.call('ZCARD', KEYS[2]) < math.floor(limit) then
+  redis.call('ZADD', KEYS[2], ARGV[3], ARGV[4])
+  return 1
+end
+return 0
+"""
+
+# ARGV: lease, outcome, now, initial, min, max, increase, decrease factor, cooldown
+RELEASE_SCRIPT = """
+redis.call('ZREM', KEYS[2], ARGV[1])
+local limit = tonumber(redis.call('GET', KEYS[1]) or ARGV[4])
+if ARGV[2] == 'increase' then
+  limit = math.min(tonumber(ARGV[6]), limit + tonumber(ARGV[7]) / limit)
+elseif ARGV[2] == 'decrease' then
+  local decreased_at = tonumber(redis.call('GET', KEYS[3]) or '0')
+  if tonumber(ARGV[3]) - decreased_at < tonumber(ARGV[9]) then
+    return tostring(limit)
+  end
+  limit = math.max(tonumber(ARGV[5]), limit * tonumber(ARGV[8]))
+  redis.call('SET', KEYS[3], ARGV[3])
+else
+  return tostring(limit)
+end
+redis.call('SET', KEYS[1], tostring(limit))
+return tostring(limit)
+"""
+
+
+class Outcome(str, Enum):
+    INCREASE = "increase"
+    DECREASE = "decrease"
+    HOLD = "hold"
+
+
+@dataclass(frozen=True, slots=True)
+class AIMDPolicy:
+    """Bounds and step sizes for the concurrency limit."""
+
+    initial_limit: float = 4.0
+    min_limit: float = 1.0
+    max_limit: float = 64.0
+    increase: float = 1.0
+    decrease_factor: float = 0.5
+    latency_target_per_char: float = 0.06
+    decrease_cooldown_seconds: float = 2.0
+
+    def classify(self, elapsed: float | None, text_length: int, error: BaseException | None) -> Outcome:
+        """
+        Turn a finished call into a limit adjustment.
+
+        Timeouts and 5xx responses mean the farm is saturated; a success within
+        the latency target means there is room for more. Anything else (client
+        errors, connection refusals, slow successes) leaves the limit alone.
+        """
+        if error is not None:
+            if isinstance(error, httpx.TimeoutException):
+                return Outcome.DECREASE
+            if isinstance(error, httpx.HTTPStatusError) and error.response.status_code >= 500:
+                return Outcome.DECREASE
+            return Outcome.HOLD
+        if elapsed is not None and elapsed / max(text_length, 1) <= self.latency_target_per_char:
+            return Outcome.INCREASE
+        return Outcome.HOLD
+
+    def adjust(self, limit: float, outcome: Outcome) -> float:
+        if outcome is Outcome.INCREASE:
+            # Roughly +increase per round trip of `limit` concurrent requests.
+            return min(self.max_limit, limit + self.increase / limit)
+        if outcome is Outcome.DECREASE:
+            return max(self.min_limit, limit * self.decrease_factor)
+        return limit
+
+
+class AIMDLimiter:
+    """
+    In-process AIMD concurrency limiter.
+
+    Callers hold a slot for the duration of one TTS request; the number of
+    slots grows additively while requests finish within the latency target and
+    is cut multiplicatively on timeouts and 5xx responses.
+    """
+
+    mode = "local"
+
+    def __init__(self, policy: AIMDPolicy):
+        self.policy = policy
+        self.limit = policy.initial_limit
+        self.in_flight = 0
+        self._decreased_at = 0.0
+        self._condition: asyncio.Condition | None = None
+
+    @asynccontextmanager
+    async def slot(self, text_length: int) -> AsyncIterator[None]:
+        """
+        Hold one concurrency slot while synthesizing ``text_length`` characters.
+
+        The call's latency or error feeds back into the shared limit.
+        """
+        lease = await self.acquire()
+        started = time.monotonic()
+        error: BaseException | None = None
+        try:
+            yield
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            elapsed = None if error is not None else time.monotonic() - started
+            await self.release(lease, self.policy.classify(elapsed, text_length, error))
+
+    async def acquire(self) -> str | None:
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < math.floor(self.limit))
+            self.in_flight += 1
+        return None
+
+    async def release(self, lease: str | None, outcome: Outcome) -> None:
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight -= 1
+            self._apply(outcome)
+            condition.notify_all()
+
+    async def stats(self) -> dict:
+        return {"mode": self.mode, "limit": round(self.limit, 2), "in_flight": self.in_flight}
+
+    def _apply(self, outcome: Outcome) -> None:
+        if outcome is Outcome.DECREASE:
+            now = time.monotonic()
+            if now - self._decreased_at < self.policy.decrease_cooldown_seconds:
+                return
+            self._decreased_at = now
+        previous = self.limit
+        self.limit = self.policy.adjust(self.limit, outcome)
+        if outcome is Outcome.DECREASE and self.limit != previous:
+            logger.info("TTS concurrency limit decreased", extra={"limit": self.limit, "previous": previous})
+
+    def _get_condition(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+
+class RedisAIMDLimiter(AIMDLimiter):
+    """
+    AIMD limiter whose limit and in-flight leases live in Redis, shared by all workers.
+
+    Acquire and release are single Lua scripts, so the check-and-take of a slot
+    is atomic across processes. A held lease is renewed every third of
+    ``lease_ttl_seconds``, so a long streamed response keeps its slot while a
+    killed worker's slot frees itself within one TTL. If Redis is unreachable
+    the limiter degrades to the in-process algorithm instead of blocking
+    synthesis.
+    """
+
+    mode = "redis"
+
+    def __init__(
+        self,
+        policy: AIMDPolicy,
+        redis: Redis,
+        lease_ttl_seconds: float = 30.0,
+        poll_interval_seconds: float = 0.1,
+    ):
+        super().__init__(policy)
+        self._redis = redis
+        self.lease_ttl_seconds = lease_ttl_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self._acquire_script = redis.register_script(ACQUIRE_SCRIPT)
+        self._release_script = redis.register_script(RELEASE_SCRIPT)
+        self._renewals: dict[str, asyncio.Task] = {}
+
+    async def acquire(self) -> str | None:
+        lease = uuid.uuid4().hex
+        while True:
+            now = time.time()
+            try:
+                acquired = await self._acquire_script(
+                    keys=[LIMIT_KEY, LEASES_KEY],
+                    args=[now, self.policy.initial_limit, now + self.lease_ttl_seconds, lease],
+                )
+            except RedisError as exc:
+                logger.warning("TTS limiter unavailable; using in-process limit", extra={"error": str(exc)})
+                return await super().acquire()
+            if acquired:
+                self._renewals[lease] = asyncio.create_task(self._renew(lease))
+                return lease
+            await asyncio.sleep(self.poll_interval_seconds)
+
+    async def _renew(self, lease: str) -> None:
+        while True:
+            await asyncio.sleep(self.lease_ttl_seconds / 3)
+            try:
+                # XX: a lease that already expired is not brought back over the limit.
+                await self._redis.zadd(LEASES_KEY, {lease: time.time() + self.lease_ttl_seconds}, xx=True)
+            except RedisError as exc:
+                logger.warning("Failed to renew TTS limiter lease", extra={"error": str(exc)})
+
+    async def release(self, lease: str | None, outcome: Outcome) -> None:
+        if lease is None:
+            await super().release(lease, outcome)
+            return
+        renewal = self._renewals.pop(lease, None)
+        if renewal is not None:
+            renewal.cancel()
+        policy = self.policy
+        try:
+            await self._release_script(
+                keys=[LIMIT_KEY, LEASES_KEY, DECREASED_AT_KEY],
+                args=[
+                    lease,
+                    outcome.value,
+                    time.time(),
+                    policy.initial_limit,
+                    policy.min_limit,
+                    policy.max_limit,
+                    policy.increase,
+                    policy.decrease_factor,
+                    policy.decrease_cooldown_seconds,
+                ],
+            )
+        except RedisError as exc:
+            # The lease expires on its own after lease_ttl_seconds.
+            logger.warning("Failed to release TTS limiter lease", extra={"error": str(exc)})
+
+    async def stats(self) -> dict:
+        limit = await self._redis.get(LIMIT_KEY)
+        await self._redis.zremrangebyscore(LEASES_KEY, "-inf", time.time())
+        return {
+            "mode": self.mode,
+            "limit": round(float(limit), 2) if limit is not None else self.policy.initial_limit,
+            "in_flight": await self._redis.zcard(LEASES_KEY),
+        }
+
+
+_tts_limiter: AIMDLimiter | None = None
+
+
+def get_tts_limiter() -> AIMDLimiter | None:
+    """Return the configured limiter, or None when TTS_LIMITER_MODE is "off"."""
+    global _tts_limiter
+    if settings.TTS_LIMITER_MODE == "off":
+        return None
+    if _tts_limiter is None or _tts_limiter.mode != settings.TTS_LIMITER_MODE:
+        policy = AIMDPolicy(
+            initial_limit=settings.TTS_LIMITER_INITIAL,
+            min_limit=settings.TTS_LIMITER_MIN,
+            max_limit=settings.TTS_LIMITER_MAX,
+            decrease_factor=settings.TTS_LIMITER_DECREASE_FACTOR,
+            latency_target_per_char=settings.TTS_LIMITER_TARGET_MS_PER_CHAR / 1000,
+            decrease_cooldown_seconds=settings.TTS_LIMITER_DECREASE_COOLDOWN,
+        )
+        if settings.TTS_LIMITER_MODE == "redis":
+            _tts_limiter = RedisAIMDLimiter(
+                policy,
+                redis=get_redis_client().get_client(),
+                lease_ttl_seconds=settings.TTS_LIMITER_LEASE_TTL,
+            )
+        else:
+            _tts_limiter = AIMDLimiter(policy)
+    return _tts_limiter
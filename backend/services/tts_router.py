@@ -0,0 +1,417 @@
+"""Client-side load balancing, circuit breaking and hedging across Coqui TTS replicas."""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import json
+import logging
+import os
+import socket
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import Enum
+
+import httpx
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+REPLICA_METRICS_KEY = "tts:router:replicas"
+REPLICA_METRICS_STALE_SECONDS = 120
+LATENCY_EWMA_ALPHA = 0.2
+LATENCY_MIN_SAMPLES = 5
+HEDGE_MIN_SAMPLES = 20
+HEDGE_WINDOW = 500
+# Upper bounds (seconds) of the request latency histogram. Slower requests land in
+# the last bucket, which the task hard time limit caps at 300s anyway.
+LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+
+
+class TTSUnavailableError(RuntimeError):
+    """Raised without contacting any replica when every replica's circuit is open."""
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass(slots=True)
+class Replica:
+    """Routing state, circuit breaker and counters for one TTS server."""
+
+    url: str
+    state: CircuitState = CircuitState.CLOSED
+    opened_at: float | None = None
+    in_flight_requests: int = 0
+    in_flight_chars: int = 0
+    requests: int = 0
+    failures: int = 0
+    slow_requests: int = 0
+    breaker_opens: int = 0
+    consecutive_failures: int = 0
+    seconds_per_char: float | None = None
+    latency_samples: int = 0
+    last_error: str | None = None
+
+    def snapshot(self) -> dict:
+        return {
+            "url": self.url,
+            "state": self.state.value,
+            "in_flight_requests": self.in_flight_requests,
+            "in_flight_chars": self.in_flight_chars,
+            "requests": self.requests,
+            "failures": self.failures,
+            "slow_requests": self.slow_requests,
+            "breaker_opens": self.breaker_opens,
+            "consecutive_failures": self.consecutive_failures,
+            "ms_per_char": round(self.seconds_per_char * 1000, 3) if self.seconds_per_char is not None else None,
+            "last_error": self.last_error,
+        }
+
+
+@dataclass(slots=True)
+class RequestStats:
+    """Client-observed latency of routed requests, including the effect of hedging."""
+
+    latency_buckets: list[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS))
+    seconds_per_char: deque[float] = field(default_factory=lambda: deque(maxlen=HEDGE_WINDOW))
+    requests: int = 0
+    rejected: int = 0
+    hedges_sent: int = 0
+    hedges_won: int = 0
+
+    def observe(self, elapsed: float, text_length: int) -> None:
+        self.requests += 1
+        self.latency_buckets[min(bisect.bisect_left(LATENCY_BUCKETS, elapsed), len(LATENCY_BUCKETS) - 1)] += 1
+        self.seconds_per_char.append(elapsed / max(text_length, 1))
+
+    def snapshot(self) -> dict:
+        return {
+            "requests": self.requests,
+            "rejected": self.rejected,
+            "hedges_sent": self.hedges_sent,
+            "hedges_won": self.hedges_won,
+            "latency_buckets": list(self.latency_buckets),
+        }
+
+
+class TTSReplicaRouter:
+    """
+    Routes each synthesis request to the replica with the least outstanding work.
+
+    Outstanding work is measured in in-flight characters (or requests), so a
+    replica already busy with a long chapter is not handed another one.
+
+    Each replica has a circuit breaker: consecutive failures or latency spikes
+    open it, and an open replica receives no traffic. After ``open_seconds``,
+    or once a background probe gets an answer from it, the replica goes
+    half-open and a single trial request decides whether it closes again.
+    When every circuit is open, requests fail immediately with
+    ``TTSUnavailableError`` instead of waiting out the HTTP timeout.
+    """
+
+    def __init__(
+        self,
+        urls: list[str],
+        probe_client: Callable[[], httpx.AsyncClient],
+        balance_by: str = "chars",
+        failure_threshold: int = 3,
+        latency_spike_factor: float = 4.0,
+        open_seconds: float = 30.0,
+        probe_interval_seconds: float = 10.0,
+        probe_timeout_seconds: float = 2.0,
+        probe_path: str = "/",
+        hedge_percentile: float | None = None,
+        hedge_min_delay_seconds: float = 1.0,
+        hedge_max_ratio: float = 0.1,
+        redis: Redis | None = None,
+        metrics_interval_seconds: float = 0.0,
+    ):
+        if not urls:
+            raise ValueError("At least one TTS replica URL is required")
+        self.replicas = [Replica(url=url.rstrip("/")) for url in urls]
+        self.balance_by = balance_by
+        self.failure_threshold = failure_threshold
+        self.latency_spike_factor = latency_spike_factor
+        self.open_seconds = open_seconds
+        self.probe_interval_seconds = probe_interval_seconds
+        self.probe_timeout_seconds = probe_timeout_seconds
+        self.probe_path = probe_path
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay_seconds = hedge_min_delay_seconds
+        self.hedge_max_ratio = hedge_max_ratio
+        self.stats = RequestStats()
+        self._probe_client = probe_client
+        self._redis = redis
+        self.metrics_interval_seconds = metrics_interval_seconds
+        self._metrics_published_at = 0.0
+        self._probe_task: asyncio.Task | None = None
+
+    @property
+    def urls(self) -> list[str]:
+        return [replica.url for replica in self.replicas]
+
+    def choose(self, exclude: set[str] | frozenset[str] = frozenset()) -> Replica:
+        """
+        Pick the closed-circuit replica with the least outstanding work.
+
+        A half-open replica with no request in flight comes first, even when
+        closed replicas are available, so a recovered replica gets its trial
+        request and rejoins the rotation.
+
+        Raises:
+            TTSUnavailableError: If no replica outside ``exclude`` can take traffic.
+        """
+        now = time.monotonic()
+        for replica in self.replicas:
+            if replica.state is CircuitState.OPEN and now - replica.opened_at >= self.open_seconds:
+                replica.state = CircuitState.HALF_OPEN
+
+        candidates = [replica for replica in self.replicas if replica.url not in exclude]
+        # A half-open replica gets exactly one trial request at a time.
+        trial = [r for r in candidates if r.state is CircuitState.HALF_OPEN and not r.in_flight_requests]
+        if trial:
+            return trial[0]
+        closed = [replica for replica in candidates if replica.state is CircuitState.CLOSED]
+        if not closed:
+            self.stats.rejected += 1
+            raise TTSUnavailableError("All TTS replicas are unavailable (circuit open)")
+
+        if self.balance_by == "requests":
+            return min(closed, key=lambda r: (r.in_flight_requests, r.in_flight_chars, r.requests))
+        return min(closed, key=lambda r: (r.in_flight_chars, r.in_flight_requests, r.requests))
+
+    @asynccontextmanager
+    async def lease(self, text_length: int, exclude: set[str] | frozenset[str] = frozenset()) -> AsyncIterator[Replica]:
+        """
+        Reserve a replica for one request and record its outcome.
+
+        httpx transport errors, timeouts and 5xx responses count as failures;
+        other exceptions (e.g. 4xx, cancellation of a losing hedge) leave
+        replica health alone.
+
+        Args:
+            text_length: Characters being synthesized; the unit of outstanding work.
+            exclude: Replica URLs not to use, e.g. the one a hedged request is already on.
+
+        Yields:
+            Replica: The replica to send the request to.
+
+        Raises:
+            TTSUnavailableError: If every replica's circuit is open.
+        """
+        replica = self.choose(exclude)
+        replica.in_flight_requests += 1
+        replica.in_flight_chars += text_length
+        replica.requests += 1
+        started = time.monotonic()
+        try:
+            yield replica
+        except httpx.RequestError as exc:
+            self._record_failure(replica, repr(exc))
+            raise
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code >= 500:
+                self._record_failure(replica, f"HTTP {exc.response.status_code}")
+            raise
+        else:
+            self._record_success(replica, time.monotonic() - started, text_length)
+        finally:
+            replica.in_flight_requests -= 1
+            replica.in_flight_chars -= text_length
+            await self._maybe_publish_metrics()
+
+    def hedge_delay(self, text_length: int) -> float | None:
+        """
+        How long to wait on a request before sending a duplicate, or None to not hedge.
+
+        The delay is the configured percentile of recently observed seconds per
+        character, scaled to this request. Hedging is skipped until enough
+        samples exist, when no second replica is available (closed, or
+        half-open and free for its trial request), or when hedges
+        already exceed ``hedge_max_ratio`` of requests.
+        """
+        if self.hedge_percentile is None or len(self.stats.seconds_per_char) < HEDGE_MIN_SAMPLES:
+            return None
+        if sum(1 for replica in self.replicas if self._can_serve(replica)) < 2:
+            return None
+        if self.stats.hedges_sent >= self.hedge_max_ratio * self.stats.requests:
+            return None
+        ordered = sorted(self.stats.seconds_per_char)
+        index = min(len(ordered) - 1, int(len(ordered) * self.hedge_percentile / 100))
+        return max(self.hedge_min_delay_seconds, ordered[index] * max(text_length, 1))
+
+    def snapshot(self) -> list[dict]:
+        return [replica.snapshot() for replica in self.replicas]
+
+    @staticmethod
+    def _can_serve(replica: Replica) -> bool:
+        """Whether ``choose`` could hand ``replica`` a request right now."""
+        return replica.state is CircuitState.CLOSED or (
+            replica.state is CircuitState.HALF_OPEN and not replica.in_flight_requests
+        )
+
+    async def aclose(self) -> None:
+        """Stop the background probe task and withdraw this process's published metrics."""
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            try:
+                await self._probe_task
+            except asyncio.CancelledError:
+                pass
+            self._probe_task = None
+        if self._redis is not None and self._metrics_published_at:
+            self._metrics_published_at = 0.0
+            try:
+                await self._redis.hdel(REPLICA_METRICS_KEY, _metrics_field())
+            except RedisError as exc:
+                logger.warning("Failed to remove TTS replica metrics", extra={"error": str(exc)})
+
+    def _record_success(self, replica: Replica, elapsed: float, text_length: int) -> None:
+        per_char = elapsed / max(text_length, 1)
+        baseline = replica.seconds_per_char
+        is_spike = (
+            baseline is not None
+            and replica.latency_samples >= LATENCY_MIN_SAMPLES
+            and per_char > baseline * self.latency_spike_factor
+        )
+        replica.seconds_per_char = (
+            per_char if baseline is None else baseline + LATENCY_EWMA_ALPHA * (per_char - baseline)
+        )
+        replica.latency_samples += 1
+
+        if is_spike:
+            replica.slow_requests += 1
+            replica.last_error = f"latency spike: {elapsed:.2f}s for {text_length} chars"
+            self._strike(replica)
+        elif replica.state is not CircuitState.CLOSED:
+            self._close(replica)
+        else:
+            replica.consecutive_failures = 0
+
+    def _record_failure(self, replica: Replica, error: str) -> None:
+        replica.failures += 1
+        replica.last_error = error
+        self._strike(replica)
+
+    def _strike(self, replica: Replica) -> None:
+        replica.consecutive_failures += 1
+        if replica.state is CircuitState.HALF_OPEN or (
+            replica.state is CircuitState.CLOSED and replica.consecutive_failures >= self.failure_threshold
+        ):
+            self._open(replica)
+
+    def _open(self, replica: Replica) -> None:
+        replica.state = CircuitState.OPEN
+        replica.opened_at = time.monotonic()
+        replica.breaker_opens += 1
+        logger.warning(
+            "TTS replica circuit opened",
+            extra={"replica": replica.url, "consecutive_failures": replica.consecutive_failures, "error": replica.last_error},
+        )
+        if self._probe_task is None or self._probe_task.done():
+            self._probe_task = asyncio.get_running_loop().create_task(self._probe_open())
+
+    def _close(self, replica: Replica) -> None:
+        replica.state = CircuitState.CLOSED
+        replica.opened_at = None
+        replica.consecutive_failures = 0
+        logger.info("TTS replica circuit closed", extra={"replica": replica.url})
+
+    async def _probe_open(self) -> None:
+        while any(replica.state is CircuitState.OPEN for replica in self.replicas):
+            await asyncio.sleep(self.probe_interval_seconds)
+            client = self._probe_client()
+            for replica in [replica for replica in self.replicas if replica.state is CircuitState.OPEN]:
+                try:
+                    response = await client.get(
+                        f"{replica.url}{self.probe_path}", timeout=self.probe_timeout_seconds
+                    )
+                except httpx.HTTPError as exc:
+                    replica.last_error = f"probe: {exc!r}"
+                    continue
+                if response.status_code < 500 and replica.state is CircuitState.OPEN:
+                    replica.state = CircuitState.HALF_OPEN
+
+    async def _maybe_publish_metrics(self) -> None:
+        if self._redis is None or self.metrics_interval_seconds <= 0:
+            return
+        now = time.monotonic()
+        if now - self._metrics_published_at < self.metrics_interval_seconds:
+            return
+        self._metrics_published_at = now
+        payload = json.dumps(
+            {"updated_at": time.time(), "replicas": self.snapshot(), "requests": self.stats.snapshot()}
+        )
+        try:
+            await self._redis.hset(REPLICA_METRICS_KEY, _metrics_field(), payload)
+        except RedisError as exc:
+            logger.warning("Failed to publish TTS replica metrics", extra={"error": str(exc)})
+
+
+def _metrics_field() -> str:
+    """This process's field in REPLICA_METRICS_KEY."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _bucket_percentile(buckets: list[int], percentile: float) -> float | None:
+    total = sum(buckets)
+    if not total:
+        return None
+    threshold = total * percentile / 100
+    seen = 0
+    for bound, count in zip(LATENCY_BUCKETS, buckets, strict=True):
+        seen += count
+        if seen >= threshold:
+            return bound
+    return LATENCY_BUCKETS[-1]
+
+
+async def collect_replica_metrics(redis: Redis) -> dict:
+    """
+    Aggregate the router snapshots published by workers.
+
+    Snapshots older than REPLICA_METRICS_STALE_SECONDS (workers that exited
+    without removing theirs) are dropped, and deleted from Redis.
+
+    Returns:
+        ``replicas`` keyed by URL, and ``requests`` with hedge/rejection counters
+        and latency percentiles (histogram bucket upper bounds, in seconds).
+    """
+    cutoff = time.time() - REPLICA_METRICS_STALE_SECONDS
+    replicas: dict[str, dict] = {}
+    requests = {"requests": 0, "rejected": 0, "hedges_sent": 0, "hedges_won": 0}
+    latency_buckets = [0] * len(LATENCY_BUCKETS)
+    replica_counters = ("in_flight_requests", "in_flight_chars", "requests", "failures", "slow_requests", "breaker_opens")
+
+    stale = []
+    for worker, raw in (await redis.hgetall(REPLICA_METRICS_KEY)).items():
+        published = json.loads(raw)
+        if published["updated_at"] < cutoff:
+            stale.append(worker)
+            continue
+        for replica in published["replicas"]:
+            entry = replicas.setdefault(
+                replica["url"], {"workers": 0, "workers_open": 0, **dict.fromkeys(replica_counters, 0)}
+            )
+            entry["workers"] += 1
+            entry["workers_open"] += 0 if replica["state"] == CircuitState.CLOSED.value else 1
+            for name in replica_counters:
+                entry[name] += replica[name]
+        worker_requests = published.get("requests")
+        if worker_requests:
+            for name in requests:
+                requests[name] += worker_requests[name]
+            latency_buckets = [a + b for a, b in zip(latency_buckets, worker_requests["latency_buckets"], strict=True)]
+
+    if stale:
+        await redis.hdel(REPLICA_METRICS_KEY, *stale)
+    for percentile in (50, 95, 99):
+        requests[f"p{percentile}_seconds"] = _bucket_percentile(latency_buckets, percentile)
+    return {"replicas": replicas, "requests": requests}
@@ -1,4 +1,5 @@
 from collections.abc import AsyncGenerator, Generator
+from types import SimpleNamespace
 
 import pytest
 import pytest_asyncio
@@ -6,9 +7,15 @@ from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+import services.tts
+import services.tts_limiter
 from api.v1.endpoints.files import router as files_router
+from core.config import settings
 from core.database import Base, get_db_session
 from core.session import sessions
+from services.pdf_page_cache import PdfPageCache
+from services.tts import get_tts_http_client
+from worker.celery_app import celery_app
 
 
 @pytest.fixture
@@ -18,6 +25,89 @@ def app() -> FastAPI:
     return application
 
 
+@pytest.fixture(autouse=True)
+def reset_tts_http_client(monkeypatch: pytest.MonkeyPatch) -> Generator:
+    # The pooled client, the router's probe task and the limiter's condition bind
+    # to the first event loop that uses them; each test runs on its own loop.
+    get_tts_http_client()._client = None
+    services.tts._tts_router = None
+    services.tts_limiter._tts_limiter = None
+    monkeypatch.setattr(settings, "TTS_ROUTER_METRICS_INTERVAL", 0)
+    monkeypatch.setattr(settings, "TTS_LIMITER_MODE", "local")
+    yield
+    get_tts_http_client()._client = None
+    services.tts._tts_router = None
+    services.tts_limiter._tts_limiter = None
+
+
+class FakeSchedulingRedis:
+    """Just enough of redis.asyncio.Redis for worker.scheduling's SET NX keys."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, object] = {}
+
+    async def set(self, key: str, value: object, nx: bool = False, ex: int | None = None) -> bool:
+        if nx and key in self.values:
+            return False
+        self.values[key] = value
+        return True
+
+    async def eval(self, script: str, numkeys: int, key: str, token: str) -> int:
+        # RELEASE_LOCK_SCRIPT: delete only if the caller still owns the key.
+        if self.values.get(key) != token:
+            return 0
+        del self.values[key]
+        return 1
+
+
+@pytest.fixture(autouse=True)
+def tts_queue(monkeypatch: pytest.MonkeyPatch) -> list[dict]:
+    """Capture TTS jobs sent through worker.scheduling instead of publishing them to a broker."""
+    sent: list[dict] = []
+    fake_redis = FakeSchedulingRedis()
+
+    def _send_task(name: str, args=None, **options) -> None:
+        sent.append({"name": name, "args": list(args or []), **options})
+
+    monkeypatch.setattr(celery_app, "send_task", _send_task)
+    monkeypatch.setattr(
+        "worker.scheduling.get_redis_client",
+        lambda: SimpleNamespace(get_client=lambda: fake_redis),
+    )
+    return sent
+
+
+class FakePageCacheRedis:
+    """Just enough of redis.asyncio.Redis for services.pdf_page_cache's hashes."""
+
+    def __init__(self) -> None:
+        self.hashes: dict[str, dict[bytes, bytes]] = {}
+        self.expiries: dict[str, int] = {}
+
+    async def hgetall(self, key: str) -> dict[bytes, bytes]:
+        return dict(self.hashes.get(key, {}))
+
+    async def hset(self, key: str, mapping: dict) -> int:
+        fields = self.hashes.setdefault(key, {})
+        fields.update({str(field).encode(): value for field, value in mapping.items()})
+        return len(mapping)
+
+    async def expire(self, key: str, seconds: int) -> bool:
+        self.expiries[key] = seconds
+        return key in self.hashes
+
+
+@pytest.fixture(autouse=True)
+def pdf_page_cache(monkeypatch: pytest.MonkeyPatch) -> FakePageCacheRedis:
+    """Keep parsed page text in memory instead of Redis; the fake is returned for inspection."""
+    fake_redis = FakePageCacheRedis()
+    monkeypatch.setattr(
+        "services.pdf_page_cache._pdf_page_cache",
+        PdfPageCache(redis=fake_redis, ttl_seconds=settings.PDF_PAGE_CACHE_TTL_SECONDS),
+    )
+    return fake_redis
+
+
 @pytest.fixture
 def session_store() -> Generator:
     sessions.clear()
@@ -0,0 +1,186 @@
+import hashlib
+import io
+import wave
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from services.audio import (
+    AudioDigest,
+    AudioEncodingError,
+    AudioService,
+    WavFormatError,
+    get_audio_format,
+)
+
+
+def _make_wav(frames: bytes, framerate: int = 22050, channels: int = 1) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as writer:
+        writer.setnchannels(channels)
+        writer.setsampwidth(2)
+        writer.setframerate(framerate)
+        writer.writeframes(frames)
+    return buffer.getvalue()
+
+
+def test_concatenate_wav_joins_frames_in_order() -> None:
+    first = io.BytesIO(_make_wav(b"\x01\x00" * 10))
+    second = io.BytesIO(_make_wav(b"\x02\x00" * 5))
+    combined = io.BytesIO()
+
+    AudioService.concatenate_wav([first, second], combined)
+
+    combined.seek(0)
+    with wave.open(combined, "rb") as reader:
+        assert reader.getnframes() == 15
+        assert reader.getframerate() == 22050
+        assert reader.readframes(15) == b"\x01\x00" * 10 + b"\x02\x00" * 5
+
+
+def test_concatenate_wav_copies_large_segments_in_blocks(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("services.audio.COPY_BUFFER_BYTES", 3)
+    source = io.BytesIO(_make_wav(bytes(range(20))))
+    combined = io.BytesIO()
+
+    AudioService.concatenate_wav([source], combined)
+
+    combined.seek(0)
+    with wave.open(combined, "rb") as reader:
+        assert reader.readframes(reader.getnframes()) == bytes(range(20))
+
+
+def test_concatenate_wav_rejects_mismatched_formats() -> None:
+    sources = [io.BytesIO(_make_wav(b"\x00\x00", 22050)), io.BytesIO(_make_wav(b"\x00\x00", 16000))]
+
+    with pytest.raises(WavFormatError):
+        AudioService.concatenate_wav(sources, io.BytesIO())
+
+
+def test_concatenate_wav_rejects_empty_input() -> None:
+    with pytest.raises(WavFormatError):
+        AudioService.concatenate_wav([], io.BytesIO())
+
+
+def _make_stereo_wav(seconds: float, framerate: int = 22050) -> bytes:
+    samples = (np.sin(np.linspace(0, 2 * np.pi * 220 * seconds, int(framerate * seconds))) * 16000).astype("<i2")
+    return _make_wav(np.column_stack([samples, samples]).tobytes(), framerate=framerate, channels=2)
+
+
+@pytest.mark.parametrize("name", ["opus", "mp3", "flac"])
+def test_encode_downmixes_and_resamples(name: str) -> None:
+    source = io.BytesIO(_make_stereo_wav(2.0))
+    encoded = io.BytesIO()
+
+    AudioService.encode(source, encoded, get_audio_format(name), bitrate_kbps=32, sample_rate=24000)
+
+    assert len(encoded.getvalue()) < len(source.getvalue()) / 2
+    encoded.seek(0)
+    with sf.SoundFile(encoded) as reader:
+        assert reader.channels == 1
+        assert reader.samplerate == 24000
+        # MP3 pads with encoder delay; all codecs should land close to two seconds.
+        assert abs(reader.frames / reader.samplerate - 2.0) < 0.1
+
+
+def test_encode_rejects_sample_rate_unsupported_by_codec() -> None:
+    source = io.BytesIO(_make_stereo_wav(0.1))
+
+    with pytest.raises(AudioEncodingError):
+        AudioService.encode(source, io.BytesIO(), get_audio_format("opus"), bitrate_kbps=32, sample_rate=22050)
+
+
+def test_resample_is_continuous_across_blocks(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("services.audio.COPY_BLOCK_FRAMES", 7)
+    ramp = np.arange(100, dtype="<i2") * 100
+    source = io.BytesIO(_make_wav(ramp.tobytes(), framerate=1000))
+    encoded = io.BytesIO()
+
+    AudioService.encode(source, encoded, get_audio_format("wav"), bitrate_kbps=0, sample_rate=2000)
+
+    encoded.seek(0)
+    samples, rate = sf.read(encoded, dtype="int16")
+    assert rate == 2000
+    assert np.all(np.abs(np.diff(samples.astype(int)) - 50) <= 1)
+
+
+def test_unknown_audio_format_is_rejected() -> None:
+    assert get_audio_format(None).content_type == "audio/wav"
+    with pytest.raises(AudioEncodingError):
+        get_audio_format("aac")
+
+
+def test_wav_info_reads_header_only() -> None:
+    wav = _make_wav(b"\x00\x00\x01\x00" * 2205, framerate=22050, channels=2)
+
+    info = AudioService.wav_info(wav[:64], len(wav))
+
+    assert info.duration_seconds == pytest.approx(0.1)
+    assert info.sample_rate == 22050
+    assert info.channels == 2
+
+
+def test_wav_info_measures_streamed_wav_by_file_size() -> None:
+    # Streaming writers leave the data size unset because they do not know it up front.
+    wav = bytearray(_make_wav(b"\x00\x00" * 2400, framerate=24000))
+    data_size_offset = wav.index(b"data") + 4
+    wav[data_size_offset : data_size_offset + 4] = b"\xff\xff\xff\xff"
+
+    info = AudioService.wav_info(bytes(wav[:64]), len(wav))
+
+    assert info.duration_seconds == pytest.approx(0.1)
+
+
+def test_wav_info_rejects_non_wav_header() -> None:
+    with pytest.raises(WavFormatError):
+        AudioService.wav_info(b"OggS" + bytes(60), 1000)
+
+
+def test_audio_digest_hashes_everything_but_keeps_only_the_header(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("services.audio.WAV_HEADER_PROBE_BYTES", 6)
+    digest = AudioDigest()
+
+    digest.update(b"abcd")
+    digest.update(b"efghij")
+
+    assert digest.header == b"abcdef"
+    assert digest.byte_size == 10
+    assert digest.checksum == hashlib.sha256(b"abcdefghij").hexdigest()
+
+
+def test_encode_reports_output_properties() -> None:
+    source = io.BytesIO(_make_wav(b"\x00\x10\x00\xf0" * 11025, framerate=22050, channels=2))
+
+    info = AudioService.encode(source, io.BytesIO(), get_audio_format("opus"), bitrate_kbps=32, sample_rate=48000)
+
+    assert info.sample_rate == 48000
+    assert info.channels == 1
+    assert info.duration_seconds == pytest.approx(0.5, abs=0.001)
+
+
+def test_iter_concatenated_wav_yields_final_header_then_bounded_chunks() -> None:
+    sources = [io.BytesIO(_make_wav(b"\x01\x00" * 10)), io.BytesIO(_make_wav(b"\x02\x00" * 7))]
+
+    chunks = list(AudioService.iter_concatenated_wav(sources, chunk_size=8))
+
+    assert all(len(chunk) <= 8 for chunk in chunks[1:])
+    with wave.open(io.BytesIO(b"".join(chunks)), "rb") as reader:
+        assert reader.getnframes() == 17
+        assert reader.readframes(17) == b"\x01\x00" * 10 + b"\x02\x00" * 7
+
+
+def test_concatenate_wav_skips_extra_chunks_and_trusts_streamed_sizes() -> None:
+    plain = _make_wav(b"\x01\x00" * 4)
+    # Metadata chunk between fmt and data, as some encoders write.
+    with_list = plain[:36] + b"LIST\x04\x00\x00\x00INFO" + plain[36:]
+    with_list = with_list[:4] + (len(with_list) - 8).to_bytes(4, "little") + with_list[8:]
+    streamed = bytearray(_make_wav(b"\x02\x00" * 3))
+    streamed[40:44] = b"\xff\xff\xff\xff"
+    combined = io.BytesIO()
+
+    AudioService.concatenate_wav([io.BytesIO(with_list), io.BytesIO(bytes(streamed))], combined)
+
+    combined.seek(0)
+    with wave.open(combined, "rb") as reader:
+        assert reader.readframes(reader.getnframes()) == b"\x01\x00" * 4 + b"\x02\x00" * 3
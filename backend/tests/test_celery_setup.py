@@ -11,6 +11,9 @@ def test_create_celery_app_uses_redis_broker_and_expected_routes(monkeypatch) ->
     fake_settings = SimpleNamespace(
         CELERY_BROKER_URL="redis://redis:6379/0",
         CELERY_RESULT_BACKEND="redis://redis:6379/0",
+        WORKER_MAX_MEMORY_MB=512,
+        CELERY_TASK_TIME_LIMIT=300,
+        CELERY_TASK_SOFT_TIME_LIMIT=240,
     )
     monkeypatch.setattr("worker.celery_app.settings", fake_settings)
 
@@ -22,6 +25,10 @@ def test_create_celery_app_uses_redis_broker_and_expected_routes(monkeypatch) ->
     assert celery_app.conf.task_default_queue == "tts_default"
     assert celery_app.conf.task_routes["worker.tasks.process_pdf"]["queue"] == "pdf_processing"
     assert celery_app.conf.task_routes["worker.tasks.process_tts"]["queue"] == "tts_processing"
+    assert celery_app.conf.broker_transport_options["queue_order_strategy"] == "priority"
+    assert celery_app.conf.worker_prefetch_multiplier == 1
+    assert celery_app.conf.worker_max_memory_per_child == 512 * 1024
+    assert (celery_app.conf.task_time_limit, celery_app.conf.task_soft_time_limit) == (300, 240)
 
 
 def test_docker_compose_configures_celery_worker_and_redis_broker() -> None:
@@ -47,6 +54,16 @@ def test_docker_compose_configures_celery_worker_and_redis_broker() -> None:
     assert celery_block_match is not None
 
     celery_block = celery_block_match.group("block")
-    assert "command: [\"celery\", \"-A\", \"worker.celery_app:celery_app\", \"worker\", \"--loglevel=info\", \"-Q\", \"pdf_processing,tts_processing,tts_default\"]" in celery_block
+    assert "command: [\"celery\", \"-A\", \"worker.celery_app:celery_app\", \"worker\", \"--loglevel=info\", \"-Q\", \"tts_processing,tts_default\"]" in celery_block
     assert "depends_on:" in celery_block
     assert "redis:" in celery_block
+
+    pdf_block_match = re.search(
+        r"(?ms)^  celery-pdf:\n(?P<block>(?:    .*\n)+)",
+        compose_content,
+    )
+    assert pdf_block_match is not None
+
+    pdf_block = pdf_block_match.group("block")
+    assert "command: [\"celery\", \"-A\", \"worker.celery_app:celery_app\", \"worker\", \"--loglevel=info\", \"--pool\", \"solo\", \"-Q\", \"pdf_processing\"]" in pdf_block
+    assert "redis:" in pdf_block
@@ -7,8 +7,13 @@ Covers:
 - 403 non-owner cannot access a private file's chapter
 - 200 non-owner CAN access a public file's chapter
 - 404 chapter does not exist
-- 409 chapter exists but audio not yet generated
+- 202 chapter exists but audio not yet generated (queued on demand)
+- 503 on-demand synthesis at capacity
+- 204 chapter is ready but has no text to synthesize
 - 404 non-owner DELETE on a public file is denied
+- GET /chapters/{chapter_id}/segments lists published segments and has_more
+- GET /chapters/{chapter_id}/text returns chapter text that file details leave unloaded
+- GET /files/{file_id} selects only the chapter columns it returns
 """
 from __future__ import annotations
 
@@ -19,6 +24,8 @@ import pytest
 import pytest_asyncio
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from unittest.mock import AsyncMock
@@ -28,8 +35,10 @@ from api.v1.endpoints.files import router as files_router
 from core.database import Base, get_db_session
 from core.minio import get_minio_client
 from core.session import SESSION_COOKIE_NAME, sessions
-from models import User, Chapter
+from models import User, Chapter, ChapterAudioSegment
+from models.chapter import ChapterTTSStatus
 from models.file import File, FileStatus, FileVisibility
+from services.files import FileService
 
 
 # ---------------------------------------------------------------------------
@@ -122,6 +131,8 @@ async def _create_chapter(
     file_id: int,
     *,
     with_audio: bool = True,
+    audio_format: str | None = None,
+    tts_status: ChapterTTSStatus = ChapterTTSStatus.PENDING,
 ) -> Chapter:
     async with factory() as session:
         ch = Chapter(
@@ -133,6 +144,8 @@ async def _create_chapter(
             end_page=5,
             audio_bucket_name="completed-files" if with_audio else None,
             audio_object_name=f"{file_id}/1.wav" if with_audio else None,
+            audio_format=audio_format,
+            tts_status=tts_status,
         )
         session.add(ch)
         await session.commit()
@@ -184,6 +197,8 @@ async def test_owner_can_get_audio(
     assert data["chapter_id"] == chapter.id
     assert data["url"] == "http://minio/signed-url"
     assert data["expires_in_seconds"] == 3600
+    assert data["format"] == "wav"
+    assert data["content_type"] == "audio/wav"
 
 
 @pytest.mark.asyncio
@@ -229,6 +244,32 @@ async def test_non_owner_allowed_on_public_file(
     assert response.json()["url"] == "http://minio/public-url"
 
 
+@pytest.mark.asyncio
+async def test_audio_reports_encoded_content_type(
+    app: FastAPI,
+    client: TestClient,
+    async_session_factory: async_sessionmaker[AsyncSession],
+    session_store: dict,
+) -> None:
+    owner = await _create_user(async_session_factory, "owner-opus@example.com")
+    file_ = await _create_file(async_session_factory, owner.id)
+    chapter = await _create_chapter(async_session_factory, file_.id, audio_format="opus")
+
+    _login(client, session_store, owner)
+
+    fake_minio = AsyncMock()
+    fake_minio.generate_presigned_url = AsyncMock(return_value="http://minio/opus-url")
+    app.dependency_overrides[get_minio_client] = lambda: fake_minio
+
+    response = client.get(f"/chapters/{chapter.id}/audio")
+
+    app.dependency_overrides.pop(get_minio_client, None)
+
+    assert response.status_code == 200
+    assert response.json()["format"] == "opus"
+    assert response.json()["content_type"] == "audio/ogg"
+
+
 @pytest.mark.asyncio
 async def test_chapter_not_found(
     client: TestClient,
@@ -247,6 +288,7 @@ async def test_audio_not_yet_generated(
     client: TestClient,
     async_session_factory: async_sessionmaker[AsyncSession],
     session_store: dict,
+    tts_queue: list[dict],
 ) -> None:
     owner = await _create_user(async_session_factory, "owner5@example.com")
     file_ = await _create_file(async_session_factory, owner.id)
@@ -255,7 +297,64 @@ async def test_audio_not_yet_generated(
     _login(client, session_store, owner)
 
     response = client.get(f"/chapters/{chapter.id}/audio")
-    assert response.status_code == 409
+    assert response.status_code == 202
+    assert response.json() == {"chapter_id": chapter.id, "status": "queued", "retry_after_seconds": 5}
+    assert response.headers["Retry-After"] == "5"
+    # The requested chapter jumps the TTS queue.
+    assert [(job["args"], job["priority"]) for job in tts_queue] == [([file_.id, chapter.id], 0)]
+
+
+@pytest.mark.asyncio
+async def test_audio_on_demand_capacity_full(
+    client: TestClient,
+    async_session_factory: async_sessionmaker[AsyncSession],
+    session_store: dict,
+    monkeypatch: pytest.MonkeyPatch,
+    tts_queue: list[dict],
+) -> None:
+    monkeypatch.setattr("worker.scheduling.settings.TTS_ON_DEMAND_MAX_JOBS", 1)
+    owner = await _create_user(async_session_factory, "owner-cap@example.com")
+    file_ = await _create_file(async_session_factory, owner.id)
+    first = await _create_chapter(async_session_factory, file_.id, with_audio=False)
+    second = await _create_chapter(async_session_factory, file_.id, with_audio=False)
+
+    _login(client, session_store, owner)
+
+    assert client.get(f"/chapters/{first.id}/audio").status_code == 202
+    response = client.get(f"/chapters/{second.id}/audio")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
+    assert [job["args"][1] for job in tts_queue] == [first.id]
+
+
+@pytest.mark.asyncio
+async def test_ready_chapter_without_audio_is_not_queued(
+    client: TestClient,
+    app: FastAPI,
+    async_session_factory: async_sessionmaker[AsyncSession],
+    session_store: dict,
+    monkeypatch: pytest.MonkeyPatch,
+    tts_queue: list[dict],
+) -> None:
+    # A blank chapter is READY with no audio; capacity must not matter and nothing is re-queued.
+    monkeypatch.setattr("worker.scheduling.settings.TTS_ON_DEMAND_MAX_JOBS", 0)
+    owner = await _create_user(async_session_factory, "owner-blank@example.com")
+    file_ = await _create_file(async_session_factory, owner.id)
+    chapter = await _create_chapter(
+        async_session_factory, file_.id, with_audio=False, tts_status=ChapterTTSStatus.READY
+    )
+    app.dependency_overrides[get_minio_client] = lambda: AsyncMock()
+
+    _login(client, session_store, owner)
+
+    audio = client.get(f"/chapters/{chapter.id}/audio")
+    assert audio.status_code == 204
+    assert "Retry-After" not in audio.headers
+    segments = client.get(f"/chapters/{chapter.id}/segments").json()
+    assert segments["status"] == "ready"
+    assert segments["segments"] == []
+    assert segments["has_more"] is False
+    assert tts_queue == []
 
 
 @pytest.mark.asyncio
@@ -272,3 +371,173 @@ async def test_non_owner_cannot_delete_public_file(
 
     response = client.delete(f"/files/{file_.id}")
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_segments_lists_published_segments_while_synthesis_runs(
+    client: TestClient,
+    app: FastAPI,
+    async_session_factory: async_sessionmaker[AsyncSession],
+    session_store: dict,
+) -> None:
+    owner = await _create_user(async_session_factory, "owner-seg@example.com")
+    file_ = await _create_file(async_session_factory, owner.id)
+    chapter = await _create_chapter(async_session_factory, file_.id, with_audio=False)
+    async with async_session_factory() as session:
+        persisted = await session.get(Chapter, chapter.id)
+        persisted.segment_count = 3
+        for index in (1, 0):
+            session.add(
+                ChapterAudioSegment(
+                    chapter_id=chapter.id,
+                    segment_index=index,
+                    bucket_name="completed-files",
+                    object_name=f"seg/{index}.opus",
+                    audio_format="opus",
+                    byte_size=100 + index,
+                )
+            )
+        await session.commit()
+
+    mock_minio = AsyncMock()
+    mock_minio.generate_presigned_url = AsyncMock(side_effect=lambda **kw: f"https://minio/{kw['object_name']}")
+    app.dependency_overrides[get_minio_client] = lambda: mock_minio
+    _login(client, session_store, owner)
+
+    response = client.get(f"/chapters/{chapter.id}/segments")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [segment["url"] for segment in body["segments"]] == ["https://minio/seg/0.opus", "https://minio/seg/1.opus"]
+    assert body["segments"][0]["content_type"] == "audio/ogg"
+    assert body["segment_count"] == 3
+    assert body["has_more"] is True
+
+
+@pytest.mark.asyncio
+async def test_segments_falls_back_to_whole_chapter_audio(
+    client: TestClient,
+    app: FastAPI,
+    async_session_factory: async_sessionmaker[AsyncSession],
+    session_store: dict,
+) -> None:
+    owner = await _create_user(async_session_factory, "owner-seg2@example.com")
+    file_ = await _create_file(async_session_factory, owner.id)
+    chapter = await _create_chapter(async_session_factory, file_.id)
+
+    mock_minio = AsyncMock()
+    mock_minio.generate_presigned_url = AsyncMock(return_value="https://minio/chapter.wav")
+    app.dependency_overrides[get_minio_client] = lambda: mock_minio
+    _login(client, session_store, owner)
+
+    body = client.get(f"/chapters/{chapter.id}/segments").json()
+
+    assert [segment["url"] for segment in body["segments"]] == ["https://minio/chapter.wav"]
+    assert body["segment_count"] == 1
+    assert body["has_more"] is False
+
+
+@pytest.mark.asyncio
+async def test_segments_blocked_for_non_owner_on_private_file(
+    client: TestClient,
+    async_session_factory: async_sessionmaker[AsyncSession],
+    session_store: dict,
+) -> None:
+    owner = await _create_user(async_session_factory, "owner-seg3@example.com")
+    other = await _create_user(async_session_factory, "other-seg3@example.com")
+    file_ = await _create_file(async_session_factory, owner.id)
+    chapter = await _create_chapter(async_session_factory, file_.id, with_audio=False)
+
+    _login(client, session_store, other)
+
+    assert client.get(f"/chapters/{chapter.id}/segments").status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_text_returns_chapter_content(
+    client: TestClient,
+    async_session_factory: async_sessionmaker[AsyncSession],
+    session_store: dict,
+) -> None:
+    owner = await _create_user(async_session_factory, "text-owner@example.com")
+    file_ = await _create_file(async_session_factory, owner.id, FileVisibility.PRIVATE)
+    chapter = await _create_chapter(async_session_factory, file_.id)
+
+    _login(client, session_store, owner)
+
+    response = client.get(f"/chapters/{chapter.id}/text")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "chapter_id": chapter.id,
+        "chapter_index": 1,
+        "title": "Chapter 1",
+        "content": "Some text.",
+    }
+
+
+@pytest.mark.asyncio
+async def test_text_blocked_for_non_owner_on_private_file(
+    client: TestClient,
+    async_session_factory: async_sessionmaker[AsyncSession],
+    session_store: dict,
+) -> None:
+    owner = await _create_user(async_session_factory, "text-owner2@example.com")
+    other = await _create_user(async_session_factory, "text-other2@example.com")
+    file_ = await _create_file(async_session_factory, owner.id, FileVisibility.PRIVATE)
+    chapter = await _create_chapter(async_session_factory, file_.id)
+
+    _login(client, session_store, other)
+
+    response = client.get(f"/chapters/{chapter.id}/text")
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_file_queries_leave_chapter_text_unloaded(
+    async_session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    owner = await _create_user(async_session_factory, "text-owner3@example.com")
+    file_ = await _create_file(async_session_factory, owner.id, FileVisibility.PRIVATE)
+    await _create_chapter(async_session_factory, file_.id)
+
+    async with async_session_factory() as session:
+        [listed] = await FileService.get_user_files(session, owner.id)
+        detailed = await FileService.get_file_by_id(session, file_.id, owner.id)
+
+        for file_record in (listed, detailed):
+            [chapter] = file_record.chapters
+            assert chapter.title == "Chapter 1"
+            with pytest.raises(InvalidRequestError):
+                _ = chapter.content
+            with pytest.raises(InvalidRequestError):
+                _ = chapter.tts_on_demand
+
+
+@pytest.mark.asyncio
+async def test_file_details_select_only_listed_chapter_columns(
+    client: TestClient,
+    async_session_factory: async_sessionmaker[AsyncSession],
+    session_store: dict,
+) -> None:
+    owner = await _create_user(async_session_factory, "text-owner4@example.com")
+    file_ = await _create_file(async_session_factory, owner.id, FileVisibility.PRIVATE)
+    chapter = await _create_chapter(async_session_factory, file_.id)
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = async_session_factory.kw["bind"].sync_engine
+    event.listen(engine, "before_cursor_execute", _record)
+    _login(client, session_store, owner)
+    try:
+        response = client.get(f"/files/{file_.id}")
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+    assert response.status_code == 200
+    assert [c["id"] for c in response.json()["chapters"]] == [chapter.id]
+    [chapter_select] = [s for s in statements if s.lstrip().startswith("SELECT") and "FROM chapters" in s]
+    assert "chapters.content" not in chapter_select
+    assert "chapters.tts_on_demand" not in chapter_select
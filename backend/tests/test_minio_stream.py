@@ -0,0 +1,77 @@
+"""Tests for streaming multipart uploads through MinIOClient.upload_stream."""
+from __future__ import annotations
+
+import pytest
+
+from core.minio import MinIOClient
+
+
+class FakeMinio:
+    def __init__(self) -> None:
+        self.parts: list[bytes] = []
+        self.put_kwargs: dict = {}
+
+    def bucket_exists(self, bucket_name: str) -> bool:
+        return True
+
+    def put_object(self, data, part_size: int, **kwargs):
+        self.put_kwargs = {"part_size": part_size, **kwargs}
+        while part := data.read(part_size):
+            self.parts.append(part)
+
+
+@pytest.mark.asyncio
+async def test_upload_stream_reads_async_chunks_part_by_part(monkeypatch: pytest.MonkeyPatch) -> None:
+    fake = FakeMinio()
+    client = MinIOClient()
+    monkeypatch.setattr(client, "get_client", lambda: fake)
+    produced: list[int] = []
+
+    async def chunks():
+        for index in range(10):
+            produced.append(index)
+            yield bytes([index]) * 3
+
+    uploaded = await client.upload_stream(
+        bucket_name="completed-files",
+        object_name="chapter.wav",
+        chunks=chunks(),
+        content_type="audio/wav",
+        part_size=8,
+        num_parallel_uploads=2,
+    )
+
+    assert uploaded == 30
+    assert [len(part) for part in fake.parts] == [8, 8, 8, 6]
+    assert b"".join(fake.parts) == b"".join(bytes([index]) * 3 for index in range(10))
+    assert fake.put_kwargs["length"] == -1
+    assert fake.put_kwargs["num_parallel_uploads"] == 2
+    assert fake.put_kwargs["content_type"] == "audio/wav"
+
+
+@pytest.mark.asyncio
+async def test_upload_stream_propagates_stream_errors_and_closes_stream(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fake = FakeMinio()
+    client = MinIOClient()
+    monkeypatch.setattr(client, "get_client", lambda: fake)
+    closed = False
+
+    async def failing_chunks():
+        nonlocal closed
+        try:
+            yield b"partial"
+            raise RuntimeError("tts connection dropped")
+        finally:
+            closed = True
+
+    with pytest.raises(RuntimeError, match="tts connection dropped"):
+        await client.upload_stream(
+            bucket_name="completed-files",
+            object_name="chapter.wav",
+            chunks=failing_chunks(),
+            part_size=4,
+        )
+
+    assert closed
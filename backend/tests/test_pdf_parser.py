@@ -1,19 +1,56 @@
+import asyncio
+import threading
+from contextlib import aclosing
+from pathlib import Path
 from types import SimpleNamespace
 
+import billiard
+import numpy as np
 import pytest
+from pdfminer.pdfdocument import PDFNoOutlines
+from pdfminer.pdftypes import PDFObjRef
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from benchmarks.synthetic_pdf import build_pdf
 from models import User
 from models.chapter import Chapter
 from models.file import File, FileStatus
-from services.pdf_parser import PdfParsingService
+from services.heading_classifier import FontHeadingClassifier
+from services.pdf_engines import (
+    OutlineEntry,
+    PageGlyphs,
+    PdfEngineError,
+    _PdfiumPdf,
+    _PdfplumberPdf,
+    get_pdf_engine,
+)
+from services.pdf_page_cache import (
+    PdfPageCache,
+    decode_page,
+    encode_page,
+    is_cached_page,
+)
+from services.pdf_parser import (
+    READY_BATCH_AHEAD,
+    PdfParseDeadline,
+    PdfParsingService,
+    StoredChapter,
+    _page_ranges,
+    _ready_batches,
+    shutdown_pdf_extraction_pool,
+)
+
+
+def _no_outlines():
+    raise PDFNoOutlines
 
 
 class FakePdfContext:
     def __init__(self, metadata: dict, pages: list[str]) -> None:
         self.metadata = metadata
-        self.pages = [SimpleNamespace(extract_text=lambda text=text: text) for text in pages]
+        self.pages = [SimpleNamespace(extract_text=lambda text=text: text, close=lambda: None) for text in pages]
+        self.doc = SimpleNamespace(get_outlines=_no_outlines)
 
     def __enter__(self):
         return self
@@ -32,7 +69,7 @@ async def test_extract_document_detects_metadata_and_chapters(monkeypatch: pytes
         ],
     )
 
-    monkeypatch.setattr("services.pdf_parser.pdfplumber.open", lambda _: fake_pdf)
+    monkeypatch.setattr("services.pdf_engines.pdfplumber.open", lambda _: fake_pdf)
 
     parsed = PdfParsingService.extract_document(b"fake")
 
@@ -56,7 +93,7 @@ async def test_parse_and_store_saves_chapters(
         ],
     )
 
-    monkeypatch.setattr("services.pdf_parser.pdfplumber.open", lambda _: fake_pdf)
+    monkeypatch.setattr("services.pdf_engines.pdfplumber.open", lambda _: fake_pdf)
 
     async with async_session_factory() as session:
         user = User(email="parser@example.com", hashed_password="hash", is_active=True)
@@ -80,7 +117,7 @@ async def test_parse_and_store_saves_chapters(
         chapter_count = await PdfParsingService.parse_and_store(
             db=session,
             file_record=file_record,
-            pdf_bytes=b"fake",
+            source=b"fake",
         )
 
         assert chapter_count == 2
@@ -99,6 +136,119 @@ async def test_parse_and_store_saves_chapters(
         assert file_record.parsed_author == "Stored Author"
 
 
+@pytest.mark.asyncio
+async def test_parse_and_store_hands_over_each_chapter_before_parsing_the_next(
+    monkeypatch: pytest.MonkeyPatch,
+    async_session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    pages_read: list[int] = []
+    first_chapter_handed_over = threading.Event()
+
+    def _page(number: int, text: str, wait: threading.Event | None = None) -> SimpleNamespace:
+        def extract_text() -> str:
+            # The last page is only read once chapter 1 is out, which must not wait for more chapters.
+            if wait is not None:
+                assert wait.wait(timeout=5)
+            pages_read.append(number)
+            return text
+
+        return SimpleNamespace(extract_text=extract_text, close=lambda: None)
+
+    fake_pdf = FakePdfContext(metadata={}, pages=[])
+    fake_pdf.pages = [
+        _page(1, "Chapter 1 First\nAlpha text."),
+        _page(2, "More alpha."),
+        _page(3, "Chapter 2 Second\nBeta text."),
+        _page(4, "More beta.", wait=first_chapter_handed_over),
+    ]
+    monkeypatch.setattr("services.pdf_engines.pdfplumber.open", lambda _: fake_pdf)
+
+    async with async_session_factory() as session:
+        user = User(email="parser-stream@example.com", hashed_password="hash", is_active=True)
+        session.add(user)
+        await session.commit()
+        file_record = File(
+            user_id=user.id,
+            original_filename="stream.pdf",
+            stored_filename="stream_stored.pdf",
+            file_size=1234,
+            mime_type="application/pdf",
+            bucket_name="raw-pdf-uploads",
+            status=FileStatus.PROCESSING,
+        )
+        session.add(file_record)
+        await session.commit()
+
+        handed_over = []
+
+        async def on_chapters(chapters: list[StoredChapter]) -> None:
+            async with async_session_factory() as other_session:
+                for chapter in chapters:
+                    stored = await other_session.get(Chapter, chapter.id)
+                    handed_over.append((chapter.chapter_index, stored.end_page, list(pages_read)))
+            first_chapter_handed_over.set()
+
+        chapter_count = await PdfParsingService.parse_and_store(
+            db=session,
+            file_record=file_record,
+            source=b"fake",
+            on_chapters=on_chapters,
+        )
+
+    assert chapter_count == 2
+    # Chapter 1 is committed, and visible to other sessions, once page 3 starts chapter 2.
+    assert handed_over == [(1, 2, [1, 2, 3]), (2, 4, [1, 2, 3, 4])]
+
+
+@pytest.mark.asyncio
+async def test_extract_document_normalizes_chapter_text(monkeypatch: pytest.MonkeyPatch) -> None:
+    fake_pdf = FakePdfContext(
+        metadata={},
+        pages=[
+            "Chapter 1 Introduction\nThe infor-\nmation is at https://example.com [2].",
+            "17\nIt has 3 parts.",
+        ],
+    )
+
+    monkeypatch.setattr("services.pdf_engines.pdfplumber.open", lambda _: fake_pdf)
+
+    parsed = PdfParsingService.extract_document(b"fake")
+
+    chapter = parsed.chapters[0]
+    assert chapter.title == "Chapter 1 Introduction"
+    assert chapter.content == "Chapter 1 Introduction\nThe information is at.\nIt has 3 parts."
+    assert chapter.chars_removed > 0
+
+
+def test_extract_document_drops_chapters_left_empty_by_normalization(monkeypatch: pytest.MonkeyPatch) -> None:
+    fake_pdf = FakePdfContext(
+        metadata={},
+        pages=["Chapter 1 Introduction\nOpening text.", "PAGE 12", "Chapter 2 Results\nClosing text."],
+    )
+
+    monkeypatch.setattr("services.pdf_engines.pdfplumber.open", lambda _: fake_pdf)
+
+    parsed = PdfParsingService.extract_document(b"fake")
+
+    assert [(c.chapter_index, c.title, c.start_page) for c in parsed.chapters] == [
+        (1, "Chapter 1 Introduction", 1),
+        (2, "Chapter 2 Results", 3),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_extract_document_skips_normalization_when_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    fake_pdf = FakePdfContext(metadata={}, pages=["Chapter 1 Introduction\nIt has 3 parts."])
+
+    monkeypatch.setattr("services.pdf_engines.pdfplumber.open", lambda _: fake_pdf)
+    monkeypatch.setattr("services.pdf_parser.settings.TEXT_NORMALIZATION_RULES", "")
+
+    parsed = PdfParsingService.extract_document(b"fake")
+
+    assert parsed.chapters[0].content == "Chapter 1 Introduction\nIt has 3 parts."
+    assert parsed.chapters[0].chars_removed == 0
+
+
 @pytest.mark.asyncio
 async def test_extract_document_falls_back_when_no_headings(monkeypatch: pytest.MonkeyPatch) -> None:
     fake_pdf = FakePdfContext(
@@ -109,7 +259,7 @@ async def test_extract_document_falls_back_when_no_headings(monkeypatch: pytest.
         ],
     )
 
-    monkeypatch.setattr("services.pdf_parser.pdfplumber.open", lambda _: fake_pdf)
+    monkeypatch.setattr("services.pdf_engines.pdfplumber.open", lambda _: fake_pdf)
 
     parsed = PdfParsingService.extract_document(b"fake", fallback_title="fallback.pdf")
 
@@ -122,6 +272,399 @@ async def test_extract_document_falls_back_when_no_headings(monkeypatch: pytest.
     assert "no explicit chapter headings" in parsed.chapters[0].content
 
 
+def test_extract_document_follows_outline_and_skips_front_matter(monkeypatch: pytest.MonkeyPatch) -> None:
+    pages_read: list[int] = []
+
+    def _page(number: int, text: str) -> SimpleNamespace:
+        def extract_text() -> str:
+            pages_read.append(number)
+            return text
+
+        return SimpleNamespace(extract_text=extract_text, close=lambda: None, page_obj=SimpleNamespace(pageid=100 + number))
+
+    fake_pdf = FakePdfContext(metadata={"Title": "Book"}, pages=[])
+    fake_pdf.pages = [
+        _page(1, "CONTENTS\nCHAPTER ONE 2\nCHAPTER TWO 3"),
+        _page(2, "Chapter One\nAlpha text."),
+        _page(3, "Alpha continues.\nChapter Two\nBeta text."),
+    ]
+    fake_pdf.doc = SimpleNamespace(
+        get_outlines=lambda: iter([
+            (1, "Chapter One", [PDFObjRef(None, 102)], None, None),
+            (1, "Chapter Two", [PDFObjRef(None, 103)], None, None),
+        ])
+    )
+    monkeypatch.setattr("services.pdf_engines.pdfplumber.open", lambda _: fake_pdf)
+    monkeypatch.setattr("services.pdf_parser.settings.TEXT_NORMALIZATION_RULES", "")
+
+    stream = PdfParsingService.stream_document(b"fake")
+    chapters = list(stream)
+
+    assert stream.chapter_source == "outline"
+    assert [(c.title, c.start_page, c.end_page, c.content) for c in chapters] == [
+        ("Chapter One", 2, 3, "Chapter One\nAlpha text.\nAlpha continues."),
+        ("Chapter Two", 3, 3, "Chapter Two\nBeta text."),
+    ]
+    assert pages_read == [2, 3]
+
+
+def test_outline_chapters_use_shallowest_level_with_several_entries() -> None:
+    outline = [
+        OutlineEntry("The Book", 0, 0),
+        OutlineEntry("One", 1, 1),
+        OutlineEntry("One, part a", 2, 2),
+        OutlineEntry("Two", 5, 1),
+    ]
+
+    assert [entry.title for entry in PdfParsingService._outline_chapters(outline)] == ["One", "Two"]
+    assert PdfParsingService._outline_chapters([OutlineEntry("B", 4, 0), OutlineEntry("A", 1, 0)]) == []
+
+
+@pytest.mark.parametrize("engine", ["pdfplumber", "pdfium"])
+def test_outline_and_heading_chapters_agree_on_synthetic_book(engine: str) -> None:
+    outlined = PdfParsingService.stream_document(
+        build_pdf(6, lines_per_page=8, pages_per_chapter=2, outline=True), engine=engine
+    )
+    headings = PdfParsingService.extract_document(build_pdf(6, lines_per_page=8, pages_per_chapter=2), engine=engine)
+
+    assert list(outlined) == headings.chapters
+    assert outlined.chapter_source == "outline"
+
+
+@pytest.mark.parametrize("engine", ["pdfplumber", "pdfminer"])
+def test_font_heading_detection_ignores_heading_like_body_lines(
+    monkeypatch: pytest.MonkeyPatch, engine: str
+) -> None:
+    pdf_bytes = build_pdf(6, lines_per_page=8, pages_per_chapter=2, heading_size=16, decoy_lines=2)
+    monkeypatch.setattr("services.pdf_parser.settings.PDF_HEADING_DETECTION", "text")
+    by_text = PdfParsingService.extract_document(pdf_bytes, engine=engine)
+    monkeypatch.setattr("services.pdf_parser.settings.PDF_HEADING_DETECTION", "font")
+    by_font = PdfParsingService.extract_document(pdf_bytes, engine=engine)
+
+    assert len(by_text.chapters) > 3
+    assert [(c.title.split()[:2], c.start_page) for c in by_font.chapters] == [
+        (["Chapter", "1"], 1),
+        (["Chapter", "2"], 3),
+        (["Chapter", "3"], 5),
+    ]
+
+    monkeypatch.setattr("services.pdf_parser.settings.PDF_HEADING_MAX_PAGE_CHARS", 10)
+    assert PdfParsingService.extract_document(pdf_bytes, engine=engine) == by_text
+
+
+def test_font_classifier_flags_larger_and_bold_lines() -> None:
+    lines = ["Part One", "The Beginning", "Body text that runs on.", "Bold aside", "More body text here."]
+    chars = [(18.0, "Times-Bold"), (18.0, "Times-Bold"), (11.0, "Times"), (11.0, "Times-Bold"), (11.0, "Times")]
+    counts = [len(line) for line in lines]
+    page = PageGlyphs(
+        lines=lines,
+        char_lines=np.repeat(np.arange(len(lines)), counts),
+        char_sizes=np.repeat([size for size, _ in chars], counts).astype(np.float32),
+        char_fonts=np.repeat(np.array([font for _, font in chars], dtype=object), counts),
+    )
+
+    assert FontHeadingClassifier.classify(page, size_ratio=1.2) == [True, True, False, True, False]
+    assert FontHeadingClassifier.classify(PageGlyphs(lines=lines), size_ratio=1.2) is None
+
+
+@pytest.mark.asyncio
+async def test_parse_resumes_after_deadline_from_cached_pages(
+    monkeypatch: pytest.MonkeyPatch,
+    async_session_factory: async_sessionmaker[AsyncSession],
+    pdf_page_cache,
+) -> None:
+    pages_read: list[int] = []
+    real_iter_page_texts = _PdfiumPdf.iter_page_texts
+
+    def _tracking_iter_page_texts(self, start=0, stop=None):
+        for offset, text in enumerate(real_iter_page_texts(self, start, stop)):
+            pages_read.append(start + offset + 1)
+            yield text
+
+    monkeypatch.setattr(_PdfiumPdf, "iter_page_texts", _tracking_iter_page_texts)
+    pdf_bytes = build_pdf(6, lines_per_page=8, pages_per_chapter=2)
+
+    async with async_session_factory() as session:
+        user = User(email="parser-resume@example.com", hashed_password="hash", is_active=True)
+        session.add(user)
+        await session.commit()
+        file_record = File(
+            user_id=user.id,
+            original_filename="resume.pdf",
+            stored_filename="resume_stored.pdf",
+            file_size=len(pdf_bytes),
+            mime_type="application/pdf",
+            bucket_name="raw-pdf-uploads",
+            status=FileStatus.PROCESSING,
+            extract_engine="pdfium",
+        )
+        session.add(file_record)
+        await session.commit()
+
+        # Time runs out after three pages: chapter 1 (pages 1-2) is stored and page 3 is cached.
+        clock = iter([0.0, 0.0])
+        monkeypatch.setattr("services.pdf_parser.time", SimpleNamespace(monotonic=lambda: next(clock, 10.0)))
+        with pytest.raises(PdfParseDeadline) as checkpoint:
+            await PdfParsingService.parse_and_store(db=session, file_record=file_record, source=pdf_bytes, deadline=5.0)
+        assert checkpoint.value.chapters_stored == 1
+        assert pages_read == [1, 2, 3]
+        first_chapter_id = (await session.execute(select(Chapter.id))).scalar_one()
+
+        pages_read.clear()
+        chapter_count = await PdfParsingService.parse_and_store(
+            db=session,
+            file_record=file_record,
+            source=pdf_bytes,
+            resume_from=checkpoint.value.chapters_stored,
+        )
+        chapters = (await session.execute(select(Chapter).order_by(Chapter.chapter_index))).scalars().all()
+
+    assert chapter_count == 3
+    assert pages_read == [4, 5, 6]
+    assert [(c.chapter_index, c.start_page) for c in chapters] == [(1, 1), (2, 3), (3, 5)]
+    assert chapters[0].id == first_chapter_id
+    assert [len(fields) for fields in pdf_page_cache.hashes.values()] == [6]
+
+
+@pytest.mark.asyncio
+async def test_font_heading_parse_resumes_twice_from_cached_glyphs(
+    monkeypatch: pytest.MonkeyPatch,
+    async_session_factory: async_sessionmaker[AsyncSession],
+    pdf_page_cache,
+) -> None:
+    pages_read: list[int] = []
+    real_iter_page_glyphs = _PdfplumberPdf.iter_page_glyphs
+
+    def _tracking_iter_page_glyphs(self, start=0, stop=None, max_chars=0):
+        for offset, page in enumerate(real_iter_page_glyphs(self, start, stop, max_chars)):
+            pages_read.append(start + offset + 1)
+            yield page
+
+    monkeypatch.setattr("services.pdf_parser.settings.PDF_HEADING_DETECTION", "font")
+    pdf_bytes = build_pdf(6, lines_per_page=8, pages_per_chapter=2, heading_size=16, decoy_lines=2)
+    expected = PdfParsingService.extract_document(pdf_bytes, engine="pdfplumber").chapters
+    monkeypatch.setattr(_PdfplumberPdf, "iter_page_glyphs", _tracking_iter_page_glyphs)
+
+    async with async_session_factory() as session:
+        user = User(email="parser-font-resume@example.com", hashed_password="hash", is_active=True)
+        session.add(user)
+        await session.commit()
+        file_record = File(
+            user_id=user.id,
+            original_filename="resume.pdf",
+            stored_filename="resume_stored.pdf",
+            file_size=len(pdf_bytes),
+            mime_type="application/pdf",
+            bucket_name="raw-pdf-uploads",
+            status=FileStatus.PROCESSING,
+            extract_engine="pdfplumber",
+        )
+        session.add(file_record)
+        await session.commit()
+
+        # Each run extracts two new pages; chapter 1 only closes at page 3, in the second run.
+        resume_from = 0
+        for new_pages, chapters_stored in [([1, 2], 0), ([3, 4], 1)]:
+            pages_read.clear()
+            clock = iter([0.0])
+            monkeypatch.setattr(
+                "services.pdf_parser.time", SimpleNamespace(monotonic=lambda clock=clock: next(clock, 10.0))
+            )
+            with pytest.raises(PdfParseDeadline) as checkpoint:
+                await PdfParsingService.parse_and_store(
+                    db=session, file_record=file_record, source=pdf_bytes, resume_from=resume_from, deadline=5.0
+                )
+            assert pages_read == new_pages
+            assert checkpoint.value.chapters_stored == chapters_stored
+            resume_from = checkpoint.value.chapters_stored
+
+        pages_read.clear()
+        chapter_count = await PdfParsingService.parse_and_store(
+            db=session, file_record=file_record, source=pdf_bytes, resume_from=resume_from
+        )
+        stored = await session.execute(
+            select(Chapter.title, Chapter.content, Chapter.start_page).order_by(Chapter.chapter_index)
+        )
+
+    assert chapter_count == 3
+    assert pages_read == [5, 6]
+    assert [tuple(row) for row in stored] == [(c.title, c.content, c.start_page) for c in expected]
+    [(key, fields)] = pdf_page_cache.hashes.items()
+    assert key.endswith(":glyphs20000") and len(fields) == 6
+
+
+def test_cached_glyphs_round_trip() -> None:
+    lines = ["Chapter 1", "Body text"]
+    counts = [len(line) for line in lines]
+    page = PageGlyphs(
+        lines=lines,
+        char_lines=np.repeat(np.arange(len(lines)), counts),
+        char_sizes=np.repeat(np.array([16.0, 11.5], dtype=np.float32), counts),
+        char_fonts=np.repeat(np.array(["Helvetica-Bold", "Helvetica"], dtype=object), counts),
+    )
+
+    decoded = decode_page(encode_page(page))
+
+    assert decoded.lines == page.lines
+    for name in ("char_lines", "char_sizes", "char_fonts"):
+        assert np.array_equal(getattr(decoded, name), getattr(page, name))
+    assert decoded.char_sizes.dtype == np.float32
+    assert decode_page(encode_page(PageGlyphs(lines=lines))) == PageGlyphs(lines=lines)
+    assert decode_page(encode_page("Plain text")) == "Plain text"
+    assert not is_cached_page(encode_page(page), glyphs=False)
+
+
+@pytest.mark.asyncio
+async def test_ready_batches_group_only_items_already_produced(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Room for every item, so only what was produced decides the batches.
+    monkeypatch.setattr("services.pdf_parser.READY_BATCH_AHEAD", 5)
+    first_taken = threading.Event()
+    rest_produced = threading.Event()
+
+    def items():
+        yield 0
+        assert first_taken.wait(timeout=5)
+        yield from range(1, 5)
+        rest_produced.set()
+
+    batches = []
+    async with aclosing(_ready_batches(items(), max_size=3)) as ready:
+        async for batch in ready:
+            batches.append(batch)
+            if batch == [0]:
+                first_taken.set()
+                assert await asyncio.to_thread(rest_produced.wait, 5)
+
+    assert batches == [[0], [1, 2, 3], [4]]
+
+
+@pytest.mark.asyncio
+async def test_ready_batches_keep_producer_close_behind_a_slow_consumer() -> None:
+    produced = []
+
+    def items():
+        for item in range(10):
+            produced.append(item)
+            yield item
+
+    async with aclosing(_ready_batches(items(), max_size=1)) as ready:
+        async for (item,) in ready:
+            await asyncio.sleep(0.02)
+            # Queued items, plus the one the producer waits to put.
+            assert len(produced) <= item + 1 + READY_BATCH_AHEAD + 1
+
+    assert produced == list(range(10))
+
+
+@pytest.mark.asyncio
+async def test_ready_batches_release_a_waiting_producer_when_the_consumer_stops() -> None:
+    closed = threading.Event()
+
+    def items():
+        item = 0
+        try:
+            while True:
+                yield item
+                item += 1
+        finally:
+            closed.set()
+
+    async def take_first() -> list:
+        async with aclosing(_ready_batches(items(), max_size=1)) as ready:
+            async for batch in ready:
+                # Long enough for the producer to fill the queue and wait.
+                await asyncio.sleep(0.02)
+                return batch
+
+    assert await asyncio.wait_for(take_first(), timeout=5) == [0]
+    assert closed.is_set()
+
+
+def test_page_ranges_cover_every_page_once_in_order() -> None:
+    assert _page_ranges(10, 4) == [(0, 3), (3, 6), (6, 8), (8, 10)]
+
+
+def test_parallel_extraction_matches_serial(monkeypatch: pytest.MonkeyPatch) -> None:
+    pdf_bytes = build_pdf(6, lines_per_page=8, pages_per_chapter=2)
+    serial = PdfParsingService.extract_document(pdf_bytes, fallback_title="book.pdf")
+
+    monkeypatch.setattr("services.pdf_parser.settings.PDF_EXTRACT_WORKERS", 2)
+    monkeypatch.setattr("services.pdf_parser.settings.PDF_PARALLEL_MIN_PAGES", 2)
+    try:
+        parallel = PdfParsingService.extract_document(pdf_bytes, fallback_title="book.pdf")
+    finally:
+        shutdown_pdf_extraction_pool()
+
+    assert [chapter.start_page for chapter in serial.chapters] == [1, 3, 5]
+    assert parallel == serial
+
+
+def _extract_all_pages(pdf_bytes: bytes) -> list[tuple[int, str]]:
+    with get_pdf_engine("pdfplumber").open(pdf_bytes) as pdf:
+        return list(PdfParsingService._extract_pages(pdf, "pdfplumber", pdf_bytes, [(0, pdf.page_count)], None))
+
+
+def test_extraction_in_celery_pool_worker_falls_back_to_serial(monkeypatch: pytest.MonkeyPatch) -> None:
+    pdf_bytes = build_pdf(6, lines_per_page=8, pages_per_chapter=2)
+    serial = _extract_all_pages(pdf_bytes)
+
+    monkeypatch.setattr("services.pdf_parser.settings.PDF_EXTRACT_WORKERS", 2)
+    monkeypatch.setattr("services.pdf_parser.settings.PDF_PARALLEL_MIN_PAGES", 2)
+    # Celery's prefork workers are daemonic billiard processes, which may not start an extraction pool.
+    with billiard.Pool(1) as pool:
+        in_worker = pool.apply(_extract_all_pages, (pdf_bytes,))
+
+    assert in_worker == serial
+
+
+def test_extraction_from_path_matches_bytes(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    pdf_bytes = build_pdf(6, lines_per_page=8, pages_per_chapter=2)
+    pdf_path = tmp_path / "book.pdf"
+    pdf_path.write_bytes(pdf_bytes)
+    from_bytes = PdfParsingService.extract_document(pdf_bytes, fallback_title="book.pdf")
+
+    monkeypatch.setattr("services.pdf_parser.settings.PDF_EXTRACT_WORKERS", 2)
+    monkeypatch.setattr("services.pdf_parser.settings.PDF_PARALLEL_MIN_PAGES", 2)
+    try:
+        from_path = PdfParsingService.extract_document(str(pdf_path), fallback_title="book.pdf")
+    finally:
+        shutdown_pdf_extraction_pool()
+
+    assert from_path == from_bytes
+    engine = get_pdf_engine("pdfplumber")
+    assert PdfPageCache.cache_key(str(pdf_path), engine) == PdfPageCache.cache_key(pdf_bytes, engine)
+
+
+@pytest.mark.parametrize("engine", ["pdfminer", "pdfium"])
+def test_fast_engines_split_chapters_like_pdfplumber(engine: str) -> None:
+    pdf_bytes = build_pdf(6, lines_per_page=8, pages_per_chapter=2, title="Engines", author="A. Writer")
+    reference = PdfParsingService.extract_document(pdf_bytes, fallback_title="book.pdf", engine="pdfplumber")
+    parsed = PdfParsingService.extract_document(pdf_bytes, fallback_title="book.pdf", engine=engine)
+
+    assert (parsed.title, parsed.author) == ("Engines", "A. Writer")
+    assert [(c.title, c.start_page, c.end_page) for c in parsed.chapters] == [
+        (c.title, c.start_page, c.end_page) for c in reference.chapters
+    ]
+    assert [c.content.split() for c in parsed.chapters] == [c.content.split() for c in reference.chapters]
+
+
+def test_pdfplumber_releases_each_page_once_read() -> None:
+    pdf_bytes = build_pdf(3, lines_per_page=8, pages_per_chapter=2)
+    with get_pdf_engine("pdfplumber").open(pdf_bytes) as pdf:
+        texts = list(pdf.iter_page_texts())
+        glyphs = list(pdf.iter_page_glyphs(max_chars=10_000))
+        pages = pdf._pdf.pages
+
+        assert all(texts) and all(page.char_sizes is not None for page in glyphs)
+        # Closed pages drop their cached layout objects.
+        assert not any("_layout" in vars(page) or "_objects" in vars(page) for page in pages)
+
+
+def test_unknown_engine_is_rejected() -> None:
+    with pytest.raises(PdfEngineError):
+        get_pdf_engine("ghostscript")
+
+
 @pytest.mark.asyncio
 async def test_parse_and_store_raises_on_invalid_pdf_without_mutating(
     monkeypatch: pytest.MonkeyPatch,
@@ -130,7 +673,7 @@ async def test_parse_and_store_raises_on_invalid_pdf_without_mutating(
     def _raise_invalid_pdf(_):
         raise ValueError("invalid pdf")
 
-    monkeypatch.setattr("services.pdf_parser.pdfplumber.open", _raise_invalid_pdf)
+    monkeypatch.setattr("services.pdf_engines.pdfplumber.open", _raise_invalid_pdf)
 
     async with async_session_factory() as session:
         user = User(email="parser-fail@example.com", hashed_password="hash", is_active=True)
@@ -168,7 +711,7 @@ async def test_parse_and_store_raises_on_invalid_pdf_without_mutating(
             await PdfParsingService.parse_and_store(
                 db=session,
                 file_record=file_record,
-                pdf_bytes=b"broken",
+                source=b"broken",
             )
 
         await session.refresh(file_record)
@@ -192,7 +735,7 @@ async def test_parse_and_store_rolls_back_if_db_write_fails(
         metadata={"Title": "New title", "Author": "New author"},
         pages=["Chapter 1 First\nAlpha text."],
     )
-    monkeypatch.setattr("services.pdf_parser.pdfplumber.open", lambda _: fake_pdf)
+    monkeypatch.setattr("services.pdf_engines.pdfplumber.open", lambda _: fake_pdf)
 
     async with async_session_factory() as session:
         user = User(email="parser-rollback@example.com", hashed_password="hash", is_active=True)
@@ -228,22 +771,16 @@ async def test_parse_and_store_rolls_back_if_db_write_fails(
         )
         await session.commit()
 
-        original_add = session.add
-        failed_once = {"value": False}
-
-        def failing_add(obj):
-            if isinstance(obj, Chapter) and not failed_once["value"]:
-                failed_once["value"] = True
-                raise RuntimeError("insert failed")
-            return original_add(obj)
+        async def failing_insert(db, file_id, payloads):
+            raise RuntimeError("insert failed")
 
-        monkeypatch.setattr(session, "add", failing_add)
+        monkeypatch.setattr(PdfParsingService, "_insert_chapters", staticmethod(failing_insert))
 
         with pytest.raises(RuntimeError, match="insert failed"):
             await PdfParsingService.parse_and_store(
                 db=session,
                 file_record=file_record,
-                pdf_bytes=b"fake",
+                source=b"fake",
             )
 
     async with async_session_factory() as verify_session:
@@ -12,6 +12,7 @@ Covers:
 - GET with no history returns empty list
 - position_seconds < 0 → 422
 - chapter_id is optional (omit from body) → chapter_id null in response
+- position past the end of a chapter with known duration is clamped
 - GET pagination
 """
 from __future__ import annotations
@@ -129,6 +130,7 @@ async def _create_file(
 async def _create_chapter(
     factory: async_sessionmaker[AsyncSession],
     file_id: int,
+    audio_duration_seconds: float | None = None,
 ) -> Chapter:
     async with factory() as session:
         ch = Chapter(
@@ -138,6 +140,7 @@ async def _create_chapter(
             content="Some text.",
             start_page=1,
             end_page=5,
+            audio_duration_seconds=audio_duration_seconds,
         )
         session.add(ch)
         await session.commit()
@@ -360,6 +363,41 @@ async def test_chapter_id_is_optional(
     assert r2.json()["chapter_id"] is None
 
 
+@pytest.mark.asyncio
+async def test_position_past_chapter_end_is_clamped_to_duration(
+    client: TestClient,
+    async_session_factory: async_sessionmaker[AsyncSession],
+    session_store: dict,
+) -> None:
+    user = await _create_user(async_session_factory, "user-clamp@example.com")
+    file_ = await _create_file(async_session_factory, user.id)
+    chapter = await _create_chapter(async_session_factory, file_.id, audio_duration_seconds=42.5)
+    _login(client, session_store, user)
+
+    response = client.post(f"/history/{file_.id}", json={"position_seconds": 60.0, "chapter_id": chapter.id})
+
+    assert response.status_code == 200
+    assert response.json()["position_seconds"] == 42.5
+
+
+@pytest.mark.asyncio
+async def test_post_with_chapter_promotes_its_tts(
+    client: TestClient,
+    async_session_factory: async_sessionmaker[AsyncSession],
+    session_store: dict,
+    tts_queue: list[dict],
+) -> None:
+    user = await _create_user(async_session_factory, "user-promote@example.com")
+    file_ = await _create_file(async_session_factory, user.id)
+    chapter = await _create_chapter(async_session_factory, file_.id)
+    _login(client, session_store, user)
+
+    response = client.post(f"/history/{file_.id}", json={"position_seconds": 5.0, "chapter_id": chapter.id})
+
+    assert response.status_code == 200
+    assert [(job["args"], job["priority"]) for job in tts_queue] == [([file_.id, chapter.id], 0)]
+
+
 @pytest.mark.asyncio
 async def test_get_pagination(
     client: TestClient,
@@ -0,0 +1,66 @@
+import pytest
+
+from services.text_normalizer import RULES, TextNormalizer
+
+
+def _normalize(text: str, *rules: str) -> str:
+    return TextNormalizer.normalize(text, rules or RULES).text
+
+
+def test_dehyphenates_words_split_across_lines() -> None:
+    assert _normalize("The infor-\nmation age", "dehyphenate") == "The information age"
+    assert _normalize("A well-\nKnown case", "dehyphenate") == "A well-\nKnown case"
+
+
+def test_unwraps_hard_line_breaks_but_keeps_sentence_lines() -> None:
+    text = "Chapter Two\nThis line is\nwrapped by the PDF,\nextractor.\nNext sentence."
+
+    assert _normalize(text, "unwrap") == "Chapter Two\nThis line is wrapped by the PDF, extractor.\nNext sentence."
+
+
+def test_strips_page_numbers_urls_and_numeric_noise() -> None:
+    text = "See https://example.com/a?b=1 for more [3, 4].\n- 12 -\nPage 13 of 200\nxiv\nISBN 978-3-16-148410-0\nMail info@example.org."
+
+    assert _normalize(text, "page_numbers", "urls", "numeric_noise") == "See for more.\nMail."
+
+
+def test_collapses_punctuation_runs_and_dot_leaders() -> None:
+    assert _normalize("Wait!!! Really?? Contents ........ 4\n*****", "punctuation") == "Wait! Really? Contents 4"
+
+
+def test_expands_abbreviations() -> None:
+    text = "Dr. Smith, e.g. in Fig. 2, used apples, pears, etc. Then vs. others etc., too."
+
+    assert _normalize(text, "abbreviations") == (
+        "Doctor Smith, for example in Figure 2, used apples, pears, et cetera. Then versus others et cetera, too."
+    )
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("7 cats", "seven cats"),
+        ("1,234,567 people", "one million two hundred thirty-four thousand five hundred sixty-seven people"),
+        ("the 21st and 3rd", "the twenty-first and third"),
+        ("in 1984 and 2005", "in nineteen eighty-four and two thousand five"),
+        ("grew 3.5%", "grew three point five percent"),
+        ("agent 007", "agent zero zero seven"),
+        ("version 1.2.3 and mp3", "version 1.2.3 and mp3"),
+    ],
+)
+def test_expands_numbers(text: str, expected: str) -> None:
+    assert _normalize(text, "numbers") == expected
+
+
+def test_reports_characters_removed() -> None:
+    text = "Some   text\n\n\n12\nhere...... ok"
+
+    result = TextNormalizer.normalize(text, ["page_numbers", "punctuation"])
+
+    assert result.text == "Some text\nhere ok"
+    assert result.chars_removed == len(text) - len(result.text)
+
+
+def test_rejects_unknown_rule() -> None:
+    with pytest.raises(ValueError):
+        TextNormalizer.normalize("text", ["shout"])
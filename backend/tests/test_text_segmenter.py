@@ -0,0 +1,50 @@
+import pytest
+
+from services.text_segmenter import TextSegmenter
+
+
+def test_split_keeps_short_text_in_one_segment() -> None:
+    assert TextSegmenter.split("Hello there. How are you?", max_chars=100) == ["Hello there. How are you?"]
+
+
+def test_split_packs_sentences_without_exceeding_budget() -> None:
+    text = "One sentence here. Another sentence there. A third one follows. And a fourth."
+
+    segments = TextSegmenter.split(text, max_chars=45)
+
+    assert segments == [
+        "One sentence here. Another sentence there.",
+        "A third one follows. And a fourth.",
+    ]
+    assert all(len(segment) <= 45 for segment in segments)
+
+
+def test_split_prefers_paragraph_boundaries() -> None:
+    text = "First paragraph is short.\n\nSecond paragraph has two sentences. It ends here."
+
+    segments = TextSegmenter.split(text, max_chars=60)
+
+    assert segments == [
+        "First paragraph is short.",
+        "Second paragraph has two sentences. It ends here.",
+    ]
+
+
+def test_split_unwraps_hard_line_breaks_inside_paragraph() -> None:
+    text = "This line is\nwrapped by the PDF\nextractor."
+
+    assert TextSegmenter.split(text, max_chars=100) == ["This line is wrapped by the PDF extractor."]
+
+
+def test_split_breaks_oversized_sentence_at_clauses_then_words() -> None:
+    text = "alpha beta gamma, delta epsilon zeta, eta theta iota kappa lambda mu nu xi omicron"
+
+    segments = TextSegmenter.split(text, max_chars=20)
+
+    assert all(len(segment) <= 20 for segment in segments)
+    assert " ".join(segments).split() == text.split()
+
+
+def test_split_rejects_non_positive_budget() -> None:
+    with pytest.raises(ValueError):
+        TextSegmenter.split("text", max_chars=0)
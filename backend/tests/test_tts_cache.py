@@ -0,0 +1,267 @@
+"""Tests for the content-addressed TTS audio cache."""
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from services.tts_cache import TTSAudioCache
+
+
+class FakeRedis:
+    """Implements the subset of redis.asyncio.Redis used by the cache."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, int | bytes] = {}
+        self.zsets: dict[str, dict[str, float]] = {}
+        self.hashes: dict[str, dict[str, int]] = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def mget(self, *keys):
+        return [self.values.get(key) for key in keys]
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def exists(self, key):
+        return int(key in self.values)
+
+    async def delete(self, key):
+        return int(self.values.pop(key, None) is not None)
+
+    async def incr(self, key):
+        return await self.incrby(key, 1)
+
+    async def incrby(self, key, amount):
+        self.values[key] = int(self.values.get(key, 0)) + amount
+        return self.values[key]
+
+    async def decrby(self, key, amount):
+        return await self.incrby(key, -amount)
+
+    async def zscore(self, key, member):
+        return self.zsets.get(key, {}).get(member)
+
+    async def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    async def zrem(self, key, member):
+        return int(self.zsets.get(key, {}).pop(member, None) is not None)
+
+    async def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+
+    async def zrange(self, key, start, end):
+        ordered = sorted(self.zsets.get(key, {}).items(), key=lambda item: item[1])
+        return [member.encode() for member, _ in ordered[start:end + 1]]
+
+    async def zrangebyscore(self, key, low, high, start=0, num=None):
+        ordered = sorted(self.zsets.get(key, {}).items(), key=lambda item: item[1])
+        matches = [member.encode() for member, score in ordered if score <= high]
+        return matches[start:start + num] if num is not None else matches[start:]
+
+    async def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    async def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = value
+
+    async def hdel(self, key, field):
+        return int(self.hashes.get(key, {}).pop(field, None) is not None)
+
+
+class BrokenRedis(FakeRedis):
+    async def zscore(self, key, member):
+        raise RedisConnectionError("redis down")
+
+    async def set(self, key, value, nx=False, ex=None):
+        raise RedisConnectionError("redis down")
+
+    async def incr(self, key):
+        raise RedisConnectionError("redis down")
+
+    async def hget(self, key, field):
+        raise RedisConnectionError("redis down")
+
+    async def zrangebyscore(self, key, low, high, start=0, num=None):
+        raise RedisConnectionError("redis down")
+
+
+class FakeObjectResponse:
+    def __init__(self, payload: bytes, reads: list[int]) -> None:
+        self._payload = payload
+        self._reads = reads
+
+    def read(self) -> bytes:
+        self._reads.append(threading.get_ident())
+        return self._payload
+
+    def close(self) -> None:
+        pass
+
+    def release_conn(self) -> None:
+        pass
+
+
+class FakeMinioClient:
+    def __init__(self) -> None:
+        self.objects: dict[tuple[str, str], bytes] = {}
+        self.read_threads: list[int] = []
+
+    async def upload_file(self, bucket_name, object_name, file_data, file_size, content_type):
+        self.objects[(bucket_name, object_name)] = file_data
+        return object_name
+
+    def get_client(self):
+        return self
+
+    def get_object(self, bucket_name, object_name):
+        return FakeObjectResponse(self.objects[(bucket_name, object_name)], self.read_threads)
+
+    async def delete_file(self, bucket_name, object_name):
+        self.objects.pop((bucket_name, object_name), None)
+        return True
+
+
+def _make_cache(redis=None, minio=None, max_bytes: int = 1024) -> TTSAudioCache:
+    return TTSAudioCache(
+        redis=redis or FakeRedis(),
+        minio=minio or FakeMinioClient(),
+        bucket_name="tts-cache",
+        max_bytes=max_bytes,
+        max_age_seconds=3600,
+        lock_timeout_seconds=1,
+        poll_interval_seconds=0.01,
+    )
+
+
+def test_cache_key_ignores_whitespace_but_not_voice() -> None:
+    base = TTSAudioCache.cache_key("Hello   world\n", "model", "voice-a")
+
+    assert TTSAudioCache.cache_key("Hello world", "model", "voice-a") == base
+    assert TTSAudioCache.cache_key("Hello world", "model", "voice-b") != base
+    assert TTSAudioCache.cache_key("Hello world", "other-model", "voice-a") != base
+
+
+@pytest.mark.asyncio
+async def test_second_lookup_is_served_from_cache() -> None:
+    calls: list[str] = []
+
+    async def synthesize(text: str) -> bytes:
+        calls.append(text)
+        return b"audio:" + text.encode()
+
+    minio = FakeMinioClient()
+    cache = _make_cache(minio=minio)
+
+    first = await cache.get_or_synthesize("Copyright page", synthesize)
+    second = await cache.get_or_synthesize("Copyright  page", synthesize)
+
+    assert first == second == b"audio:Copyright page"
+    assert calls == ["Copyright page"]
+    stats = await cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+    assert stats["saved_characters"] == len("Copyright  page")
+    # The hit is read from MinIO off the event loop's thread.
+    assert minio.read_threads and threading.get_ident() not in minio.read_threads
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_are_collapsed_into_one_synthesis() -> None:
+    calls = 0
+
+    async def synthesize(text: str) -> bytes:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return b"audio"
+
+    cache = _make_cache()
+
+    results = await asyncio.gather(*(cache.get_or_synthesize("Preface", synthesize) for _ in range(5)))
+
+    assert results == [b"audio"] * 5
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_waits_for_another_worker_holding_the_lock() -> None:
+    redis = FakeRedis()
+    minio = FakeMinioClient()
+    leader = _make_cache(redis, minio)
+    follower = _make_cache(redis, minio)
+    release = asyncio.Event()
+    calls: list[str] = []
+
+    async def slow_synthesize(text: str) -> bytes:
+        calls.append("leader")
+        await release.wait()
+        return b"shared"
+
+    async def follower_synthesize(text: str) -> bytes:
+        calls.append("follower")
+        return b"duplicate"
+
+    leader_task = asyncio.create_task(leader.get_or_synthesize("Title page", slow_synthesize))
+    await asyncio.sleep(0)
+    follower_task = asyncio.create_task(follower.get_or_synthesize("Title page", follower_synthesize))
+    await asyncio.sleep(0.03)
+    release.set()
+
+    assert await leader_task == b"shared"
+    assert await follower_task == b"shared"
+    assert calls == ["leader"]
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_entries_are_evicted_over_budget() -> None:
+    minio = FakeMinioClient()
+    cache = _make_cache(minio=minio, max_bytes=10)
+
+    async def synthesize(text: str) -> bytes:
+        return b"x" * 6
+
+    await cache.get_or_synthesize("first", synthesize)
+    await cache.get_or_synthesize("second", synthesize)
+
+    stats = await cache.stats()
+    assert stats["entries"] == 1
+    assert stats["bytes"] == 6
+    first_key = TTSAudioCache.cache_key("first", "tts_models/en/ljspeech/tacotron2-DDC", "")
+    assert ("tts-cache", TTSAudioCache.object_name(first_key)) not in minio.objects
+
+
+@pytest.mark.asyncio
+async def test_redis_outage_falls_back_to_direct_synthesis() -> None:
+    cache = _make_cache(redis=BrokenRedis())
+
+    async def synthesize(text: str) -> bytes:
+        return b"fresh"
+
+    assert await cache.get_or_synthesize("anything", synthesize) == b"fresh"
+
+
+@pytest.mark.asyncio
+async def test_synthesis_errors_propagate_to_all_waiters() -> None:
+    cache = _make_cache()
+
+    async def failing(text: str) -> bytes:
+        await asyncio.sleep(0.01)
+        raise RuntimeError("tts down")
+
+    results = await asyncio.gather(
+        cache.get_or_synthesize("Chapter", failing),
+        cache.get_or_synthesize("Chapter", failing),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
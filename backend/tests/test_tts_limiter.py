@@ -0,0 +1,156 @@
+"""Tests for the adaptive TTS concurrency limiter."""
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from services.tts_limiter import (
+    LEASES_KEY,
+    AIMDLimiter,
+    AIMDPolicy,
+    Outcome,
+    RedisAIMDLimiter,
+)
+
+
+def _status_error(status_code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "http://tts:5002/api/tts")
+    return httpx.HTTPStatusError("error", request=request, response=httpx.Response(status_code, request=request))
+
+
+def test_policy_classifies_outcomes() -> None:
+    policy = AIMDPolicy(latency_target_per_char=0.01)
+
+    assert policy.classify(0.5, 100, None) is Outcome.INCREASE
+    assert policy.classify(5.0, 100, None) is Outcome.HOLD
+    assert policy.classify(None, 100, httpx.ReadTimeout("slow")) is Outcome.DECREASE
+    assert policy.classify(None, 100, _status_error(503)) is Outcome.DECREASE
+    assert policy.classify(None, 100, _status_error(400)) is Outcome.HOLD
+
+
+def test_policy_adjust_respects_bounds() -> None:
+    policy = AIMDPolicy(min_limit=1, max_limit=5)
+
+    assert policy.adjust(4.0, Outcome.INCREASE) == pytest.approx(4.25)
+    assert policy.adjust(5.0, Outcome.INCREASE) == 5
+    assert policy.adjust(1.5, Outcome.DECREASE) == 1
+    assert policy.adjust(3.0, Outcome.HOLD) == 3.0
+
+
+@pytest.mark.asyncio
+async def test_limiter_blocks_beyond_current_limit() -> None:
+    limiter = AIMDLimiter(AIMDPolicy(initial_limit=2, latency_target_per_char=0))
+    release = asyncio.Event()
+    peak = 0
+
+    async def call() -> None:
+        nonlocal peak
+        async with limiter.slot(10):
+            peak = max(peak, limiter.in_flight)
+            await release.wait()
+
+    tasks = [asyncio.create_task(call()) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    assert limiter.in_flight == 2
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert peak == 2
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_grows_on_fast_calls_and_halves_on_timeouts() -> None:
+    limiter = AIMDLimiter(AIMDPolicy(initial_limit=4, latency_target_per_char=1.0, decrease_cooldown_seconds=60))
+
+    for _ in range(4):
+        async with limiter.slot(100):
+            pass
+    assert limiter.limit > 4.9
+
+    for _ in range(2):
+        with pytest.raises(httpx.ReadTimeout):
+            async with limiter.slot(100):
+                raise httpx.ReadTimeout("timed out")
+
+    # The second timeout falls inside the cooldown and belongs to the same overload.
+    assert 2.4 < limiter.limit < 2.6
+
+
+class FakeScript:
+    def __init__(self, results: list) -> None:
+        self.results = results
+        self.calls: list[dict] = []
+
+    async def __call__(self, keys, args):
+        self.calls.append({"keys": keys, "args": args})
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+class FakeRedis:
+    def __init__(self, acquire: FakeScript, release: FakeScript) -> None:
+        self._scripts = iter([acquire, release])
+        self.renewals: list[tuple[str, dict, bool]] = []
+
+    def register_script(self, script: str) -> FakeScript:
+        return next(self._scripts)
+
+    async def zadd(self, name: str, mapping: dict, xx: bool = False) -> int:
+        self.renewals.append((name, mapping, xx))
+        return 0
+
+
+@pytest.mark.asyncio
+async def test_redis_limiter_polls_until_a_slot_frees_and_reports_outcome() -> None:
+    acquire = FakeScript([0, 1])
+    release = FakeScript(["4.25"])
+    limiter = RedisAIMDLimiter(
+        AIMDPolicy(latency_target_per_char=1.0),
+        redis=FakeRedis(acquire, release),
+        poll_interval_seconds=0.001,
+    )
+
+    async with limiter.slot(100):
+        pass
+
+    assert len(acquire.calls) == 2
+    lease = acquire.calls[-1]["args"][3]
+    assert release.calls[0]["args"][:2] == [lease, "increase"]
+
+
+@pytest.mark.asyncio
+async def test_redis_limiter_falls_back_to_local_limit_when_redis_is_down() -> None:
+    acquire = FakeScript([RedisConnectionError("redis down")])
+    release = FakeScript([])
+    limiter = RedisAIMDLimiter(AIMDPolicy(latency_target_per_char=1.0), redis=FakeRedis(acquire, release))
+
+    async with limiter.slot(100):
+        assert limiter.in_flight == 1
+
+    assert limiter.in_flight == 0
+    assert limiter.limit > limiter.policy.initial_limit
+    assert release.calls == []
+
+
+@pytest.mark.asyncio
+async def test_redis_limiter_renews_lease_until_released() -> None:
+    acquire = FakeScript([1])
+    release = FakeScript(["4"])
+    redis = FakeRedis(acquire, release)
+    limiter = RedisAIMDLimiter(AIMDPolicy(), redis=redis, lease_ttl_seconds=0.03)
+
+    async with limiter.slot(100):
+        await asyncio.sleep(0.05)
+    renewed = len(redis.renewals)
+    await asyncio.sleep(0.03)
+
+    lease = acquire.calls[0]["args"][3]
+    assert renewed >= 2
+    assert len(redis.renewals) == renewed
+    assert all(name == LEASES_KEY and list(mapping) == [lease] and xx for name, mapping, xx in redis.renewals)
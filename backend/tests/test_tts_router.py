@@ -0,0 +1,284 @@
+"""Tests for the multi-replica TTS router."""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+import services.tts
+from services.tts import TTSService
+from services.tts_router import (
+    REPLICA_METRICS_KEY,
+    CircuitState,
+    TTSReplicaRouter,
+    TTSUnavailableError,
+    collect_replica_metrics,
+)
+
+
+def _make_router(probe_client=None, **kwargs) -> TTSReplicaRouter:
+    return TTSReplicaRouter(
+        urls=["http://tts-a:5002", "http://tts-b:5002/"],
+        probe_client=probe_client or MagicMock(),
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_long_chapter_does_not_pile_onto_busy_replica() -> None:
+    router = _make_router()
+
+    async with router.lease(5000) as busy:
+        async with router.lease(100) as first, router.lease(100) as second:
+            # Both short requests avoid the replica already synthesizing 5000 characters.
+            assert first.url != busy.url
+            assert second.url != busy.url
+        async with router.lease(4000) as long_request:
+            assert long_request.url != busy.url
+
+    assert all(replica.in_flight_chars == 0 for replica in router.replicas)
+    assert router.urls == ["http://tts-a:5002", "http://tts-b:5002"]
+
+
+@pytest.mark.asyncio
+async def test_balance_by_requests_ignores_text_length() -> None:
+    router = _make_router(balance_by="requests")
+
+    async with router.lease(5000) as busy, router.lease(10) as other:
+        assert other.url != busy.url
+        async with router.lease(10) as third:
+            assert third.in_flight_requests == 2
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_after_consecutive_failures_and_closes_after_trial() -> None:
+    probe = MagicMock()
+    probe.get = AsyncMock(return_value=MagicMock(status_code=200))
+    router = _make_router(probe_client=lambda: probe, failure_threshold=2, probe_interval_seconds=0.01)
+
+    for _ in range(2):
+        with pytest.raises(httpx.ConnectError):
+            async with router.lease(10, exclude={"http://tts-b:5002"}):
+                raise httpx.ConnectError("refused")
+
+    failing = router.replicas[0]
+    assert failing.state is CircuitState.OPEN
+    assert failing.breaker_opens == 1
+    async with router.lease(10) as replica:
+        assert replica.url == "http://tts-b:5002"
+
+    await asyncio.sleep(0.05)
+
+    # A passing probe only half-opens the breaker; one real request has to succeed to close it.
+    assert failing.state is CircuitState.HALF_OPEN
+    probe.get.assert_awaited_with("http://tts-a:5002/", timeout=router.probe_timeout_seconds)
+    # The trial goes to the recovered replica even though its healthy peer is idle.
+    async with router.lease(10) as replica:
+        assert replica is failing
+        async with router.lease(10) as concurrent:
+            assert concurrent.url == "http://tts-b:5002"
+    assert failing.state is CircuitState.CLOSED
+    assert failing.consecutive_failures == 0
+    await router.aclose()
+
+
+@pytest.mark.asyncio
+async def test_half_open_replica_admits_single_trial_and_reopens_on_failure() -> None:
+    router = _make_router(probe_interval_seconds=60, open_seconds=0)
+    replica = router.replicas[0]
+    router._open(replica)
+    others = {"http://tts-b:5002"}
+
+    async with router.lease(10, exclude=others):
+        assert replica.state is CircuitState.HALF_OPEN
+        with pytest.raises(TTSUnavailableError):
+            router.choose(exclude=others)
+
+    router._open(replica)
+    with pytest.raises(httpx.ConnectError):
+        async with router.lease(10, exclude=others):
+            raise httpx.ConnectError("refused")
+
+    assert replica.state is CircuitState.OPEN
+    assert replica.breaker_opens == 3
+    await router.aclose()
+
+
+def test_hedging_counts_half_open_replica_free_for_trial() -> None:
+    router = _make_router(hedge_percentile=95)
+    router.stats.seconds_per_char.extend([0.01] * 30)
+    router.stats.requests = 30
+    router.replicas[0].state = CircuitState.HALF_OPEN
+
+    assert router.hedge_delay(100) is not None
+
+    router.replicas[0].in_flight_requests = 1
+    assert router.hedge_delay(100) is None
+
+
+@pytest.mark.asyncio
+async def test_client_errors_do_not_count_against_replica() -> None:
+    router = _make_router(failure_threshold=1)
+    response = httpx.Response(400, request=httpx.Request("POST", "http://tts-a:5002/api/tts"))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        async with router.lease(10):
+            response.raise_for_status()
+
+    assert all(replica.state is CircuitState.CLOSED for replica in router.replicas)
+
+
+@pytest.mark.asyncio
+async def test_latency_spikes_open_breaker() -> None:
+    router = _make_router(failure_threshold=2, latency_spike_factor=3.0, probe_interval_seconds=60)
+    replica = router.replicas[0]
+
+    for _ in range(5):
+        router._record_success(replica, elapsed=1.0, text_length=100)
+    router._record_success(replica, elapsed=10.0, text_length=100)
+    assert replica.state is CircuitState.CLOSED
+    router._record_success(replica, elapsed=10.0, text_length=100)
+
+    assert replica.state is CircuitState.OPEN
+    assert replica.slow_requests == 2
+    await router.aclose()
+
+
+@pytest.mark.asyncio
+async def test_all_breakers_open_fails_fast() -> None:
+    router = _make_router(probe_interval_seconds=60)
+    for replica in router.replicas:
+        router._open(replica)
+
+    with pytest.raises(TTSUnavailableError):
+        async with router.lease(10):
+            pass
+
+    assert router.stats.rejected == 1
+    assert all(replica.in_flight_requests == 0 for replica in router.replicas)
+    await router.aclose()
+
+
+def test_hedge_delay_tracks_latency_percentile_and_budget() -> None:
+    router = _make_router(hedge_percentile=95, hedge_min_delay_seconds=0.5, hedge_max_ratio=0.1)
+    assert router.hedge_delay(100) is None
+
+    for _ in range(100):
+        router.stats.observe(elapsed=2.0, text_length=100)
+
+    assert router.hedge_delay(100) == pytest.approx(2.0)
+    assert router.hedge_delay(10) == pytest.approx(0.5)
+    router.stats.hedges_sent = 10
+    assert router.hedge_delay(100) is None
+    assert _make_router().hedge_delay(100) is None
+
+
+@pytest.mark.asyncio
+async def test_collect_replica_metrics_aggregates_fresh_worker_snapshots() -> None:
+    router = _make_router()
+    async with router.lease(10):
+        pass
+    router._open(router.replicas[1])
+    router.stats.observe(elapsed=1.0, text_length=10)
+    payload = {"replicas": router.snapshot(), "requests": router.stats.snapshot()}
+    fresh = json.dumps({"updated_at": time.time(), **payload})
+    stale = json.dumps({"updated_at": time.time() - 3600, **payload})
+    redis = MagicMock()
+    redis.hgetall = AsyncMock(return_value={b"w1:1": fresh, b"w2:2": fresh, b"w3:3": stale})
+    redis.hdel = AsyncMock()
+
+    metrics = await collect_replica_metrics(redis)
+
+    replicas = metrics["replicas"]
+    assert replicas["http://tts-a:5002"]["workers"] == 2
+    assert replicas["http://tts-a:5002"]["requests"] + replicas["http://tts-b:5002"]["requests"] == 2
+    assert replicas["http://tts-b:5002"]["workers_open"] == 2
+    assert metrics["requests"]["requests"] == 2
+    assert metrics["requests"]["p50_seconds"] is not None
+    redis.hdel.assert_awaited_once_with(REPLICA_METRICS_KEY, b"w3:3")
+    await router.aclose()
+
+
+@pytest.mark.asyncio
+async def test_aclose_removes_published_metrics() -> None:
+    redis = MagicMock()
+    redis.hset = AsyncMock()
+    redis.hdel = AsyncMock()
+    router = _make_router(redis=redis, metrics_interval_seconds=1.0)
+    async with router.lease(10):
+        pass
+    await router._maybe_publish_metrics()
+    (key, field, _), _ = redis.hset.call_args
+
+    await router.aclose()
+
+    assert key == REPLICA_METRICS_KEY
+    redis.hdel.assert_awaited_once_with(REPLICA_METRICS_KEY, field)
+
+
+@pytest.mark.asyncio
+async def test_synthesize_routes_across_configured_replicas(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("services.tts.settings.TTS_SERVICE_URLS", "http://tts-a:5002, http://tts-b:5002")
+    urls: list[str] = []
+    release = asyncio.Event()
+
+    async def post(url, json):
+        urls.append(url)
+        await release.wait()
+        response = MagicMock()
+        response.content = b"RIFF"
+        return response
+
+    mock_client = MagicMock()
+    mock_client.is_closed = False
+    mock_client.post = post
+
+    with patch("services.tts.httpx.AsyncClient", return_value=mock_client):
+        tasks = [asyncio.create_task(TTSService.synthesize("Hello")) for _ in range(2)]
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(*tasks)
+
+    assert sorted(urls) == ["http://tts-a:5002/api/tts", "http://tts-b:5002/api/tts"]
+
+
+@pytest.mark.asyncio
+async def test_slow_request_is_hedged_onto_other_replica(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("services.tts.settings.TTS_SERVICE_URLS", "http://tts-a:5002, http://tts-b:5002")
+    monkeypatch.setattr("services.tts.settings.TTS_HEDGE_ENABLED", True)
+    monkeypatch.setattr("services.tts.settings.TTS_HEDGE_MIN_DELAY", 0.01)
+    monkeypatch.setattr("services.tts.settings.TTS_HEDGE_MAX_RATIO", 1.0)
+    stuck = asyncio.Event()
+    cancelled: list[str] = []
+
+    async def post(url, json):
+        if not cancelled and "tts-a" in url:
+            try:
+                await stuck.wait()
+            except asyncio.CancelledError:
+                cancelled.append(url)
+                raise
+        response = MagicMock()
+        response.content = url.encode()
+        return response
+
+    mock_client = MagicMock()
+    mock_client.is_closed = False
+    mock_client.post = post
+
+    router = services.tts.get_tts_router()
+    for _ in range(20):
+        router.stats.observe(elapsed=0.001, text_length=5)
+
+    with patch("services.tts.httpx.AsyncClient", return_value=mock_client):
+        audio = await TTSService.synthesize("Hello")
+
+    assert audio == b"http://tts-b:5002/api/tts"
+    assert cancelled == ["http://tts-a:5002/api/tts"]
+    assert router.stats.hedges_sent == 1
+    assert router.stats.hedges_won == 1
+    assert all(replica.in_flight_requests == 0 for replica in router.replicas)
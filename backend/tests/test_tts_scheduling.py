@@ -0,0 +1,123 @@
+"""Tests for listening-position-aware TTS priority scheduling."""
+from __future__ import annotations
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+import worker.scheduling
+from models import User
+from models.chapter import Chapter
+from models.file import File, FileStatus
+from worker.scheduling import (
+    CHAPTER_LOCK_KEY_PREFIX,
+    TTSPriority,
+    claim_chapter,
+    promote_listening_position,
+    release_chapter,
+)
+from worker.tasks import _process_tts_async, process_tts
+
+
+async def _create_book(
+    factory: async_sessionmaker[AsyncSession],
+    chapter_count: int,
+    with_audio: set[int] = frozenset(),
+) -> tuple[int, list[int]]:
+    async with factory() as session:
+        user = User(email="scheduling@example.com", hashed_password="hash", is_active=True)
+        session.add(user)
+        await session.commit()
+        file_record = File(
+            user_id=user.id,
+            original_filename="book.pdf",
+            stored_filename="stored_scheduling.pdf",
+            file_size=1234,
+            mime_type="application/pdf",
+            bucket_name="raw-pdf-uploads",
+            status=FileStatus.PROCESSING,
+        )
+        session.add(file_record)
+        await session.commit()
+        chapters = [
+            Chapter(
+                file_id=file_record.id,
+                chapter_index=index,
+                title=f"Chapter {index}",
+                content="Text.",
+                start_page=index,
+                end_page=index,
+                audio_bucket_name="completed-files" if index in with_audio else None,
+                audio_object_name=f"{index}.wav" if index in with_audio else None,
+            )
+            for index in range(1, chapter_count + 1)
+        ]
+        session.add_all(chapters)
+        await session.commit()
+        return file_record.id, [chapter.id for chapter in chapters]
+
+
+@pytest.mark.asyncio
+async def test_listening_position_promotes_chapter_and_next_once(
+    async_session_factory: async_sessionmaker[AsyncSession],
+    tts_queue: list[dict],
+) -> None:
+    file_id, chapter_ids = await _create_book(async_session_factory, chapter_count=14)
+
+    async with async_session_factory() as session:
+        chapter = await session.get(Chapter, chapter_ids[11])
+        await promote_listening_position(session, chapter)
+        await promote_listening_position(session, chapter)
+
+    assert [(job["args"], job["priority"]) for job in tts_queue] == [
+        ([file_id, chapter_ids[11]], TTSPriority.REQUESTED),
+        ([file_id, chapter_ids[12]], TTSPriority.UP_NEXT),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_chapters_with_audio_are_not_promoted(
+    async_session_factory: async_sessionmaker[AsyncSession],
+    tts_queue: list[dict],
+) -> None:
+    file_id, chapter_ids = await _create_book(async_session_factory, chapter_count=2, with_audio={1})
+
+    async with async_session_factory() as session:
+        await promote_listening_position(session, await session.get(Chapter, chapter_ids[0]))
+
+    assert [job["args"] for job in tts_queue] == [[file_id, chapter_ids[1]]]
+
+
+@pytest.mark.asyncio
+async def test_chapter_lock_is_exclusive_until_released() -> None:
+    token = await claim_chapter(7)
+
+    assert token
+    assert await claim_chapter(7) is None
+    await release_chapter(7, "someone-else")
+    assert await claim_chapter(7) is None
+    await release_chapter(7, token)
+    assert await claim_chapter(7)
+
+
+def test_process_tts_defers_while_another_copy_holds_the_chapter(tts_queue: list[dict]) -> None:
+    worker.scheduling.get_redis_client().get_client().values[f"{CHAPTER_LOCK_KEY_PREFIX}5"] = "other-worker"
+
+    result = process_tts.apply(args=(1, 5)).get()
+
+    assert result["status"] == "deferred"
+    assert tts_queue[0]["args"] == [1, 5]
+    assert tts_queue[0]["countdown"] > 0
+
+
+@pytest.mark.asyncio
+async def test_process_tts_skips_chapter_that_already_has_audio(
+    monkeypatch: pytest.MonkeyPatch,
+    async_session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    file_id, chapter_ids = await _create_book(async_session_factory, chapter_count=1, with_audio={1})
+    monkeypatch.setattr("worker.tasks.async_session_maker", async_session_factory)
+
+    result = await _process_tts_async(file_id=file_id, chapter_id=chapter_ids[0], task_id="dup")
+
+    assert result["status"] == "skipped"
+    assert result["audio_object_name"] == "1.wav"
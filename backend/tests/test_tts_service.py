@@ -1,10 +1,20 @@
-"""Unit tests for CoquiTTSService."""
+"""Unit tests for TTSService and the TTS backends."""
+import io
+import time
+import wave
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
 import pytest
 
-from services.tts import CoquiTTSService
+from core.config import settings
+from services.tts import (
+    CoquiHTTPBackend,
+    StubTTSBackend,
+    TTSService,
+    get_tts_backend,
+    get_tts_http_client,
+)
 
 
 @pytest.mark.asyncio
@@ -21,7 +31,7 @@ async def test_synthesize_returns_audio_bytes() -> None:
     mock_client.__aexit__ = AsyncMock(return_value=None)
 
     with patch("services.tts.httpx.AsyncClient", return_value=mock_client):
-        result = await CoquiTTSService.synthesize("Hello world")
+        result = await TTSService.synthesize("Hello world")
 
     assert result == fake_audio
     mock_client.post.assert_called_once()
@@ -33,6 +43,7 @@ async def test_synthesize_returns_audio_bytes() -> None:
 async def test_synthesize_raises_on_http_error() -> None:
     mock_request = MagicMock()
     mock_resp = MagicMock()
+    mock_resp.status_code = 500
     mock_response = MagicMock()
     mock_response.raise_for_status = MagicMock(
         side_effect=httpx.HTTPStatusError("500", request=mock_request, response=mock_resp)
@@ -45,7 +56,7 @@ async def test_synthesize_raises_on_http_error() -> None:
 
     with patch("services.tts.httpx.AsyncClient", return_value=mock_client):
         with pytest.raises(httpx.HTTPStatusError):
-            await CoquiTTSService.synthesize("Hello world")
+            await TTSService.synthesize("Hello world")
 
 
 @pytest.mark.asyncio
@@ -57,4 +68,92 @@ async def test_synthesize_raises_on_connection_error() -> None:
 
     with patch("services.tts.httpx.AsyncClient", return_value=mock_client):
         with pytest.raises(httpx.ConnectError):
-            await CoquiTTSService.synthesize("Hello world")
+            await TTSService.synthesize("Hello world")
+
+
+@pytest.mark.asyncio
+async def test_synthesize_reuses_pooled_client() -> None:
+    mock_response = MagicMock()
+    mock_response.content = b"RIFF"
+    mock_response.raise_for_status = MagicMock()
+
+    mock_client = AsyncMock()
+    mock_client.is_closed = False
+    mock_client.post = AsyncMock(return_value=mock_response)
+
+    with patch("services.tts.httpx.AsyncClient", return_value=mock_client) as client_factory:
+        await TTSService.synthesize("First")
+        await TTSService.synthesize("Second")
+
+    client_factory.assert_called_once()
+    limits = client_factory.call_args.kwargs["limits"]
+    timeout = client_factory.call_args.kwargs["timeout"]
+    assert limits.max_connections == settings.TTS_HTTP_MAX_CONNECTIONS
+    assert timeout.connect == settings.TTS_HTTP_CONNECT_TIMEOUT
+    assert timeout.read == settings.TTS_HTTP_READ_TIMEOUT
+    assert mock_client.post.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_aclose_releases_pooled_client() -> None:
+    mock_client = AsyncMock()
+    mock_client.is_closed = False
+
+    with patch("services.tts.httpx.AsyncClient", return_value=mock_client):
+        http_client = get_tts_http_client()
+        assert http_client.get_client() is mock_client
+        await http_client.aclose()
+
+    mock_client.aclose.assert_awaited_once()
+    assert http_client._client is None
+
+
+@pytest.mark.asyncio
+async def test_stub_backend_is_deterministic_and_proportional_to_text() -> None:
+    backend = StubTTSBackend(sample_rate=16000, seconds_per_char=0.05, chunk_size=1024)
+
+    short = await backend.synthesize("Hello")
+    again = await backend.synthesize("Hello")
+    long = await backend.synthesize("Hello" * 4)
+
+    assert short == again
+    with wave.open(io.BytesIO(short), "rb") as reader:
+        assert reader.getframerate() == 16000
+        assert reader.getnchannels() == 1
+        assert reader.getnframes() == 4000
+    with wave.open(io.BytesIO(long), "rb") as reader:
+        assert reader.getnframes() == 16000
+
+
+@pytest.mark.asyncio
+async def test_stub_backend_streams_header_then_bounded_chunks() -> None:
+    backend = StubTTSBackend(sample_rate=8000, seconds_per_char=0.1, chunk_size=256)
+
+    chunks = [chunk async for chunk in backend.synthesize_stream("Some text")]
+
+    assert chunks[0].startswith(b"RIFF")
+    assert len(chunks[0]) == 44
+    assert all(len(chunk) <= 256 for chunk in chunks[1:])
+    assert sum(len(chunk) for chunk in chunks[1:]) == 7200 * 2
+
+
+@pytest.mark.asyncio
+async def test_stub_backend_simulates_latency_and_throughput() -> None:
+    backend = StubTTSBackend(seconds_per_char=0.01, latency_seconds=0.02, chars_per_second=1000, chunk_size=64)
+
+    started = time.perf_counter()
+    await backend.synthesize("x" * 50)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed >= 0.02 + 0.05
+
+
+def test_backend_is_selected_by_setting(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("services.tts.settings.TTS_BACKEND", "stub")
+    stub = get_tts_backend()
+    assert isinstance(stub, StubTTSBackend)
+    assert get_tts_backend() is stub
+
+    monkeypatch.setattr("services.tts.settings.TTS_BACKEND", "coqui")
+    assert isinstance(get_tts_backend(), CoquiHTTPBackend)
+    assert get_tts_backend().model_name == settings.TTS_MODEL_NAME
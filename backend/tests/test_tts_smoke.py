@@ -2,7 +2,7 @@
 Smoke tests for the Coqui TTS HTTP contract.
 
 Uses an in-process mock server so the tests always run and verify that:
-  - CoquiTTSService.synthesize() sends POST with a JSON body
+  - TTSService.synthesize() sends POST with a JSON body
   - Non-empty text returns audio bytes
   - Empty text raises HTTPStatusError (server rejects it with 400)
 
@@ -14,12 +14,11 @@ from __future__ import annotations
 import json
 import threading
 from http.server import BaseHTTPRequestHandler, HTTPServer
-from types import SimpleNamespace
 
 import httpx
 import pytest
 
-from services.tts import CoquiTTSService
+from services.tts import TTSService
 
 _FAKE_WAV = b"RIFF\x00\x00\x00\x00WAVEfmt "
 
@@ -64,8 +63,8 @@ def mock_tts_url() -> str:
 async def test_synthesize_returns_audio_for_valid_text(
     mock_tts_url: str, monkeypatch: pytest.MonkeyPatch
 ) -> None:
-    monkeypatch.setattr("services.tts.settings", SimpleNamespace(TTS_SERVICE_URL=mock_tts_url))
-    audio = await CoquiTTSService.synthesize("Hello world")
+    monkeypatch.setattr("services.tts.settings.TTS_SERVICE_URL", mock_tts_url)
+    audio = await TTSService.synthesize("Hello world")
     assert audio == _FAKE_WAV
 
 
@@ -73,6 +72,29 @@ async def test_synthesize_returns_audio_for_valid_text(
 async def test_synthesize_raises_for_empty_text(
     mock_tts_url: str, monkeypatch: pytest.MonkeyPatch
 ) -> None:
-    monkeypatch.setattr("services.tts.settings", SimpleNamespace(TTS_SERVICE_URL=mock_tts_url))
+    monkeypatch.setattr("services.tts.settings.TTS_SERVICE_URL", mock_tts_url)
     with pytest.raises(httpx.HTTPStatusError):
-        await CoquiTTSService.synthesize("")
+        await TTSService.synthesize("")
+
+
+@pytest.mark.asyncio
+async def test_synthesize_stream_yields_audio_chunks(
+    mock_tts_url: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr("services.tts.settings.TTS_SERVICE_URL", mock_tts_url)
+    monkeypatch.setattr("services.tts.settings.TTS_STREAM_CHUNK_SIZE", 4)
+
+    chunks = [chunk async for chunk in TTSService.synthesize_stream("Hello world")]
+
+    assert b"".join(chunks) == _FAKE_WAV
+    assert all(len(chunk) <= 4 for chunk in chunks)
+
+
+@pytest.mark.asyncio
+async def test_synthesize_stream_raises_for_empty_text(
+    mock_tts_url: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr("services.tts.settings.TTS_SERVICE_URL", mock_tts_url)
+    with pytest.raises(httpx.HTTPStatusError):
+        async for _ in TTSService.synthesize_stream(""):
+            pass
@@ -8,7 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from core.session import SESSION_COOKIE_NAME
 from models import User
-from models.file import File, FileStatus, FileVisibility
+from models.file import File, FileStatus, FileTTSMode, FileVisibility
 from services.files import FileService
 
 
@@ -268,6 +268,71 @@ async def test_upload_with_public_visibility(
         assert file_record.visibility == FileVisibility.PUBLIC
 
 
+@pytest.mark.asyncio
+async def test_upload_records_tts_mode_and_rejects_unknown(
+    client,
+    async_session_factory: async_sessionmaker[AsyncSession],
+    session_store: dict,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fake_minio = FakeMinioClient()
+    monkeypatch.setattr("services.files.get_minio_client", lambda: fake_minio)
+    monkeypatch.setattr("api.v1.endpoints.files.process_pdf_task.delay", Mock())
+
+    user = await create_user(async_session_factory, email="lazy@example.com")
+    authenticate_client(client, session_store, user)
+
+    rejected = client.post(
+        "/files/upload_file",
+        files={"file": ("doc.pdf", b"%PDF-1.4 content", "application/pdf")},
+        data={"tts_mode": "sometimes"},
+    )
+    response = client.post(
+        "/files/upload_file",
+        files={"file": ("doc.pdf", b"%PDF-1.4 content", "application/pdf")},
+        data={"tts_mode": "lazy"},
+    )
+
+    assert rejected.status_code == 400
+    assert response.status_code == 201
+    async with async_session_factory() as session:
+        file_record = (await session.execute(select(File))).scalars().one()
+        assert file_record.tts_mode == FileTTSMode.LAZY
+
+
+@pytest.mark.asyncio
+async def test_upload_records_extract_engine_and_rejects_unknown(
+    client,
+    async_session_factory: async_sessionmaker[AsyncSession],
+    session_store: dict,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fake_minio = FakeMinioClient()
+    monkeypatch.setattr("services.files.get_minio_client", lambda: fake_minio)
+    monkeypatch.setattr("api.v1.endpoints.files.process_pdf_task.delay", Mock())
+
+    user = await create_user(async_session_factory, email="engine@example.com")
+    authenticate_client(client, session_store, user)
+
+    rejected = client.post(
+        "/files/upload_file",
+        files={"file": ("doc.pdf", b"%PDF-1.4 content", "application/pdf")},
+        data={"extract_engine": "ghostscript"},
+    )
+    response = client.post(
+        "/files/upload_file",
+        files={"file": ("doc.pdf", b"%PDF-1.4 content", "application/pdf")},
+        data={"extract_engine": "pdfium"},
+    )
+
+    assert rejected.status_code == 400
+    assert "pdfplumber, pdfminer, pdfium" in rejected.json()["detail"]
+    assert response.status_code == 201
+    async with async_session_factory() as session:
+        file_record = (await session.execute(select(File))).scalars().one()
+        assert file_record.extract_engine == "pdfium"
+
+
 @pytest.mark.asyncio
 async def test_patch_visibility_updates_file(
     client,
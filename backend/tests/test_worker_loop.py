@@ -0,0 +1,49 @@
+import asyncio
+import signal
+
+import pytest
+from celery.exceptions import SoftTimeLimitExceeded
+
+from worker.loop import close_worker_loop, get_worker_loop, run_async
+
+
+def test_run_async_returns_result() -> None:
+    async def answer() -> int:
+        await asyncio.sleep(0)
+        return 42
+
+    try:
+        assert run_async(answer()) == 42
+    finally:
+        close_worker_loop()
+
+
+def test_run_async_cancels_coroutine_interrupted_by_soft_time_limit() -> None:
+    events = []
+
+    async def task_body() -> None:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            events.append("cancelled")
+            raise
+        events.append("resumed")
+
+    def on_alarm(signum, frame):
+        raise SoftTimeLimitExceeded()
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    try:
+        signal.setitimer(signal.ITIMER_REAL, 0.05)
+        with pytest.raises(SoftTimeLimitExceeded):
+            run_async(task_body())
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+        # The next task's run must not resume the interrupted coroutine.
+        run_async(asyncio.sleep(0.01))
+        assert events == ["cancelled"]
+        assert not asyncio.all_tasks(get_worker_loop())
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+        close_worker_loop()
@@ -1,12 +1,38 @@
-from unittest.mock import AsyncMock
+import asyncio
+import hashlib
+import io
+import wave
+from pathlib import Path
 
 import pytest
+from pydantic import ValidationError
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from core.config import Settings
 from models import User
-from models.chapter import Chapter
-from models.file import File, FileStatus
-from worker.tasks import AUDIO_BUCKET, _mark_pdf_failed, _process_pdf_async, _process_tts_async
+from models.chapter import Chapter, ChapterTTSStatus
+from models.chapter_audio_segment import ChapterAudioSegment
+from models.file import File, FileStatus, FileTTSMode
+from services.pdf_parser import PdfParseDeadline, StoredChapter
+from worker.tasks import (
+    AUDIO_BUCKET,
+    _mark_pdf_failed,
+    _peak_rss_bytes,
+    _process_pdf_async,
+    _process_tts_async,
+    _rss_bytes,
+)
+
+
+def _make_wav(frames: bytes) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(22050)
+        writer.writeframes(frames)
+    return buffer.getvalue()
 
 
 class FakeObjectResponse:
@@ -15,8 +41,10 @@ class FakeObjectResponse:
         self.closed = False
         self.released = False
 
-    def read(self) -> bytes:
-        return self._payload
+    def read(self, amt: int | None = None) -> bytes:
+        chunk = self._payload[:amt] if amt is not None else self._payload
+        self._payload = self._payload[len(chunk):]
+        return chunk
 
     def close(self) -> None:
         self.closed = True
@@ -29,6 +57,7 @@ class FakeMinioClient:
     def __init__(self, payload: bytes) -> None:
         self.payload = payload
         self.uploaded: list[tuple[str, str, int, str]] = []
+        self.payloads: dict[str, bytes] = {}
 
     async def get_file(self, bucket_name: str, object_name: str) -> FakeObjectResponse:
         return FakeObjectResponse(self.payload)
@@ -44,11 +73,26 @@ class FakeMinioClient:
         self.uploaded.append((bucket_name, object_name, file_size, content_type))
         return object_name
 
+    async def upload_stream(
+        self,
+        bucket_name: str,
+        object_name: str,
+        chunks,
+        content_type: str,
+        part_size: int,
+        num_parallel_uploads: int,
+    ) -> int:
+        payload = b"".join([chunk async for chunk in chunks])
+        self.uploaded.append((bucket_name, object_name, len(payload), content_type))
+        self.payloads[object_name] = payload
+        return len(payload)
+
 
 @pytest.mark.asyncio
 async def test_process_pdf_async_marks_file_completed_and_saves_chapters(
     monkeypatch: pytest.MonkeyPatch,
     async_session_factory: async_sessionmaker[AsyncSession],
+    tts_queue: list[dict],
 ) -> None:
     async with async_session_factory() as session:
         user = User(email="worker-success@example.com", hashed_password="hash", is_active=True)
@@ -73,37 +117,29 @@ async def test_process_pdf_async_marks_file_completed_and_saves_chapters(
     monkeypatch.setattr("worker.tasks.async_session_maker", async_session_factory)
     monkeypatch.setattr("worker.tasks.get_minio_client", lambda: FakeMinioClient(b"%PDF-1.4 data"))
 
-    async def fake_parse_and_store(db, file_record, pdf_bytes):
-        db.add(
-            Chapter(
-                file_id=file_record.id,
-                chapter_index=1,
-                title="Chapter 1",
-                content="Alpha",
-                start_page=1,
-                end_page=1,
-            )
-        )
-        db.add(
-            Chapter(
+    monkeypatch.setattr("worker.tasks.PDF_DOWNLOAD_CHUNK_SIZE", 4)
+
+    jobs_queued_before_chapter: list[int] = []
+    spooled: list[tuple[str, bytes]] = []
+
+    async def fake_parse_and_store(db, file_record, source, on_chapters, resume_from=0, deadline=None):
+        spooled.append((source, Path(source).read_bytes()))
+        for index, content in enumerate(["Alpha", "Beta"], start=1):
+            jobs_queued_before_chapter.append(len(tts_queue))
+            chapter = Chapter(
                 file_id=file_record.id,
-                chapter_index=2,
-                title="Chapter 2",
-                content="Beta",
-                start_page=2,
-                end_page=2,
+                chapter_index=index,
+                title=f"Chapter {index}",
+                content=content,
+                start_page=index,
+                end_page=index,
             )
-        )
-        await db.commit()
+            db.add(chapter)
+            await db.commit()
+            await on_chapters([StoredChapter(id=chapter.id, chapter_index=index)])
         return 2
 
     monkeypatch.setattr("worker.tasks.PdfParsingService.parse_and_store", fake_parse_and_store)
-    delay_calls: list[tuple[int, int]] = []
-
-    def fake_delay(file_id_value: int, chapter_id_value: int):
-        delay_calls.append((file_id_value, chapter_id_value))
-
-    monkeypatch.setattr("worker.tasks.process_tts.delay", fake_delay)
 
     result = await _process_pdf_async(file_id=file_id, task_id="task-123")
 
@@ -112,8 +148,17 @@ async def test_process_pdf_async_marks_file_completed_and_saves_chapters(
     assert result["status"] == "processing"
     assert result["chapter_count"] == 2
     assert result["queued_tts_jobs"] == 2
-    assert len(delay_calls) == 2
-    assert all(call[0] == file_id for call in delay_calls)
+    assert [job["name"] for job in tts_queue] == ["worker.tasks.process_tts"] * 2
+    assert all(job["args"][0] == file_id for job in tts_queue)
+    # The first chapter is queued ahead of the rest of the book.
+    assert [job["priority"] for job in tts_queue] == [3, 9]
+    assert result["tts_mode"] == "eager"
+    # Each chapter is queued as soon as it is parsed, before the next one is.
+    assert jobs_queued_before_chapter == [0, 1]
+    # The parser gets the whole download spooled to a temp file, removed once parsing ends.
+    [(spooled_path, spooled_payload)] = spooled
+    assert spooled_payload == b"%PDF-1.4 data"
+    assert not Path(spooled_path).exists()
 
     async with async_session_factory() as verify_session:
         persisted_file = await verify_session.get(File, file_id)
@@ -121,6 +166,238 @@ async def test_process_pdf_async_marks_file_completed_and_saves_chapters(
         assert persisted_file.status == FileStatus.PROCESSING
         assert persisted_file.processed_date is None
         assert persisted_file.error_message is None
+        assert persisted_file.chapter_count == 2
+
+
+@pytest.mark.asyncio
+async def test_process_pdf_async_lazy_mode_queues_only_opening_chapters(
+    monkeypatch: pytest.MonkeyPatch,
+    async_session_factory: async_sessionmaker[AsyncSession],
+    tts_queue: list[dict],
+) -> None:
+    async with async_session_factory() as session:
+        user = User(email="worker-lazy@example.com", hashed_password="hash", is_active=True)
+        session.add(user)
+        await session.commit()
+        file_record = File(
+            user_id=user.id,
+            original_filename="lazy.pdf",
+            stored_filename="stored_lazy.pdf",
+            file_size=1234,
+            mime_type="application/pdf",
+            bucket_name="raw-pdf-uploads",
+            status=FileStatus.PENDING,
+            tts_mode=FileTTSMode.LAZY,
+        )
+        session.add(file_record)
+        await session.commit()
+        file_id = file_record.id
+
+    async def fake_parse_and_store(db, file_record, source, on_chapters, resume_from=0, deadline=None):
+        chapters = [
+            Chapter(
+                file_id=file_record.id,
+                chapter_index=index,
+                title=f"Chapter {index}",
+                content="Text",
+                start_page=index,
+                end_page=index,
+            )
+            for index in range(1, 6)
+        ]
+        db.add_all(chapters)
+        await db.commit()
+        stored = [StoredChapter(id=chapter.id, chapter_index=chapter.chapter_index) for chapter in chapters]
+        # The first chapter arrives alone, the rest in one batch that crosses the eager limit.
+        await on_chapters(stored[:1])
+        await on_chapters(stored[1:])
+        return 5
+
+    monkeypatch.setattr("worker.tasks.async_session_maker", async_session_factory)
+    monkeypatch.setattr("worker.tasks.get_minio_client", lambda: FakeMinioClient(b"%PDF-1.4 data"))
+    monkeypatch.setattr("worker.tasks.PdfParsingService.parse_and_store", fake_parse_and_store)
+    monkeypatch.setattr("worker.tasks.settings.TTS_EAGER_CHAPTERS", 2)
+
+    result = await _process_pdf_async(file_id=file_id, task_id="lazy")
+
+    assert result["tts_mode"] == "lazy"
+    assert result["queued_tts_jobs"] == 2
+    async with async_session_factory() as verify_session:
+        rows = await verify_session.execute(
+            select(Chapter.id, Chapter.tts_status).where(Chapter.file_id == file_id).order_by(Chapter.chapter_index)
+        )
+        statuses = rows.all()
+    assert [status for _, status in statuses] == [ChapterTTSStatus.QUEUED] * 2 + [ChapterTTSStatus.PENDING] * 3
+    assert [job["args"][1] for job in tts_queue] == [chapter_id for chapter_id, _ in statuses[:2]]
+
+
+@pytest.mark.asyncio
+async def test_process_pdf_async_queues_follow_up_task_at_deadline(
+    monkeypatch: pytest.MonkeyPatch,
+    async_session_factory: async_sessionmaker[AsyncSession],
+    tts_queue: list[dict],
+) -> None:
+    async with async_session_factory() as session:
+        user = User(email="worker-checkpoint@example.com", hashed_password="hash", is_active=True)
+        session.add(user)
+        await session.commit()
+        file_record = File(
+            user_id=user.id,
+            original_filename="long.pdf",
+            stored_filename="stored_long.pdf",
+            file_size=1234,
+            mime_type="application/pdf",
+            bucket_name="raw-pdf-uploads",
+            status=FileStatus.PENDING,
+        )
+        session.add(file_record)
+        await session.commit()
+        file_id = file_record.id
+
+    async def fake_parse_and_store(db, file_record, source, on_chapters, resume_from=0, deadline=None):
+        chapter = Chapter(
+            file_id=file_record.id,
+            chapter_index=resume_from + 1,
+            title="Next",
+            content="Text",
+            start_page=1,
+            end_page=1,
+        )
+        db.add(chapter)
+        await db.commit()
+        await on_chapters([StoredChapter(id=chapter.id, chapter_index=chapter.chapter_index)])
+        checkpoint = PdfParseDeadline(page_index=7)
+        checkpoint.chapters_stored = resume_from + 1
+        raise checkpoint
+
+    monkeypatch.setattr("worker.tasks.async_session_maker", async_session_factory)
+    monkeypatch.setattr("worker.tasks.get_minio_client", lambda: FakeMinioClient(b"%PDF-1.4 data"))
+    monkeypatch.setattr("worker.tasks.PdfParsingService.parse_and_store", fake_parse_and_store)
+
+    result = await _process_pdf_async(
+        file_id=file_id, task_id="resumed", resume_from=3, resume_page=5, continuations=2
+    )
+
+    assert result["status"] == "checkpointed"
+    assert result["chapter_count"] == 4
+    assert result["queued_tts_jobs"] == 1
+    # The chapter stored in this run is queued at background priority, then the follow-up parse.
+    assert [(job["name"], job.get("priority")) for job in tts_queue] == [
+        ("worker.tasks.process_tts", 9),
+        ("worker.tasks.process_pdf", None),
+    ]
+    assert tts_queue[-1]["args"] == [file_id]
+    assert tts_queue[-1]["kwargs"] == {"resume_from": 4, "resume_page": 7, "continuations": 3}
+    async with async_session_factory() as verify_session:
+        persisted_file = await verify_session.get(File, file_id)
+        assert persisted_file.status == FileStatus.PROCESSING
+        assert persisted_file.chapter_count is None
+
+
+async def _checkpointing_file(async_session_factory: async_sessionmaker[AsyncSession], name: str) -> int:
+    async with async_session_factory() as session:
+        user = User(email=f"worker-{name}@example.com", hashed_password="hash", is_active=True)
+        session.add(user)
+        await session.commit()
+        file_record = File(
+            user_id=user.id,
+            original_filename=f"{name}.pdf",
+            stored_filename=f"stored_{name}.pdf",
+            file_size=1234,
+            mime_type="application/pdf",
+            bucket_name="raw-pdf-uploads",
+            status=FileStatus.PENDING,
+        )
+        session.add(file_record)
+        await session.commit()
+        return file_record.id
+
+
+def _checkpoint_at_page(page_index: int):
+    async def fake_parse_and_store(db, file_record, source, on_chapters, resume_from=0, deadline=None):
+        # Still inside the chapter the run started in, so no chapter is stored.
+        checkpoint = PdfParseDeadline(page_index=page_index)
+        checkpoint.chapters_stored = resume_from
+        raise checkpoint
+
+    return fake_parse_and_store
+
+
+@pytest.mark.asyncio
+async def test_process_pdf_async_continues_long_chapter_while_pages_progress(
+    monkeypatch: pytest.MonkeyPatch,
+    async_session_factory: async_sessionmaker[AsyncSession],
+    tts_queue: list[dict],
+) -> None:
+    file_id = await _checkpointing_file(async_session_factory, "long-chapter")
+    monkeypatch.setattr("worker.tasks.async_session_maker", async_session_factory)
+    monkeypatch.setattr("worker.tasks.get_minio_client", lambda: FakeMinioClient(b"%PDF-1.4 data"))
+    monkeypatch.setattr("worker.tasks.PdfParsingService.parse_and_store", _checkpoint_at_page(40))
+
+    result = await _process_pdf_async(file_id=file_id, task_id="long", resume_page=20, continuations=1)
+
+    assert result["status"] == "checkpointed"
+    assert tts_queue[-1]["kwargs"] == {"resume_from": 0, "resume_page": 40, "continuations": 2}
+
+
+@pytest.mark.asyncio
+async def test_process_pdf_async_fails_resumed_run_that_extracts_no_new_page(
+    monkeypatch: pytest.MonkeyPatch,
+    async_session_factory: async_sessionmaker[AsyncSession],
+    tts_queue: list[dict],
+) -> None:
+    file_id = await _checkpointing_file(async_session_factory, "stalled")
+    monkeypatch.setattr("worker.tasks.async_session_maker", async_session_factory)
+    monkeypatch.setattr("worker.tasks.get_minio_client", lambda: FakeMinioClient(b"%PDF-1.4 data"))
+    # The page cache was lost, so the resumed run stops before the page the last one reached.
+    monkeypatch.setattr("worker.tasks.PdfParsingService.parse_and_store", _checkpoint_at_page(12))
+
+    result = await _process_pdf_async(file_id=file_id, task_id="stalled", resume_page=20, continuations=1)
+
+    assert result["status"] == "failed"
+    assert tts_queue == []
+    async with async_session_factory() as verify_session:
+        persisted_file = await verify_session.get(File, file_id)
+        assert persisted_file.status == FileStatus.FAILED
+        assert "no progress past page 20" in persisted_file.error_message
+
+
+@pytest.mark.asyncio
+async def test_process_pdf_async_fails_after_max_continuations(
+    monkeypatch: pytest.MonkeyPatch,
+    async_session_factory: async_sessionmaker[AsyncSession],
+    tts_queue: list[dict],
+) -> None:
+    file_id = await _checkpointing_file(async_session_factory, "endless")
+    monkeypatch.setattr("worker.tasks.async_session_maker", async_session_factory)
+    monkeypatch.setattr("worker.tasks.get_minio_client", lambda: FakeMinioClient(b"%PDF-1.4 data"))
+    monkeypatch.setattr("worker.tasks.PdfParsingService.parse_and_store", _checkpoint_at_page(400))
+    monkeypatch.setattr("worker.tasks.settings.PDF_MAX_CONTINUATIONS", 3)
+
+    result = await _process_pdf_async(file_id=file_id, task_id="endless", resume_page=300, continuations=3)
+
+    assert result["status"] == "failed"
+    assert tts_queue == []
+    async with async_session_factory() as verify_session:
+        persisted_file = await verify_session.get(File, file_id)
+        assert persisted_file.status == FileStatus.FAILED
+        assert "did not finish within 4 tasks" in persisted_file.error_message
+
+
+def test_settings_reject_checkpoint_margin_beyond_soft_time_limit() -> None:
+    with pytest.raises(ValidationError, match="PDF_CHECKPOINT_MARGIN_SECONDS"):
+        Settings(CELERY_TASK_SOFT_TIME_LIMIT=60, PDF_CHECKPOINT_MARGIN_SECONDS=60)
+
+
+@pytest.mark.skipif(not Path("/proc/self/statm").exists(), reason="RSS is read from /proc")
+def test_rss_falls_when_memory_is_freed_but_peak_rss_does_not() -> None:
+    block = b"x" * (128 * 1024 * 1024)
+    rss_holding = _rss_bytes()
+    del block
+    rss_freed = _rss_bytes()
+
+    assert rss_freed < rss_holding - 64 * 1024 * 1024
+    assert _peak_rss_bytes() > rss_freed + 64 * 1024 * 1024
 
 
 @pytest.mark.asyncio
@@ -179,6 +456,7 @@ async def test_process_tts_async_uploads_audio_and_marks_file_completed(
             mime_type="application/pdf",
             bucket_name="raw-pdf-uploads",
             status=FileStatus.PROCESSING,
+            chapter_count=1,
         )
         session.add(file_record)
         await session.commit()
@@ -201,10 +479,11 @@ async def test_process_tts_async_uploads_audio_and_marks_file_completed(
     fake_minio = FakeMinioClient(b"")
     monkeypatch.setattr("worker.tasks.async_session_maker", async_session_factory)
     monkeypatch.setattr("worker.tasks.get_minio_client", lambda: fake_minio)
-    monkeypatch.setattr(
-        "worker.tasks.CoquiTTSService.synthesize",
-        AsyncMock(return_value=b"RIFF\x00\x00\x00\x00WAVEfmt "),
-    )
+    async def fake_synthesize_stream(text: str):
+        yield b"RIFF\x00\x00\x00\x00"
+        yield b"WAVEfmt "
+
+    monkeypatch.setattr("worker.tasks.TTSService.synthesize_stream", fake_synthesize_stream)
 
     result = await _process_tts_async(file_id=file_id, chapter_id=chapter_id, task_id="tts-task")
 
@@ -226,3 +505,360 @@ async def test_process_tts_async_uploads_audio_and_marks_file_completed(
         assert persisted_file.processed_date is not None
         assert persisted_chapter.audio_bucket_name == AUDIO_BUCKET
         assert persisted_chapter.audio_object_name is not None
+        # The stub's truncated header yields no duration, but size and checksum are still recorded.
+        assert persisted_chapter.audio_byte_size == 16
+        assert persisted_chapter.audio_checksum == hashlib.sha256(b"RIFF\x00\x00\x00\x00WAVEfmt ").hexdigest()
+        assert persisted_chapter.audio_duration_seconds is None
+
+
+@pytest.mark.asyncio
+async def test_process_tts_async_marks_blank_chapter_ready_without_audio(
+    monkeypatch: pytest.MonkeyPatch,
+    async_session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with async_session_factory() as session:
+        user = User(email="worker-tts-blank@example.com", hashed_password="hash", is_active=True)
+        session.add(user)
+        await session.commit()
+        file_record = File(
+            user_id=user.id,
+            original_filename="blank.pdf",
+            stored_filename="stored_blank.pdf",
+            file_size=1234,
+            mime_type="application/pdf",
+            bucket_name="raw-pdf-uploads",
+            status=FileStatus.PROCESSING,
+            chapter_count=1,
+        )
+        session.add(file_record)
+        await session.commit()
+        chapter = Chapter(
+            file_id=file_record.id,
+            chapter_index=1,
+            title="Chapter 1",
+            content=" \n ",
+            start_page=1,
+            end_page=1,
+            tts_status=ChapterTTSStatus.QUEUED,
+        )
+        session.add(chapter)
+        await session.commit()
+        file_id = file_record.id
+        chapter_id = chapter.id
+
+    fake_minio = FakeMinioClient(b"")
+    monkeypatch.setattr("worker.tasks.async_session_maker", async_session_factory)
+    monkeypatch.setattr("worker.tasks.get_minio_client", lambda: fake_minio)
+
+    async def fail_synthesize(text: str):
+        raise AssertionError("a blank chapter must not reach TTS")
+        yield b""
+
+    monkeypatch.setattr("worker.tasks.TTSService.synthesize_stream", fail_synthesize)
+
+    result = await _process_tts_async(file_id=file_id, chapter_id=chapter_id, task_id="tts-blank")
+
+    assert result["segment_count"] == 0
+    assert result["remaining_chapters"] == 0
+    assert result["status"] == "completed"
+    assert fake_minio.uploaded == []
+    async with async_session_factory() as verify_session:
+        persisted_chapter = await verify_session.get(Chapter, chapter_id)
+        assert persisted_chapter.tts_status == ChapterTTSStatus.READY
+        assert persisted_chapter.segment_count == 0
+        assert persisted_chapter.audio_object_name is None
+        assert (await verify_session.get(File, file_id)).status == FileStatus.COMPLETED
+
+
+@pytest.mark.asyncio
+async def test_process_tts_async_leaves_file_processing_while_pdf_is_still_parsed(
+    monkeypatch: pytest.MonkeyPatch,
+    async_session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with async_session_factory() as session:
+        user = User(email="worker-streaming@example.com", hashed_password="hash", is_active=True)
+        session.add(user)
+        await session.commit()
+        file_record = File(
+            user_id=user.id,
+            original_filename="streaming.pdf",
+            stored_filename="stored_streaming.pdf",
+            file_size=1234,
+            mime_type="application/pdf",
+            bucket_name="raw-pdf-uploads",
+            status=FileStatus.PROCESSING,
+        )
+        session.add(file_record)
+        await session.commit()
+        chapter = Chapter(
+            file_id=file_record.id,
+            chapter_index=1,
+            title="Chapter 1",
+            content="Early chapter.",
+            start_page=1,
+            end_page=1,
+            tts_status=ChapterTTSStatus.QUEUED,
+        )
+        session.add(chapter)
+        await session.commit()
+        file_id, chapter_id = file_record.id, chapter.id
+
+    async def fake_synthesize_stream(text: str):
+        yield _make_wav(b"\x01\x00" * 4)
+
+    monkeypatch.setattr("worker.tasks.async_session_maker", async_session_factory)
+    monkeypatch.setattr("worker.tasks.get_minio_client", lambda: FakeMinioClient(b""))
+    monkeypatch.setattr("worker.tasks.TTSService.synthesize_stream", fake_synthesize_stream)
+
+    result = await _process_tts_async(file_id=file_id, chapter_id=chapter_id, task_id="tts-early")
+    missing = await _process_tts_async(file_id=file_id, chapter_id=chapter_id + 100, task_id="tts-replaced")
+
+    # No chapter is left queued, but chapter_count is unset until parsing finishes.
+    assert result["remaining_chapters"] == 0
+    assert result["status"] == "processing"
+    # Jobs for chapters a retried parse replaced are dropped rather than failing the file.
+    assert missing["status"] == "skipped"
+
+
+@pytest.mark.asyncio
+async def test_process_tts_async_synthesizes_segments_concurrently_in_order(
+    monkeypatch: pytest.MonkeyPatch,
+    async_session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with async_session_factory() as session:
+        user = User(email="worker-segments@example.com", hashed_password="hash", is_active=True)
+        session.add(user)
+        await session.commit()
+        await session.refresh(user)
+
+        file_record = File(
+            user_id=user.id,
+            original_filename="segments.pdf",
+            stored_filename="stored_segments.pdf",
+            file_size=1234,
+            mime_type="application/pdf",
+            bucket_name="raw-pdf-uploads",
+            status=FileStatus.PROCESSING,
+        )
+        session.add(file_record)
+        await session.commit()
+        await session.refresh(file_record)
+
+        chapter = Chapter(
+            file_id=file_record.id,
+            chapter_index=1,
+            title="Chapter 1",
+            content="First sentence.\n\nSecond sentence.\n\nThird sentence.",
+            start_page=1,
+            end_page=1,
+        )
+        session.add(chapter)
+        await session.commit()
+        await session.refresh(chapter)
+        file_id = file_record.id
+        chapter_id = chapter.id
+
+    in_flight = 0
+    peak_in_flight = 0
+    delays = {"First sentence.": 0.03, "Second sentence.": 0.01, "Third sentence.": 0.0}
+    frames = {"First sentence.": b"\x01\x00", "Second sentence.": b"\x02\x00", "Third sentence.": b"\x03\x00"}
+
+    async def fake_synthesize_stream(text: str):
+        nonlocal in_flight, peak_in_flight
+        in_flight += 1
+        peak_in_flight = max(peak_in_flight, in_flight)
+        await asyncio.sleep(delays[text])
+        in_flight -= 1
+        wav = _make_wav(frames[text] * 4)
+        yield wav[:10]
+        yield wav[10:]
+
+    fake_minio = FakeMinioClient(b"")
+    monkeypatch.setattr("worker.tasks.async_session_maker", async_session_factory)
+    monkeypatch.setattr("worker.tasks.get_minio_client", lambda: fake_minio)
+    monkeypatch.setattr("worker.tasks.settings.TTS_SEGMENT_MAX_CHARS", 20)
+    monkeypatch.setattr("worker.tasks.settings.TTS_SEGMENT_CONCURRENCY", 2)
+    monkeypatch.setattr("worker.tasks.TTSService.synthesize_stream", fake_synthesize_stream)
+
+    result = await _process_tts_async(file_id=file_id, chapter_id=chapter_id, task_id="tts-segments")
+
+    assert result["segment_count"] == 3
+    assert peak_in_flight == 2
+    object_name = result["audio_object_name"]
+    with wave.open(io.BytesIO(fake_minio.payloads[object_name]), "rb") as reader:
+        assert reader.readframes(reader.getnframes()) == b"\x01\x00" * 4 + b"\x02\x00" * 4 + b"\x03\x00" * 4
+    assert result["audio_bytes"] == len(fake_minio.payloads[object_name])
+
+    async with async_session_factory() as verify_session:
+        persisted_chapter = await verify_session.get(Chapter, chapter_id)
+        persisted_file = await verify_session.get(File, file_id)
+    assert persisted_chapter.audio_duration_seconds == pytest.approx(12 / 22050)
+    assert persisted_chapter.audio_sample_rate == 22050
+    assert persisted_chapter.audio_channels == 1
+    assert persisted_chapter.audio_byte_size == result["audio_bytes"]
+    assert persisted_chapter.audio_checksum == hashlib.sha256(fake_minio.payloads[object_name]).hexdigest()
+    assert persisted_file.audio_duration_seconds == persisted_chapter.audio_duration_seconds
+    assert persisted_file.audio_byte_size == persisted_chapter.audio_byte_size
+
+
+@pytest.mark.asyncio
+async def test_process_tts_async_encodes_chapter_audio_and_records_format(
+    monkeypatch: pytest.MonkeyPatch,
+    async_session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with async_session_factory() as session:
+        user = User(email="worker-encode@example.com", hashed_password="hash", is_active=True)
+        session.add(user)
+        await session.commit()
+        await session.refresh(user)
+
+        file_record = File(
+            user_id=user.id,
+            original_filename="encode.pdf",
+            stored_filename="stored_encode.pdf",
+            file_size=1234,
+            mime_type="application/pdf",
+            bucket_name="raw-pdf-uploads",
+            status=FileStatus.PROCESSING,
+        )
+        session.add(file_record)
+        await session.commit()
+        await session.refresh(file_record)
+
+        chapter = Chapter(
+            file_id=file_record.id,
+            chapter_index=2,
+            title="Chapter 2",
+            content="Encoded content.",
+            start_page=1,
+            end_page=1,
+        )
+        session.add(chapter)
+        await session.commit()
+        await session.refresh(chapter)
+        file_id = file_record.id
+        chapter_id = chapter.id
+
+    wav = _make_wav(b"\x00\x10\x00\xf0" * 11025)
+
+    async def fake_synthesize_stream(text: str):
+        yield wav
+
+    fake_minio = FakeMinioClient(b"")
+    monkeypatch.setattr("worker.tasks.async_session_maker", async_session_factory)
+    monkeypatch.setattr("worker.tasks.get_minio_client", lambda: fake_minio)
+    monkeypatch.setattr("worker.tasks.settings.TTS_OUTPUT_FORMAT", "opus")
+    monkeypatch.setattr("worker.tasks.TTSService.synthesize_stream", fake_synthesize_stream)
+
+    result = await _process_tts_async(file_id=file_id, chapter_id=chapter_id, task_id="tts-encode")
+
+    _, object_name, size, content_type = fake_minio.uploaded[0]
+    assert object_name == f"file_{file_id}/chapter_2_{chapter_id}.opus"
+    assert content_type == "audio/ogg"
+    assert fake_minio.payloads[object_name].startswith(b"OggS")
+    assert size < len(wav)
+    assert result["audio_format"] == "opus"
+
+    async with async_session_factory() as verify_session:
+        persisted_chapter = await verify_session.get(Chapter, chapter_id)
+        assert persisted_chapter.audio_format == "opus"
+        assert persisted_chapter.audio_sample_rate == 24000
+        assert persisted_chapter.audio_channels == 1
+        assert persisted_chapter.audio_duration_seconds == pytest.approx(1.0, abs=0.01)
+        assert persisted_chapter.audio_byte_size == size
+
+
+@pytest.mark.asyncio
+async def test_process_tts_async_publishes_segments_in_order_before_chapter_completes(
+    monkeypatch: pytest.MonkeyPatch,
+    async_session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with async_session_factory() as session:
+        user = User(email="worker-progressive@example.com", hashed_password="hash", is_active=True)
+        session.add(user)
+        await session.commit()
+        await session.refresh(user)
+
+        file_record = File(
+            user_id=user.id,
+            original_filename="progressive.pdf",
+            stored_filename="stored_progressive.pdf",
+            file_size=1234,
+            mime_type="application/pdf",
+            bucket_name="raw-pdf-uploads",
+            status=FileStatus.PROCESSING,
+        )
+        session.add(file_record)
+        await session.commit()
+        await session.refresh(file_record)
+
+        chapter = Chapter(
+            file_id=file_record.id,
+            chapter_index=1,
+            title="Chapter 1",
+            content="First sentence.\n\nSecond sentence.\n\nThird sentence.",
+            start_page=1,
+            end_page=1,
+        )
+        session.add(chapter)
+        await session.commit()
+        await session.refresh(chapter)
+        file_id = file_record.id
+        chapter_id = chapter.id
+
+    # The last segment finishes first; it must not be published ahead of the others.
+    delays = {"First sentence.": 0.03, "Second sentence.": 0.02, "Third sentence.": 0.0}
+    release_last = asyncio.Event()
+    published_while_running: list[list[int]] = []
+
+    async def fake_synthesize_stream(text: str):
+        await asyncio.sleep(delays[text])
+        if text == "Third sentence.":
+            await release_last.wait()
+        yield _make_wav(b"\x01\x00" * 4)
+
+    async def observe_segments() -> None:
+        for _ in range(100):
+            async with async_session_factory() as observer:
+                rows = await observer.execute(
+                    select(ChapterAudioSegment.segment_index)
+                    .where(ChapterAudioSegment.chapter_id == chapter_id)
+                    .order_by(ChapterAudioSegment.segment_index)
+                )
+                indexes = list(rows.scalars())
+                persisted_chapter = await observer.get(Chapter, chapter_id)
+            if indexes == [0, 1]:
+                assert persisted_chapter.audio_object_name is None
+                assert persisted_chapter.segment_count == 3
+                published_while_running.append(indexes)
+                release_last.set()
+                return
+            await asyncio.sleep(0.01)
+        release_last.set()
+
+    fake_minio = FakeMinioClient(b"")
+    monkeypatch.setattr("worker.tasks.async_session_maker", async_session_factory)
+    monkeypatch.setattr("worker.tasks.get_minio_client", lambda: fake_minio)
+    monkeypatch.setattr("worker.tasks.settings.TTS_SEGMENT_MAX_CHARS", 20)
+    monkeypatch.setattr("worker.tasks.TTSService.synthesize_stream", fake_synthesize_stream)
+
+    observer_task = asyncio.create_task(observe_segments())
+    result = await _process_tts_async(file_id=file_id, chapter_id=chapter_id, task_id="tts-progressive")
+    await observer_task
+
+    assert published_while_running == [[0, 1]]
+    prefix = f"file_{file_id}/chapter_1_{chapter_id}"
+    async with async_session_factory() as verify_session:
+        rows = await verify_session.execute(
+            select(ChapterAudioSegment)
+            .where(ChapterAudioSegment.chapter_id == chapter_id)
+            .order_by(ChapterAudioSegment.segment_index)
+        )
+        segments = rows.scalars().all()
+    assert [segment.object_name for segment in segments] == [
+        f"{prefix}/segment_0000.wav",
+        f"{prefix}/segment_0001.wav",
+        f"{prefix}/segment_0002.wav",
+    ]
+    assert all(segment.byte_size == len(fake_minio.payloads[segment.object_name]) for segment in segments)
+    assert result["audio_object_name"] == f"{prefix}.wav"
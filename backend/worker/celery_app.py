@@ -3,9 +3,18 @@ Celery application configuration and initialization.
 Handles task queue setup for async TTS processing.
 """
 from celery import Celery
-from celery.signals import worker_ready, worker_shutdown
+from celery.signals import (
+    worker_process_init,
+    worker_process_shutdown,
+    worker_ready,
+    worker_shutdown,
+)
 
 from core.config import settings
+from core.redis import get_redis_client
+from services.pdf_parser import shutdown_pdf_extraction_pool
+from services.tts import get_tts_http_client, get_tts_router
+from worker.loop import close_worker_loop, get_worker_loop, run_async
 
 
 def create_celery_app() -> Celery:
@@ -37,12 +46,27 @@ def create_celery_app() -> Celery:
 
         # Task routing and execution
         task_track_started=True,
-        task_time_limit=300,  # 5 minutes hard limit
-        task_soft_time_limit=240,  # 4 minutes soft limit
+        task_time_limit=settings.CELERY_TASK_TIME_LIMIT,
+        task_soft_time_limit=settings.CELERY_TASK_SOFT_TIME_LIMIT,
 
         # Performance
         task_acks_late = True,  # Acknowledge tasks after completion
         task_reject_on_worker_lost = True,
+        worker_prefetch_multiplier=1,  # Prefetched messages would skip ahead of later high-priority ones
+        # In KiB; a pool process left above it after a task is replaced, returning its memory to the OS.
+        worker_max_memory_per_child=settings.WORKER_MAX_MEMORY_MB * 1024 or None,
+
+        # Priorities (worker.scheduling.TTSPriority): the Redis transport keeps one list per
+        # step and always drains lower numbers first. Messages stay in Redis until acked,
+        # so queue position survives worker restarts.
+        task_queue_max_priority=10,
+        task_default_priority=5,
+        broker_transport_options={
+            "priority_steps": list(range(10)),
+            "sep": ":",
+            "queue_order_strategy": "priority",
+            "visibility_timeout": 3600,
+        },
 
         # Task naming
         task_default_queue="tts_default",
@@ -51,9 +75,6 @@ def create_celery_app() -> Celery:
             "worker.tasks.process_pdf": {"queue": "pdf_processing"},
         },
 
-        # Rate limiting
-        task_default_rate_limit="10/m",  # 10 tasks per minute
-
         # Retry policy defaults
         task_autoretry_for=(Exception,),
         task_retry_kwargs={"max_retries": 3},
@@ -79,8 +100,30 @@ def on_worker_ready(sender, **kwargs):
 def on_worker_shutdown(sender, **kwargs):
     """Handler called when Celery worker is shutting down."""
     print("🛑 Celery worker shutting down...")
+    _close_process_resources()
+
+
+def on_worker_process_init(sender=None, **kwargs):
+    """Handler called in each pool process after fork: open the shared TTS client."""
+    get_worker_loop()
+    get_tts_http_client().get_client()
+
+
+def on_worker_process_shutdown(sender=None, **kwargs):
+    """Handler called in each pool process before it exits."""
+    _close_process_resources()
+
+
+def _close_process_resources() -> None:
+    run_async(get_tts_router().aclose())
+    run_async(get_tts_http_client().aclose())
+    run_async(get_redis_client().aclose())
+    shutdown_pdf_extraction_pool()
+    close_worker_loop()
 
 # Connect signal handlers
 worker_ready.connect(on_worker_ready)
 worker_shutdown.connect(on_worker_shutdown)
+worker_process_init.connect(on_worker_process_init)
+worker_process_shutdown.connect(on_worker_process_shutdown)
 
@@ -0,0 +1,64 @@
+"""
+Per-process asyncio event loop for Celery tasks.
+
+Tasks run their async bodies on one long-lived loop instead of calling
+``asyncio.run`` per task, so pooled resources bound to a loop (the TTS HTTP
+client, the async database engine) survive between tasks.
+"""
+import asyncio
+from collections.abc import Coroutine
+from typing import Any, Optional, TypeVar
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_worker_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get or create the event loop owned by this worker process.
+
+    Returns:
+        asyncio.AbstractEventLoop: Open event loop for running task coroutines
+    """
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop
+
+
+def run_async(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine to completion on the worker loop.
+
+    If an exception is raised into the loop while it waits, such as Celery's
+    ``SoftTimeLimitExceeded`` from a signal handler, the coroutine is
+    cancelled and unwound before the exception propagates, so it cannot
+    resume on the shared loop during a later task.
+
+    Args:
+        coro: Coroutine to execute
+
+    Returns:
+        The coroutine's result
+    """
+    loop = get_worker_loop()
+    task = loop.create_task(coro)
+    try:
+        return loop.run_until_complete(task)
+    except BaseException:
+        if not task.done():
+            task.cancel()
+            loop.run_until_complete(asyncio.gather(task, return_exceptions=True))
+        raise
+
+
+def close_worker_loop() -> None:
+    """Shut down async generators and close the worker loop."""
+    global _loop
+    if _loop is None or _loop.is_closed():
+        return
+    _loop.run_until_complete(_loop.shutdown_asyncgens())
+    _loop.close()
+    _loop = None
@@ -0,0 +1,224 @@
+"""
+Priority and on-demand scheduling of chapter TTS jobs.
+
+When a PDF is parsed, its chapters are queued at background priority. In lazy
+mode only the first TTS_EAGER_CHAPTERS are queued; the rest stay pending until
+requested. When a listener asks for a chapter, or saves a position in one, that
+chapter is queued at the front and the next TTS_PREFETCH_CHAPTERS just behind
+it. Pending chapters queued this way count against TTS_ON_DEMAND_MAX_JOBS.
+
+Celery cannot reorder messages already in the broker, so promoting an
+already-queued chapter sends a second message for it. Whichever copy runs
+first does the work: ``process_tts`` holds a per-chapter Redis lock while
+synthesizing, and skips chapters that already have audio.
+"""
+import logging
+import uuid
+from enum import IntEnum
+
+from kombu.exceptions import OperationalError
+from redis.exceptions import RedisError
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.redis import get_redis_client
+from models.chapter import Chapter, ChapterTTSStatus
+from models.file import File, FileTTSMode
+from worker.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+PROCESS_TTS_TASK = "worker.tasks.process_tts"
+PROMOTED_KEY_PREFIX = "tts:promoted:"
+CHAPTER_LOCK_KEY_PREFIX = "tts:chapter-lock:"
+
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+IN_PROGRESS = (ChapterTTSStatus.QUEUED, ChapterTTSStatus.SYNTHESIZING)
+
+
+class TTSPriority(IntEnum):
+    """Celery message priority for chapter TTS; with the Redis broker, lower runs first."""
+
+    REQUESTED = 0
+    UP_NEXT = 3
+    BACKGROUND = 9
+
+
+def enqueue_chapter_tts(
+    file_id: int,
+    chapter_id: int,
+    priority: int = TTSPriority.BACKGROUND,
+    countdown: float | None = None,
+) -> None:
+    """Queue ``process_tts`` for a chapter at the given priority."""
+    celery_app.send_task(
+        PROCESS_TTS_TASK,
+        args=[file_id, chapter_id],
+        priority=int(priority),
+        countdown=countdown,
+    )
+
+
+def resolve_tts_mode(file_record: File) -> FileTTSMode:
+    """The file's own processing mode, or TTS_PROCESSING_MODE when it has none."""
+    return file_record.tts_mode or FileTTSMode(settings.TTS_PROCESSING_MODE)
+
+
+async def _has_on_demand_capacity(db: AsyncSession) -> bool:
+    if settings.TTS_ON_DEMAND_MAX_JOBS <= 0:
+        return True
+    result = await db.execute(
+        select(func.count())
+        .select_from(Chapter)
+        .where(Chapter.tts_on_demand.is_(True))
+        .where(Chapter.tts_status.in_(IN_PROGRESS))
+    )
+    return result.scalar_one() < settings.TTS_ON_DEMAND_MAX_JOBS
+
+
+async def _claim_promotion(chapter: Chapter, priority: TTSPriority) -> bool:
+    """Record that ``chapter`` was queued at ``priority``; False if it already was recently."""
+    key = f"{PROMOTED_KEY_PREFIX}{chapter.id}:{int(priority)}"
+    try:
+        return bool(
+            await get_redis_client().get_client().set(key, 1, nx=True, ex=settings.TTS_PROMOTION_DEDUPE_SECONDS)
+        )
+    except RedisError as exc:
+        logger.warning("Promotion dedupe unavailable", extra={"chapter_id": chapter.id, "error": str(exc)})
+        return True
+
+
+async def promote_chapter(chapter: Chapter, priority: TTSPriority) -> bool:
+    """
+    Send another, higher-priority message for a chapter that is already queued.
+
+    Promotions of the same chapter to the same priority are deduplicated for
+    TTS_PROMOTION_DEDUPE_SECONDS, so polling clients do not flood the queue.
+
+    Returns:
+        True if a message was queued. Promotion is best effort: a broker error
+        is logged and the chapter keeps its original place in the queue.
+    """
+    if chapter.audio_object_name:
+        return False
+
+    if not await _claim_promotion(chapter, priority):
+        return False
+
+    try:
+        enqueue_chapter_tts(chapter.file_id, chapter.id, priority)
+    except OperationalError as exc:
+        logger.warning("Failed to promote chapter TTS", extra={"chapter_id": chapter.id, "error": str(exc)})
+        return False
+    logger.info(
+        "Chapter TTS promoted",
+        extra={"file_id": chapter.file_id, "chapter_id": chapter.id, "priority": int(priority)},
+    )
+    return True
+
+
+async def request_chapter(db: AsyncSession, chapter: Chapter, priority: TTSPriority) -> ChapterTTSStatus:
+    """
+    Make sure a chapter's audio is on its way, ahead of lower-priority work.
+
+    Pending (never queued) and failed chapters are queued as on-demand jobs if
+    fewer than TTS_ON_DEMAND_MAX_JOBS are in progress; chapters already queued
+    are promoted.
+
+    Returns:
+        The chapter's status afterwards. PENDING or FAILED means on-demand
+        capacity was full and nothing was queued. READY without audio means
+        the chapter has no text to synthesize.
+    """
+    if chapter.audio_object_name or chapter.tts_status == ChapterTTSStatus.READY:
+        return ChapterTTSStatus.READY
+    if chapter.tts_status in IN_PROGRESS:
+        await promote_chapter(chapter, priority)
+        return chapter.tts_status
+    if not await _has_on_demand_capacity(db):
+        logger.info("On-demand TTS at capacity", extra={"chapter_id": chapter.id})
+        return chapter.tts_status
+
+    previous_status = chapter.tts_status
+    chapter.tts_status = ChapterTTSStatus.QUEUED
+    chapter.tts_on_demand = True
+    await db.commit()
+    await _claim_promotion(chapter, priority)
+    try:
+        enqueue_chapter_tts(chapter.file_id, chapter.id, priority)
+    except OperationalError as exc:
+        logger.warning("Failed to queue on-demand chapter TTS", extra={"chapter_id": chapter.id, "error": str(exc)})
+        chapter.tts_status = previous_status
+        await db.commit()
+        return previous_status
+    logger.info(
+        "On-demand chapter TTS queued",
+        extra={"file_id": chapter.file_id, "chapter_id": chapter.id, "priority": int(priority)},
+    )
+    return ChapterTTSStatus.QUEUED
+
+
+async def promote_listening_position(db: AsyncSession, chapter: Chapter) -> ChapterTTSStatus:
+    """
+    Request the chapter a listener is on at the front of the queue, and prefetch
+    the TTS_PREFETCH_CHAPTERS chapters after it just behind.
+
+    Returns:
+        The listened-to chapter's status, as from ``request_chapter``.
+    """
+    chapter_status = await request_chapter(db, chapter, TTSPriority.REQUESTED)
+
+    if settings.TTS_PREFETCH_CHAPTERS > 0:
+        result = await db.execute(
+            select(Chapter)
+            .where(Chapter.file_id == chapter.file_id)
+            .where(Chapter.chapter_index > chapter.chapter_index)
+            .order_by(Chapter.chapter_index.asc())
+            .limit(settings.TTS_PREFETCH_CHAPTERS)
+        )
+        for upcoming in result.scalars().all():
+            await request_chapter(db, upcoming, TTSPriority.UP_NEXT)
+
+    return chapter_status
+
+
+async def claim_chapter(chapter_id: int) -> str | None:
+    """
+    Take the per-chapter synthesis lock.
+
+    The lock expires after TTS_CHAPTER_LOCK_TTL, so a worker killed mid-chapter
+    does not block it for good. If Redis is unreachable the chapter is
+    processed unlocked rather than not at all.
+
+    Returns:
+        A token for ``release_chapter``, or None if another worker holds the lock.
+    """
+    token = uuid.uuid4().hex
+    try:
+        acquired = await get_redis_client().get_client().set(
+            f"{CHAPTER_LOCK_KEY_PREFIX}{chapter_id}", token, nx=True, ex=settings.TTS_CHAPTER_LOCK_TTL
+        )
+    except RedisError as exc:
+        logger.warning("Chapter lock unavailable", extra={"chapter_id": chapter_id, "error": str(exc)})
+        return ""
+    return token if acquired else None
+
+
+async def release_chapter(chapter_id: int, token: str) -> None:
+    """Release a lock taken by ``claim_chapter``, unless it has since passed to another worker."""
+    if not token:
+        return
+    try:
+        await get_redis_client().get_client().eval(
+            RELEASE_LOCK_SCRIPT, 1, f"{CHAPTER_LOCK_KEY_PREFIX}{chapter_id}", token
+        )
+    except RedisError as exc:
+        logger.warning("Failed to release chapter lock", extra={"chapter_id": chapter_id, "error": str(exc)})
@@ -5,22 +5,46 @@ Contains task definitions for TTS generation, PDF processing, etc.
 import asyncio
 import datetime
 import logging
-from typing import Dict, Any
+import os
+import resource
+import tempfile
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from contextlib import ExitStack
+from typing import BinaryIO, Dict, Any
 
 from billiard.exceptions import SoftTimeLimitExceeded
 from celery import Task
-from sqlalchemy import select, func
+from sqlalchemy import delete, select, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 
+from core.config import settings
 from core.database import async_session_maker
-from core.minio import get_minio_client
-from models.chapter import Chapter
-from models.file import File, FileStatus
-from services.pdf_parser import PdfParsingService
-from services.tts import CoquiTTSService
+from core.minio import MinIOClient, get_minio_client
+from models.chapter import Chapter, ChapterTTSStatus
+from models.chapter_audio_segment import ChapterAudioSegment
+from models.file import File, FileStatus, FileTTSMode
+from services.audio import AudioDigest, AudioFormat, AudioInfo, AudioService, WavFormatError, get_audio_format
+from services.pdf_parser import PdfParseDeadline, PdfParsingService, StoredChapter
+from services.text_segmenter import TextSegmenter
+from services.tts import TTSService
+from services.tts_cache import get_tts_cache
+from services.tts_router import TTSUnavailableError
 from worker.celery_app import celery_app
+from worker.loop import run_async
+from worker.scheduling import (
+    IN_PROGRESS,
+    TTSPriority,
+    claim_chapter,
+    enqueue_chapter_tts,
+    release_chapter,
+    resolve_tts_mode,
+)
 
 logger = logging.getLogger(__name__)
 AUDIO_BUCKET = "completed-files"
+PDF_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
 
 
 class BaseTask(Task):
@@ -90,9 +114,23 @@ def process_tts(
     Raises:
         SoftTimeLimitExceeded: If task exceeds time limit
     """
+    token = run_async(claim_chapter(chapter_id))
+    if token is None:
+        # Another copy of this chapter's job (queued by a promotion) is running. Check back
+        # later rather than dropping the message: if that worker dies, this copy takes over.
+        priority = (self.request.delivery_info or {}).get("priority")
+        enqueue_chapter_tts(
+            file_id,
+            chapter_id,
+            TTSPriority.BACKGROUND if priority is None else priority,
+            countdown=settings.TTS_CHAPTER_DEFER_SECONDS,
+        )
+        print(f"⏸️ Chapter {chapter_id} is already being synthesized; deferred task {self.request.id}")
+        return {"task_id": self.request.id, "file_id": file_id, "chapter_id": chapter_id, "status": "deferred"}
+
     try:
         print(f"🎤 Processing TTS task {self.request.id} for file_id={file_id}, chapter_id={chapter_id}")
-        return asyncio.run(
+        return run_async(
             _process_tts_async(
                 file_id=file_id,
                 chapter_id=chapter_id,
@@ -103,11 +141,19 @@ def process_tts(
     except SoftTimeLimitExceeded:
         print(f"⏱️ Task {self.request.id} exceeded time limit")
         raise
+    except TTSUnavailableError as e:
+        # Every replica's circuit is open: come back once the breaker may let a trial through.
+        if self.request.retries >= self.max_retries:
+            run_async(_mark_file_failed(file_id=file_id, error=str(e), chapter_id=chapter_id))
+        print(f"⚡ TTS unavailable for file_id={file_id}, chapter_id={chapter_id}: {e}")
+        raise self.retry(exc=e, countdown=settings.TTS_BREAKER_OPEN_SECONDS)
     except Exception as e:
         if self.request.retries >= self.max_retries:
-            asyncio.run(_mark_file_failed(file_id=file_id, error=str(e)))
+            run_async(_mark_file_failed(file_id=file_id, error=str(e), chapter_id=chapter_id))
         print(f"❌ Error processing TTS for file_id={file_id}, chapter_id={chapter_id}: {e}")
         raise self.retry(e=e)
+    finally:
+        run_async(release_chapter(chapter_id, token))
 
 
 @celery_app.task(
@@ -118,28 +164,81 @@ def process_tts(
 )
 def process_pdf(
         self,
-        file_id: int
+        file_id: int,
+        resume_from: int = 0,
+        resume_page: int = 0,
+        continuations: int = 0,
 ) -> Dict[str, Any]:
     """
     Process PDF file asynchronously.
 
+    A parse that gets within PDF_CHECKPOINT_MARGIN_SECONDS of the soft time
+    limit stops and queues a follow-up task that resumes it; extracted pages
+    come back from the page cache and stored chapters are kept. The file
+    fails if a follow-up gets no further through the pages than the task it
+    continues, or after PDF_MAX_CONTINUATIONS follow-ups.
+
     Args:
         file_id: Database ID for the uploaded file.
+        resume_from: Chapters stored by the task this one continues.
+        resume_page: Page the task this one continues stopped at.
+        continuations: Follow-up tasks queued for this parse so far.
+
+    The PDF is spooled to a temp file and parsed from there, so the document
+    itself never sits on the heap. The result carries this worker process's
+    RSS before and after the task and its lifetime peak RSS, in bytes; once
+    that peak passes WORKER_MAX_MEMORY_MB, Celery replaces the process after
+    the task returns.
 
     Returns:
         Task result with extracted content
     """
+    rss_before = _rss_bytes()
+    soft_limit = (self.request.timelimit or (None, None))[1] or celery_app.conf.task_soft_time_limit
+    deadline = time.monotonic() + soft_limit - settings.PDF_CHECKPOINT_MARGIN_SECONDS if soft_limit else None
     try:
         print(f"📄 Processing PDF task {self.request.id} for file_id={file_id}")
-        return asyncio.run(_process_pdf_async(file_id=file_id, task_id=self.request.id))
+        result = run_async(
+            _process_pdf_async(
+                file_id=file_id,
+                task_id=self.request.id,
+                resume_from=resume_from,
+                resume_page=resume_page,
+                continuations=continuations,
+                deadline=deadline,
+            )
+        )
+        result.update(rss_before=rss_before, rss_after=_rss_bytes(), peak_rss=_peak_rss_bytes())
+        logger.info(
+            "PDF task memory",
+            extra={
+                "file_id": file_id,
+                "rss_before": rss_before,
+                "rss_after": result["rss_after"],
+                "process_peak_rss": result["peak_rss"],
+            },
+        )
+        if settings.WORKER_MAX_MEMORY_MB and result["peak_rss"] > settings.WORKER_MAX_MEMORY_MB * 1024 * 1024:
+            logger.warning(
+                "Worker process peak RSS is above WORKER_MAX_MEMORY_MB; the pool process will be replaced",
+                extra={"file_id": file_id, "process_peak_rss": result["peak_rss"]},
+            )
+        return result
 
     except Exception as exc:
-        asyncio.run(_mark_pdf_failed(file_id=file_id, error=str(exc)))
+        run_async(_mark_pdf_failed(file_id=file_id, error=str(exc)))
         print(f"❌ Error processing PDF for file_id={file_id}: {exc}")
         raise self.retry(exc=exc)
 
 
-async def _process_pdf_async(file_id: int, task_id: str | None) -> Dict[str, Any]:
+async def _process_pdf_async(
+    file_id: int,
+    task_id: str | None,
+    resume_from: int = 0,
+    resume_page: int = 0,
+    continuations: int = 0,
+    deadline: float | None = None,
+) -> Dict[str, Any]:
     async with async_session_maker() as db:
         file_record = await db.get(File, file_id)
         if not file_record:
@@ -147,39 +246,129 @@ async def _process_pdf_async(file_id: int, task_id: str | None) -> Dict[str, Any
 
         file_record.status = FileStatus.PROCESSING
         file_record.error_message = None
+        # Chapters are synthesized while later pages are still being parsed; the file only
+        # completes once chapter_count is set again and no chapter is left queued.
+        file_record.chapter_count = None
         await db.commit()
         await db.refresh(file_record)
 
-        minio_client = get_minio_client()
-        response = await minio_client.get_file(
-            bucket_name=file_record.bucket_name,
-            object_name=file_record.stored_filename,
-        )
+        # In lazy mode only the opening chapters are synthesized up front; the rest wait
+        # for a listener to request them or get near them (see worker.scheduling).
+        tts_mode = resolve_tts_mode(file_record)
+        # Chapters stored before a checkpoint were queued by the run that stored them.
+        queued_chapters = resume_from
+
+        async def _queue_chapters(chapters: list[StoredChapter]) -> None:
+            nonlocal queued_chapters
+            if tts_mode == FileTTSMode.LAZY:
+                chapters = chapters[: max(settings.TTS_EAGER_CHAPTERS - queued_chapters, 0)]
+            if not chapters:
+                return
+            await db.execute(
+                update(Chapter)
+                .where(Chapter.id.in_([chapter.id for chapter in chapters]))
+                .values(tts_status=ChapterTTSStatus.QUEUED)
+            )
+            await db.commit()
+            for chapter in chapters:
+                # Listeners usually start at the beginning; everything else waits behind chapters
+                # someone is actually listening to, and gets promoted when a listener gets near.
+                priority = TTSPriority.UP_NEXT if queued_chapters == 0 else TTSPriority.BACKGROUND
+                enqueue_chapter_tts(file_record.id, chapter.id, priority)
+                queued_chapters += 1
 
         try:
-            pdf_bytes = response.read()
-        finally:
-            response.close()
-            response.release_conn()
-
-        chapter_count = await PdfParsingService.parse_and_store(
-            db=db,
-            file_record=file_record,
-            pdf_bytes=pdf_bytes,
-        )
-
-        chapter_result = await db.execute(
-            select(Chapter.id).where(Chapter.file_id == file_record.id).order_by(Chapter.chapter_index.asc())
-        )
-        chapter_ids = [row[0] for row in chapter_result.all()]
-
-        for chapter_id in chapter_ids:
-            process_tts.delay(file_record.id, chapter_id)
+            with tempfile.NamedTemporaryFile(suffix=".pdf") as spooled_pdf:
+                response = await get_minio_client().get_file(
+                    bucket_name=file_record.bucket_name,
+                    object_name=file_record.stored_filename,
+                )
+                try:
+                    await asyncio.to_thread(_spool_object, response, spooled_pdf)
+                finally:
+                    response.close()
+                    response.release_conn()
+
+                chapter_count = await PdfParsingService.parse_and_store(
+                    db=db,
+                    file_record=file_record,
+                    source=spooled_pdf.name,
+                    on_chapters=_queue_chapters,
+                    resume_from=resume_from,
+                    deadline=deadline,
+                )
+        except PdfParseDeadline as checkpoint:
+            # Pages before page_index are in the page cache, so each follow-up should get further;
+            # one that does not (the cache was lost) would be re-queued at the same point forever.
+            if checkpoint.page_index <= resume_page:
+                error = f"PDF parsing made no progress past page {resume_page} before the time limit"
+            elif continuations >= settings.PDF_MAX_CONTINUATIONS:
+                error = f"PDF parsing did not finish within {continuations + 1} tasks"
+            else:
+                error = None
+            if error:
+                file_record.status = FileStatus.FAILED
+                file_record.error_message = error
+                file_record.processed_date = datetime.datetime.now(datetime.UTC)
+                await db.commit()
+                logger.warning(
+                    "PDF processing stalled after a checkpoint",
+                    extra={
+                        "file_id": file_id,
+                        "resume_page": resume_page,
+                        "continuations": continuations,
+                        "page": checkpoint.page_index + 1,
+                    },
+                )
+                return {
+                    "task_id": task_id,
+                    "file_id": file_id,
+                    "status": "failed",
+                    "chapter_count": checkpoint.chapters_stored,
+                    "tts_mode": tts_mode.value,
+                    "queued_tts_jobs": queued_chapters - resume_from,
+                }
+            celery_app.send_task(
+                process_pdf.name,
+                args=[file_id],
+                kwargs={
+                    "resume_from": checkpoint.chapters_stored,
+                    "resume_page": checkpoint.page_index,
+                    "continuations": continuations + 1,
+                },
+            )
+            logger.info(
+                "PDF processing checkpointed",
+                extra={
+                    "file_id": file_id,
+                    "chapters_stored": checkpoint.chapters_stored,
+                    "page": checkpoint.page_index + 1,
+                },
+            )
+            return {
+                "task_id": task_id,
+                "file_id": file_id,
+                "status": "checkpointed",
+                "chapter_count": checkpoint.chapters_stored,
+                "tts_mode": tts_mode.value,
+                "queued_tts_jobs": queued_chapters - resume_from,
+            }
 
-        file_record.status = FileStatus.PROCESSING
-        file_record.error_message = None
-        file_record.processed_date = None
+        file_record.chapter_count = chapter_count
         await db.commit()
+
+        # Every queued chapter may already be done; otherwise the last one to finish completes the file.
+        await db.refresh(file_record)
+        remaining_result = await db.execute(
+            select(func.count())
+            .select_from(Chapter)
+            .where(Chapter.file_id == file_record.id)
+            .where(Chapter.tts_status.in_(IN_PROGRESS))
+        )
+        if remaining_result.scalar_one() == 0 and file_record.status == FileStatus.PROCESSING:
+            file_record.status = FileStatus.COMPLETED
+            file_record.processed_date = datetime.datetime.now(datetime.UTC)
+            await db.commit()
         await db.refresh(file_record)
 
         logger.info(
@@ -187,7 +376,8 @@ async def _process_pdf_async(file_id: int, task_id: str | None) -> Dict[str, Any
             extra={
                 "file_id": file_id,
                 "chapter_count": chapter_count,
-                "queued_tts_jobs": len(chapter_ids),
+                "tts_mode": tts_mode.value,
+                "queued_tts_jobs": queued_chapters - resume_from,
                 "status": file_record.status.value,
             },
         )
@@ -197,10 +387,33 @@ async def _process_pdf_async(file_id: int, task_id: str | None) -> Dict[str, Any
             "file_id": file_id,
             "status": file_record.status.value,
             "chapter_count": chapter_count,
-            "queued_tts_jobs": len(chapter_ids),
+            "tts_mode": tts_mode.value,
+            "queued_tts_jobs": queued_chapters - resume_from,
         }
 
 
+def _spool_object(response: BinaryIO, spool: BinaryIO) -> None:
+    """Copy an object download into ``spool`` in PDF_DOWNLOAD_CHUNK_SIZE pieces."""
+    while chunk := response.read(PDF_DOWNLOAD_CHUNK_SIZE):
+        spool.write(chunk)
+    spool.flush()
+
+
+def _rss_bytes() -> int:
+    """This process's current RSS; 0 without /proc."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return 0
+
+
+def _peak_rss_bytes() -> int:
+    """The highest RSS this process has reached since it started, which is what Celery's recycling checks."""
+    # ru_maxrss is in kilobytes on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
 async def _mark_pdf_failed(file_id: int, error: str) -> None:
     async with async_session_maker() as db:
         file_record = await db.get(File, file_id)
@@ -213,71 +426,334 @@ async def _mark_pdf_failed(file_id: int, error: str) -> None:
         await db.commit()
 
 
-async def _mark_file_failed(file_id: int, error: str) -> None:
+async def _mark_file_failed(file_id: int, error: str, chapter_id: int | None = None) -> None:
     async with async_session_maker() as db:
         file_record = await db.get(File, file_id)
         if not file_record:
             return
 
+        chapter = await db.get(Chapter, chapter_id) if chapter_id is not None else None
+        if chapter is not None:
+            chapter.tts_status = ChapterTTSStatus.FAILED
+
         file_record.status = FileStatus.FAILED
         file_record.error_message = error[:500]
         file_record.processed_date = datetime.datetime.now(datetime.UTC)
         await db.commit()
 
 
+async def _synthesize_segments(
+    segments: list[str],
+    spools: list[BinaryIO],
+    on_segment: Callable[[int, BinaryIO], Awaitable[None]] | None = None,
+) -> list[BinaryIO]:
+    """
+    Synthesize segments concurrently, bounded by TTS_SEGMENT_CONCURRENCY, preserving order.
+
+    Each segment's audio is written to its file in ``spools`` (spooled temp files
+    owned by the caller, so it only stays in memory up to TTS_SPOOL_MAX_MEMORY
+    bytes). ``on_segment`` is awaited with each segment's index and audio as soon
+    as that segment is ready.
+    """
+    semaphore = asyncio.Semaphore(settings.TTS_SEGMENT_CONCURRENCY)
+
+    async def _synthesize_uncached(text: str) -> bytes:
+        async with semaphore:
+            return await TTSService.synthesize(text)
+
+    async def _synthesize(index: int, text: str) -> BinaryIO:
+        spool = spools[index]
+        if settings.TTS_CACHE_ENABLED:
+            spool.write(await get_tts_cache().get_or_synthesize(text, _synthesize_uncached))
+        else:
+            async with semaphore:
+                async for chunk in TTSService.synthesize_stream(text):
+                    spool.write(chunk)
+        if on_segment is not None:
+            spool.seek(0)
+            await on_segment(index, spool)
+        spool.seek(0)
+        return spool
+
+    try:
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(_synthesize(index, segment)) for index, segment in enumerate(segments)]
+    except ExceptionGroup as errors:
+        # Surface the original TTS error so task retries and failure messages stay readable.
+        raise errors.exceptions[0]
+
+    return [task.result() for task in tasks]
+
+
+class _SegmentPublisher:
+    """
+    Uploads each synthesized segment as its own object and records it on the chapter.
+
+    Uploads run as soon as a segment is ready, but rows are committed strictly in
+    segment order, so readers only ever see a gap-free prefix of the chapter.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        chapter: Chapter,
+        audio_format: AudioFormat,
+        minio_client: MinIOClient,
+        object_prefix: str,
+        segment_count: int,
+    ):
+        self.db = db
+        self.chapter = chapter
+        self.audio_format = audio_format
+        self.minio_client = minio_client
+        self.object_prefix = object_prefix
+        self._published = [asyncio.Event() for _ in range(segment_count)]
+
+    async def publish(self, index: int, wav_audio: BinaryIO) -> None:
+        with ExitStack() as spools:
+            audio = wav_audio
+            if self.audio_format.name != "wav":
+                audio = spools.enter_context(tempfile.SpooledTemporaryFile(max_size=settings.TTS_SPOOL_MAX_MEMORY))
+                await asyncio.to_thread(
+                    AudioService.encode,
+                    wav_audio,
+                    audio,
+                    self.audio_format,
+                    bitrate_kbps=settings.TTS_OUTPUT_BITRATE_KBPS,
+                    sample_rate=settings.TTS_OUTPUT_SAMPLE_RATE or None,
+                    mono=settings.TTS_OUTPUT_MONO,
+                )
+                audio.seek(0)
+
+            object_name = f"{self.object_prefix}/segment_{index:04d}.{self.audio_format.extension}"
+            byte_size = await self.minio_client.upload_stream(
+                bucket_name=AUDIO_BUCKET,
+                object_name=object_name,
+                chunks=_iter_file(audio, settings.TTS_STREAM_CHUNK_SIZE),
+                content_type=self.audio_format.content_type,
+                part_size=settings.TTS_UPLOAD_PART_SIZE,
+                num_parallel_uploads=settings.TTS_UPLOAD_PARALLEL_PARTS,
+            )
+        await self.record(index, object_name, byte_size)
+
+    async def record(self, index: int, object_name: str, byte_size: int) -> None:
+        if index > 0:
+            await self._published[index - 1].wait()
+        self.db.add(
+            ChapterAudioSegment(
+                chapter_id=self.chapter.id,
+                segment_index=index,
+                bucket_name=AUDIO_BUCKET,
+                object_name=object_name,
+                audio_format=self.audio_format.name,
+                byte_size=byte_size,
+            )
+        )
+        await self.db.commit()
+        self._published[index].set()
+
+
+async def _iter_file(fileobj: BinaryIO, chunk_size: int) -> AsyncIterator[bytes]:
+    while chunk := fileobj.read(chunk_size):
+        yield chunk
+
+
+async def _iter_chunks(chunks: Iterable[bytes]) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+async def _digest_chunks(chunks: AsyncIterator[bytes], digest: AudioDigest) -> AsyncIterator[bytes]:
+    async for chunk in chunks:
+        digest.update(chunk)
+        yield chunk
+
+
 async def _process_tts_async(file_id: int, chapter_id: int, task_id: str | None) -> Dict[str, Any]:
     async with async_session_maker() as db:
         file_record = await db.get(File, file_id)
         if not file_record:
             raise ValueError(f"File with id={file_id} not found")
 
-        chapter = await db.get(Chapter, chapter_id)
-        if not chapter or chapter.file_id != file_id:
+        chapter = await db.get(Chapter, chapter_id, options=[undefer(Chapter.content)])
+        if chapter is None:
+            # A retried parse replaced the file's chapters after this job was queued.
+            return {"task_id": task_id, "file_id": file_id, "chapter_id": chapter_id, "status": "skipped"}
+        if chapter.file_id != file_id:
             raise ValueError(f"Chapter with id={chapter_id} not found for file_id={file_id}")
 
+        if chapter.audio_object_name:
+            # A promoted copy of this job already produced the audio.
+            return {
+                "task_id": task_id,
+                "file_id": file_id,
+                "chapter_id": chapter_id,
+                "status": "skipped",
+                "audio_object_name": chapter.audio_object_name,
+            }
+
         file_record.status = FileStatus.PROCESSING
         file_record.error_message = None
+        chapter.tts_status = ChapterTTSStatus.SYNTHESIZING
+
+        segments = TextSegmenter.split(chapter.content, settings.TTS_SEGMENT_MAX_CHARS)
+        audio_format = get_audio_format(settings.TTS_OUTPUT_FORMAT)
+        object_prefix = f"file_{file_id}/chapter_{chapter.chapter_index}_{chapter.id}"
+        object_name = f"{object_prefix}.{audio_format.extension}"
+
+        # A retry starts the chapter over, so drop segments published by the failed attempt.
+        await db.execute(delete(ChapterAudioSegment).where(ChapterAudioSegment.chapter_id == chapter.id))
+        chapter.segment_count = len(segments)
+        if not segments:
+            # A blank chapter has nothing to speak: it is done, without audio.
+            chapter.tts_status = ChapterTTSStatus.READY
+        await db.commit()
 
-        audio_bytes = await CoquiTTSService.synthesize(chapter.content)
-        object_name = f"file_{file_id}/chapter_{chapter.chapter_index}_{chapter.id}.wav"
+        if not segments:
+            logger.info("Chapter has no text to synthesize", extra={"chapter_id": chapter_id})
+            return {
+                "task_id": task_id,
+                "file_id": file_id,
+                "chapter_id": chapter_id,
+                "remaining_chapters": await _complete_file_if_done(db, file_record),
+                "segment_count": 0,
+                "status": file_record.status.value,
+            }
 
         minio_client = get_minio_client()
-        await minio_client.upload_file(
-            bucket_name=AUDIO_BUCKET,
-            object_name=object_name,
-            file_data=audio_bytes,
-            file_size=len(audio_bytes),
-            content_type="audio/wav",
-        )
+        publisher = None
+        if settings.TTS_PROGRESSIVE_SEGMENTS:
+            publisher = _SegmentPublisher(db, chapter, audio_format, minio_client, object_prefix, len(segments))
+
+        # Encoding reports what it wrote; WAV is described from the header that streams past the digest.
+        audio_info: AudioInfo | None = None
+        digest = AudioDigest()
+        with ExitStack() as spools:
+            if len(segments) == 1 and not settings.TTS_CACHE_ENABLED and audio_format.name == "wav":
+                # Nothing to join or encode: stream the TTS response straight into the multipart upload.
+                audio_stream = TTSService.synthesize_stream(segments[0])
+            else:
+                # A single segment is the whole chapter; it is published once the chapter object exists.
+                on_segment = publisher.publish if publisher is not None and len(segments) > 1 else None
+                segment_spools = [
+                    spools.enter_context(tempfile.SpooledTemporaryFile(max_size=settings.TTS_SPOOL_MAX_MEMORY))
+                    for _ in segments
+                ]
+                segment_files = await _synthesize_segments(segments, segment_spools, on_segment)
+                if len(segment_files) > 1 and audio_format.name == "wav":
+                    # One header, then each segment's PCM payload, straight into the upload.
+                    audio_stream = _iter_chunks(
+                        AudioService.iter_concatenated_wav(segment_files, settings.TTS_STREAM_CHUNK_SIZE)
+                    )
+                else:
+                    if len(segment_files) == 1:
+                        chapter_audio = segment_files[0]
+                    else:
+                        chapter_audio = spools.enter_context(
+                            tempfile.SpooledTemporaryFile(max_size=settings.TTS_SPOOL_MAX_MEMORY)
+                        )
+                        AudioService.concatenate_wav(segment_files, chapter_audio)
+                        chapter_audio.seek(0)
+
+                    if audio_format.name != "wav":
+                        encoded_audio = spools.enter_context(
+                            tempfile.SpooledTemporaryFile(max_size=settings.TTS_SPOOL_MAX_MEMORY)
+                        )
+                        audio_info = await asyncio.to_thread(
+                            AudioService.encode,
+                            chapter_audio,
+                            encoded_audio,
+                            audio_format,
+                            bitrate_kbps=settings.TTS_OUTPUT_BITRATE_KBPS,
+                            sample_rate=settings.TTS_OUTPUT_SAMPLE_RATE or None,
+                            mono=settings.TTS_OUTPUT_MONO,
+                        )
+                        encoded_audio.seek(0)
+                        chapter_audio = encoded_audio
+                    audio_stream = _iter_file(chapter_audio, settings.TTS_STREAM_CHUNK_SIZE)
+
+            audio_size = await minio_client.upload_stream(
+                bucket_name=AUDIO_BUCKET,
+                object_name=object_name,
+                chunks=_digest_chunks(audio_stream, digest),
+                content_type=audio_format.content_type,
+                part_size=settings.TTS_UPLOAD_PART_SIZE,
+                num_parallel_uploads=settings.TTS_UPLOAD_PARALLEL_PARTS,
+            )
+
+        if audio_info is None:
+            try:
+                audio_info = AudioService.wav_info(digest.header, digest.byte_size)
+            except WavFormatError as exc:
+                logger.warning("Could not read chapter audio header", extra={"chapter_id": chapter_id, "error": str(exc)})
+
+        if publisher is not None and len(segments) == 1:
+            await publisher.record(0, object_name, audio_size)
 
         chapter.audio_bucket_name = AUDIO_BUCKET
         chapter.audio_object_name = object_name
-        await db.commit()
-
-        remaining_result = await db.execute(
-            select(func.count())
-            .select_from(Chapter)
-            .where(Chapter.file_id == file_id)
-            .where(Chapter.audio_object_name.is_(None))
+        chapter.audio_format = audio_format.name
+        chapter.audio_byte_size = digest.byte_size
+        chapter.audio_checksum = digest.checksum
+        if audio_info is not None:
+            chapter.audio_duration_seconds = audio_info.duration_seconds
+            chapter.audio_sample_rate = audio_info.sample_rate
+            chapter.audio_channels = audio_info.channels
+        chapter.tts_status = ChapterTTSStatus.READY
+
+        # Summed in one statement so chapters finishing concurrently cannot overwrite each other's totals.
+        await db.execute(
+            update(File)
+            .where(File.id == file_id)
+            .values(
+                audio_duration_seconds=select(func.sum(Chapter.audio_duration_seconds))
+                .where(Chapter.file_id == file_id)
+                .scalar_subquery(),
+                audio_byte_size=select(func.sum(Chapter.audio_byte_size))
+                .where(Chapter.file_id == file_id)
+                .scalar_subquery(),
+            )
+            .execution_options(synchronize_session=False)
         )
-        remaining_count = remaining_result.scalar_one()
+        await db.commit()
 
-        if remaining_count == 0:
-            file_record.status = FileStatus.COMPLETED
-            file_record.error_message = None
-            file_record.processed_date = datetime.datetime.now(datetime.UTC)
-            await db.commit()
+        remaining_count = await _complete_file_if_done(db, file_record)
 
         return {
             "task_id": task_id,
             "file_id": file_id,
             "chapter_id": chapter_id,
             "remaining_chapters": remaining_count,
+            "segment_count": len(segments),
+            "audio_bytes": audio_size,
+            "audio_duration_seconds": chapter.audio_duration_seconds,
+            "audio_format": audio_format.name,
             "status": file_record.status.value,
             "audio_object_name": object_name,
         }
 
 
+async def _complete_file_if_done(db: AsyncSession, file_record: File) -> int:
+    """Complete the file if none of its chapters is still in progress; returns how many are."""
+    # Chapters a lazy file has not queued yet do not hold the file open. Re-read
+    # chapter_count after the caller's commit: it stays unset while the PDF is still being parsed.
+    await db.refresh(file_record, attribute_names=["chapter_count"])
+    remaining_result = await db.execute(
+        select(func.count())
+        .select_from(Chapter)
+        .where(Chapter.file_id == file_record.id)
+        .where(Chapter.tts_status.in_(IN_PROGRESS))
+    )
+    remaining_count = remaining_result.scalar_one()
+
+    if remaining_count == 0 and file_record.chapter_count is not None:
+        file_record.status = FileStatus.COMPLETED
+        file_record.error_message = None
+        file_record.processed_date = datetime.datetime.now(datetime.UTC)
+        await db.commit()
+    return remaining_count
+
+
 @celery_app.task(
     name="worker.tasks.cleanup_old_files",
     base=BaseTask,